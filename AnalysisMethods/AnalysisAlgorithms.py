@@ -3,10 +3,93 @@
 #       Fedorov A. V. [alexis.sasis7@gmail.com]
 #       Griban M. S. [gribanms007@gmail.com]
 
-from typing import List
+import math
+import os
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 
 import numpy as np
-from scipy.spatial import distance
+from scipy.spatial import ConvexHull, QhullError, cKDTree
+
+from AnalysisMethods.DistanceMetrics import DistanceMetric, get_metric
+from Frameworks_ccore.ProgressToken import ProgressToken
+
+class ClusterGroups:
+    """
+    @brief Точки, сгруппированные по меткам кластеров.
+
+    Точки переупорядочиваются по меткам одним устойчивым argsort в общий массив
+    points; кластер i - срез points[offsets[i]:offsets[i + 1]], то есть
+    представление (view) без копирования. Порядок точек внутри кластера
+    совпадает с исходным. Объект ведёт себя как список кластеров (len, C[i],
+    перебор), поэтому все функции показателей качества принимают его вместо
+    результата converter_to_c.
+    """
+
+    def __init__(self, points, labels):
+        """
+        Параметры:
+        points (array_like): Точки данных формы (n, n_features) или (n,).
+        labels (array_like): Метки кластеров для каждой точки (любые, включая шум -1).
+        """
+        points = np.asarray(points)
+        labels = np.asarray(labels).ravel()
+        if len(points) != len(labels):
+            raise ValueError(f"points and labels lengths differ: {len(points)} != {len(labels)}")
+
+        # Индексы точек исходного массива в порядке возрастания меток
+        self.order = np.argsort(labels, kind='stable')
+        sorted_labels = labels[self.order]
+        starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]) if len(labels) else np.empty(0, int)
+
+        # Метки кластеров по возрастанию
+        self.labels = sorted_labels[starts]
+
+        # Границы кластеров в order и points (число кластеров + 1 значений)
+        self.offsets = np.r_[starts, len(labels)]
+
+        # Точки, упорядоченные по кластерам (одна копия исходных данных, float64)
+        self.points = np.take(points, self.order, axis=0).astype(float, copy=False)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        i %= len(self)
+        return self.points[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Число точек в каждом кластере
+        """
+        return np.diff(self.offsets)
+
+    def indices(self, i: int) -> np.ndarray:
+        """Индексы точек кластера i в исходном массиве (представление order)
+        """
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+
+def group_by_label(points, labels) -> ClusterGroups:
+    """
+    @brief Группирует точки по меткам кластеров без поточечного копирования.
+
+    Параметры:
+    points (array_like): Точки данных.
+    labels (array_like): Метки кластеров для каждой точки.
+
+    Возвращает:
+    ClusterGroups: Кластеры в виде срезов общего упорядоченного массива точек.
+    """
+    return ClusterGroups(points, labels)
+
 
 def converter_to_c(points, labels) -> List:
     """
@@ -19,64 +102,195 @@ def converter_to_c(points, labels) -> List:
     Возвращает:
     List: Список кластеров, где каждый кластер содержит свои точки.
 
-    ИСПРАВЛЕНИЕ: Теперь корректно обрабатывает любые значения меток,
-    включая отрицательные (шум) и с пропусками в нумерации.
+    Корректно обрабатывает любые значения меток, включая отрицательные (шум)
+    и с пропусками в нумерации. Кластеры - представления массива
+    ClusterGroups.points (см. group_by_label).
     """
-    # Преобразуем в numpy для удобства
-    labels = np.array(labels)
-    points = np.array(points)
+    return list(group_by_label(points, labels))
 
-    # Находим уникальные метки (включая шум/выбросы)
-    unique_labels = np.unique(labels)
+#------------------------------------------------------------#
 
-    # Создаем словарь для сопоставления меток с индексами
-    label_to_index = {label: idx for idx, label in enumerate(unique_labels)}
+# Поиск ближайших и самых удалённых пар ведётся в числах KD-дерева и cdist, а
+# итоговое расстояние пересчитывается metric.pair (для евклидовой метрики -
+# distance.euclidean) для всех пар в пределах относительного допуска _EXACT_RTOL
+# от экстремума. Поэтому результаты совпадают с попарным перебором до последнего
+# бита. Метрика задаётся аргументом metric (см. DistanceMetrics): KD-дерево,
+# ограничивающие прямоугольники и выпуклая оболочка используются для метрик с
+# нормой Минковского (minkowski_p), для остальных расстояния перебираются блоками.
+_EXACT_RTOL = 1e-9
 
-    # Создаем список кластеров
-    C = [[] for _ in range(len(unique_labels))]
+# Объём памяти под один блок матрицы расстояний cdist, байт
+BLOCK_BYTES = 64 * 1024 * 1024
 
-    # Распределяем точки по кластерам
-    for index, label in enumerate(labels):
-        cluster_idx = label_to_index[label]
-        C[cluster_idx].append(points[index])
 
-    # Преобразуем списки в numpy массивы для удобства
-    C = [np.array(cluster) if len(cluster) > 0 else np.array([]) for cluster in C]
+def _as_points(cluster) -> np.ndarray:
+    points = np.asarray(cluster, dtype=float)
+    return points.reshape(len(points), -1)
 
-    return C
 
-#------------------------------------------------------------#
+def _bbox_gap(lo, hi, lo_other, hi_other, p: float = 2.0) -> np.ndarray:
+    # Расстояние между ограничивающими прямоугольниками в норме p (нижняя граница расстояния между кластерами)
+    gap = np.maximum(0.0, np.maximum(lo_other - hi, lo - hi_other))
+    if p == 2:
+        return np.sqrt((gap * gap).sum(axis=-1))
+    return np.linalg.norm(gap, ord=p, axis=-1)
+
+
+def _closest_pairs(A: np.ndarray, tree_B: cKDTree, bound: float = np.inf, p: float = 2.0):
+    """
+    Ближайшие к точкам A точки дерева tree_B в норме p (бихроматическая задача о ближайшей паре).
+
+    Возвращает:
+        (np.ndarray, np.ndarray): Индексы строк A и расстояния до ближайшей точки B,
+                                  только для строк с расстоянием не больше bound.
+    """
+    rows = np.arange(len(A))
+    if np.isfinite(bound):
+        # Точки A дальше bound от прямоугольника B заведомо не ближе bound к B
+        rows = np.flatnonzero(_bbox_gap(tree_B.mins, tree_B.maxes, A, A, p) <= bound)
+        if len(rows) == 0:
+            return rows, np.empty(0)
+    dist, _ = tree_B.query(A[rows], k=1, p=p, distance_upper_bound=np.nextafter(bound, np.inf), workers=-1)
+    keep = np.isfinite(dist)
+    return rows[keep], dist[keep]
+
+
+def _exact_min(A, B, A_rows, tree_B: cKDTree, best: float, metric: DistanceMetric) -> float:
+    # Точный минимум по всем парам в пределах допуска от приближённого минимума best (в норме дерева)
+    radius = best * (1 + _EXACT_RTOL) + np.finfo(float).tiny
+    mind = np.inf
+    for row, partners in zip(A_rows, tree_B.query_ball_point(A[A_rows], radius, p=metric.minkowski_p, workers=-1)):
+        for col in partners:
+            temp = metric.pair(A[row], B[col])
+            if temp < mind:
+                mind = temp
+    return mind
+
+
+def _blocked_min(A: np.ndarray, B: np.ndarray, metric: DistanceMetric, block_bytes: int = BLOCK_BYTES,
+                 progress: ProgressToken = None) -> float:
+    # Минимальное расстояние между точками A и B перебором блоков metric.pairwise
+    # (для метрик без нормы Минковского, где KD-дерево неприменимо)
+    rows_per_block = max(1, block_bytes // (8 * len(B)))
+    best = np.inf
+    pairs, values = [], []
+    for start in range(0, len(A), rows_per_block):
+        if progress is not None:
+            progress.check()
+        D = metric.pairwise(A[start:start + rows_per_block], B)
+        best = min(best, D.min())
+        r, c = np.nonzero(D <= best + abs(best) * _EXACT_RTOL)
+        pairs.append(np.column_stack((r + start, c)))
+        values.append(D[r, c])
+
+    pairs, values = np.concatenate(pairs), np.concatenate(values)
+    return min(metric.pair(A[a], B[b]) for a, b in pairs[values <= best + abs(best) * _EXACT_RTOL])
+
+
+def _extreme_points(points: np.ndarray, convex: bool = True) -> np.ndarray:
+    """
+    Индексы точек, среди которых лежат концы диаметра: вершины выпуклой оболочки
+    (вместе с почти лежащими на ней точками) в 1D-3D, иначе все точки.
+    convex=False - расстояние не выпукло (не норма), подходят только все точки.
+    """
+    n, dim = points.shape
+    if not convex:
+        return np.arange(n)
+    varying = np.flatnonzero(np.ptp(points, axis=0) > 0)
+    if len(varying) == 0:
+        return np.arange(min(n, 1))
+    if len(varying) == 1:
+        col = points[:, varying[0]]
+        return np.flatnonzero((col == col.min()) | (col == col.max()))
+    if len(varying) <= 3 and n > 4 * (len(varying) + 1):
+        try:
+            hull = ConvexHull(points[:, varying])
+        except QhullError:
+            return np.arange(n)
+        # Опция Qc (по умолчанию) сохраняет точки, почти лежащие на гранях оболочки
+        return np.union1d(hull.vertices, hull.coplanar[:, 0])
+    return np.arange(n)
+
+
+def _farthest_pairs(P: np.ndarray, block_bytes: int, progress: ProgressToken = None,
+                    metric: DistanceMetric = None) -> np.ndarray:
+    """
+    Самые удалённые пары точек P блочным cdist (metric.pairwise).
 
-def MinInterCluster(C, i, j):
+    Возвращает:
+        np.ndarray: Пары индексов P в пределах допуска от максимального расстояния.
+    """
+    metric = get_metric() if metric is None else metric
+    n = len(P)
+    rows_per_block = max(1, block_bytes // (8 * n))
+    best = -np.inf
+    pairs, values = [], []
+    for start in range(0, n, rows_per_block):
+        if progress is not None:
+            progress.check()
+        stop = min(start + rows_per_block, n)
+        D = metric.pairwise(P[start:stop], P[start:])
+        best = max(best, D.max())
+        r, c = np.nonzero(D >= best * (1 - _EXACT_RTOL))
+        pairs.append(np.column_stack((r + start, c + start)))
+        values.append(D[r, c])
+
+    pairs, values = np.concatenate(pairs), np.concatenate(values)
+    return pairs[values >= best * (1 - _EXACT_RTOL)]
+
+
+def MinInterCluster(C, i, j, progress: ProgressToken = None, metric='euclidean'):
     """
     Вычисляет минимальное расстояние между кластерами i и j.
 
+    Ближайшая пара ищется запросами точек меньшего кластера к KD-дереву большего
+    (для метрик без нормы Минковского - перебором блоков матрицы расстояний).
+
     Параметры:
         C (List): Список кластеров.
         i (int): Индекс первого кластера.
         j (int): Индекс второго кластера.
+        progress (ProgressToken, optional): Токен для проверки отмены.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Минимальное расстояние между кластерами i и j.
     """
+    metric = get_metric(metric)
     mind = 100000
-
-    for i1 in C[i]:
-        for j1 in C[j]:
-            # Расстояние, ВСТАВЬТЕ МЕТРИКУ!
-            temp = distance.euclidean(i1, j1)
-            if temp < mind:
-                mind = temp
+    A, B = _as_points(C[i]), _as_points(C[j])
+    if len(A) == 0 or len(B) == 0:
+        return mind
+    if len(A) > len(B):
+        A, B = B, A
+
+    if progress is not None:
+        progress.check()
+    if metric.minkowski_p is None:
+        temp = _blocked_min(A, B, metric, progress=progress)
+    else:
+        tree = cKDTree(B)
+        rows, dist = _closest_pairs(A, tree, p=metric.minkowski_p)
+        best = dist.min()
+        temp = _exact_min(A, B, rows[dist <= best * (1 + _EXACT_RTOL)], tree, best, metric)
+    if temp < mind:
+        mind = temp
     return (mind)
 
 
-def MaxIntraCluster(C, i):
+def MaxIntraCluster(C, i, progress: ProgressToken = None, block_bytes: int = BLOCK_BYTES, metric='euclidean'):
     """
-    Вычисляет максимальное расстояние между точками внутри кластера i.
+    Вычисляет максимальное расстояние между точками внутри кластера i (диаметр).
+
+    Для норм концы диаметра - вершины выпуклой оболочки, поэтому в 2D/3D
+    перебираются только они; в остальных случаях расстояния считаются блочным cdist.
 
     Параметры:
         C (List): Список кластеров.
         i (int): Индекс кластера.
+        progress (ProgressToken, optional): Токен для проверки отмены.
+        block_bytes (int): Объём памяти под блок матрицы расстояний, байт.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Максимальное внутрикластерное расстояние.
@@ -84,97 +298,258 @@ def MaxIntraCluster(C, i):
     if len(C[i]) <= 1:
         return 0
 
+    metric = get_metric(metric)
     maxd = 0
-    points = C[i]
-    n_points = len(points)
-
-    # Сравниваем только уникальные пары по индексам
-    for idx1 in range(n_points):
-        for idx2 in range(idx1 + 1, n_points):
-            i1 = points[idx1]
-            j1 = points[idx2]
-            temp = distance.euclidean(i1, j1)
-            if temp > maxd:
-                maxd = temp
+    points = _as_points(C[i])
+    candidates = _extreme_points(points, metric.minkowski_p is not None)
+    if len(candidates) <= 1:
+        return maxd
+
+    P = points[candidates]
+    for a, b in _farthest_pairs(P, block_bytes, progress, metric):
+        temp = metric.pair(P[a], P[b])
+        if temp > maxd:
+            maxd = temp
     return maxd
 
 
-def DunnIndex(C):
+def _min_intercluster_all(clusters: List[np.ndarray], progress: ProgressToken = None,
+                          metric: DistanceMetric = None):
+    # Минимальное расстояние между точками разных кластеров по всем парам кластеров
+    metric = get_metric() if metric is None else metric
+    k = len(clusters)
+    if metric.minkowski_p is None:
+        mind = np.inf
+        for i in range(k - 1):
+            if progress is not None:
+                progress.report(0.5 * i / k, 'DunnIndex')
+            for j in range(i + 1, k):
+                mind = min(mind, _blocked_min(clusters[i], clusters[j], metric, progress=progress))
+        return mind
+
+    p = metric.minkowski_p
+    lo = np.array([c.min(axis=0) for c in clusters])
+    hi = np.array([c.max(axis=0) for c in clusters])
+    trees = [None] * k
+
+    def tree(idx):
+        if trees[idx] is None:
+            trees[idx] = cKDTree(clusters[idx])
+        return trees[idx]
+
+    best = np.inf
+    found = []
+    for i in range(k - 1):
+        if progress is not None:
+            progress.report(0.5 * i / k, 'DunnIndex')
+        gaps = _bbox_gap(lo[i], hi[i], lo[i + 1:], hi[i + 1:], p)
+        for j in np.flatnonzero(gaps <= best * (1 + _EXACT_RTOL)) + i + 1:
+            if gaps[j - i - 1] > best * (1 + _EXACT_RTOL):
+                continue
+            small, large = (i, j) if len(clusters[i]) <= len(clusters[j]) else (j, i)
+            rows, dist = _closest_pairs(clusters[small], tree(large), best * (1 + _EXACT_RTOL), p)
+            if len(dist):
+                best = min(best, dist.min())
+                found.append((small, large, rows, dist))
+
+    mind = np.inf
+    for small, large, rows, dist in found:
+        rows = rows[dist <= best * (1 + _EXACT_RTOL)]
+        if len(rows):
+            mind = min(mind, _exact_min(clusters[small], clusters[large], rows, tree(large), best, metric))
+    return mind
+
+
+def DunnIndex(C, progress: ProgressToken = None, metric='euclidean'):
     """
     Вычисляет индекс Данна для заданного набора кластеров.
 
+    Пары кластеров, ограничивающие прямоугольники которых дальше уже найденного
+    минимума, не рассматриваются; для остальных ближайшая пара ищется KD-деревом.
+
     Параметры:
         C (List): Список кластеров.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Значение индекса Данна.
     """
+    metric = get_metric(metric)
     mind = 100000
     maxd = 0
+    clusters = [_as_points(c) for c in C if len(c) > 0]
+    if len(clusters) > 1:
+        temp = _min_intercluster_all(clusters, progress, metric)
+        if mind > temp:
+            mind = temp
     for i in range (0, len(C), 1):
-        for j in range (i+1, len(C), 1):
-                temp = MinInterCluster(C, i, j)
-                if mind > temp:
-                    mind = temp
-    for i in range (0, len(C), 1):
-        temp = MaxIntraCluster(C,i)
+        if progress is not None:
+            progress.report(0.5 + 0.5 * i / len(C), 'DunnIndex')
+        temp = MaxIntraCluster(C, i, progress, metric=metric)
         if temp > maxd:
             maxd = temp
+    if progress is not None:
+        progress.report(1.0, 'DunnIndex')
 
     return(mind/maxd)
 
 #------------------------------------------------------------#
 
-def MeanInterclusterDistance(C,i,j):
+def _run_blocks(tasks, run, n_jobs: int, total: int, progress: ProgressToken = None, message: str = ''):
+    """
+    Выполняет run(task) для заданий в пуле из n_jobs потоков и возвращает результаты
+    в порядке заданий (генератор). Одновременно существует не более двух заданий на
+    поток, поэтому блоки матриц расстояний не накапливаются в памяти.
+
+    Параметры:
+        tasks: Итератор пар (задание, объём работы).
+        run (Callable): Функция выполнения одного задания.
+        n_jobs (int): Число потоков.
+        total (int): Суммарный объём работы (для progress).
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        message (str): Название этапа для progress.
+    """
+    done = 0
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        pending = deque()
+        for task, size in tasks:
+            pending.append((executor.submit(run, task), size))
+            while len(pending) >= 2 * n_jobs:
+                future, size = pending.popleft()
+                yield future.result()
+                done += size
+                if progress is not None:
+                    progress.report(done / total, message)
+        while pending:
+            yield pending.popleft()[0].result()
+
+
+def _distance_sums(pairs, block_bytes: int = BLOCK_BYTES, n_jobs: int | None = None,
+                   progress: ProgressToken = None, message: str = '',
+                   metric: DistanceMetric = None) -> List[float]:
+    """
+    Суммы расстояний metric между всеми точками A и B для каждой пары (A, B).
+
+    Матрица расстояний каждой пары обходится блоками (плитками) metric.pairwise, которые
+    вычисляются в n_jobs потоках (cdist и суммирование numpy освобождают GIL).
+    Одновременно в памяти находится не более block_bytes байт матриц расстояний.
+    Маленькие плитки разных пар объединяются в одно задание. Суммы плиток
+    складываются math.fsum, поэтому результат не зависит от порядка их вычисления.
+
+    Параметры:
+        pairs (List): Пары массивов точек (A, B) формы (n, n_features).
+        block_bytes (int): Объём памяти под матрицы расстояний всех потоков, байт.
+        n_jobs (int, optional): Число потоков. По умолчанию - число ядер.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        message (str): Название этапа для progress.
+        metric (DistanceMetric, optional): Метрика расстояния. По умолчанию - евклидова.
+
+    Возвращает:
+        List[float]: Суммы расстояний для каждой пары.
+    """
+    metric = get_metric() if metric is None else metric
+    n_jobs = n_jobs or os.cpu_count() or 1
+    tile = max(1, block_bytes // (8 * n_jobs))     # элементов в одной плитке
+    total = sum(len(A) * len(B) for A, B in pairs)
+    partial = [[] for _ in pairs]
+
+    def tasks():
+        batch, size = [], 0
+        for idx, (A, B) in enumerate(pairs):
+            cols = min(len(B), tile)
+            rows = max(1, tile // max(cols, 1))
+            for a0 in range(0, len(A), rows):
+                for b0 in range(0, len(B), cols):
+                    batch.append((idx, a0, min(a0 + rows, len(A)), b0, min(b0 + cols, len(B))))
+                    size += (batch[-1][2] - a0) * (batch[-1][4] - b0)
+                    if size >= tile:
+                        yield batch, size
+                        batch, size = [], 0
+        if batch:
+            yield batch, size
+
+    def run(batch):
+        return [(idx, metric.pairwise(pairs[idx][0][a0:a1], pairs[idx][1][b0:b1]).sum())
+                for idx, a0, a1, b0, b1 in batch]
+
+    for values in _run_blocks(tasks(), run, n_jobs, total, progress, message):
+        for idx, value in values:
+            partial[idx].append(value)
+
+    return [math.fsum(values) for values in partial]
+
+
+def MeanInterclusterDistance(C, i, j, progress: ProgressToken = None,
+                             block_bytes: int = BLOCK_BYTES, n_jobs: int | None = None, metric='euclidean'):
     """
     Вычисляет среднее расстояние между кластерами i и j.
 
+    Сумма расстояний по всем парам точек считается блоками (см. _distance_sums):
+    матрица n_i x n_j целиком в памяти не создаётся.
+
     Параметры:
         C (List): Список кластеров.
         i (int): Индекс первого кластера.
         j (int): Индекс второго кластера.
+        progress (ProgressToken, optional): Токен для проверки отмены.
+        block_bytes (int): Объём памяти под блоки матрицы расстояний, байт.
+        n_jobs (int, optional): Число потоков. По умолчанию - число ядер.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Среднее межкластерное расстояние.
     """    
     #Нормализация
     normMinter = lambda i,j : 1/( len(C[i]) * len(C[j]))
-    sum = 0
-    for i1 in C[i]:
-        for j1 in C[j]:
-            # Расстояние, ВСТАВЬТЕ МЕТРИКУ!
-            sum += distance.euclidean(i1,j1)
+    sum = _distance_sums([(_as_points(C[i]), _as_points(C[j]))], block_bytes, n_jobs, progress,
+                         metric=get_metric(metric))[0]
     MInter = sum * normMinter(i,j)
     return(MInter)
 
-def DunnIndexMean(C):
+def DunnIndexMean(C, progress: ProgressToken = None, block_bytes: int = BLOCK_BYTES, n_jobs: int | None = None,
+                  metric='euclidean'):
     """
     Вычисляет модифицированный индекс Данна с использованием среднего межкластерного расстояния.
 
+    Средние расстояния всех пар кластеров вычисляются одним блочным проходом в n_jobs потоках.
+
     Параметры:
         C (List): Список кластеров.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        block_bytes (int): Объём памяти под блоки матрицы расстояний, байт.
+        n_jobs (int, optional): Число потоков. По умолчанию - число ядер.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Значение модифицированного индекса Данна.
     """    
+    metric = get_metric(metric)
     mind = 100000
     maxd = 0
+    clusters = [_as_points(c) for c in C]
+    pairs = [(i, j) for i in range(len(C)) for j in range(i + 1, len(C))]
+    sums = _distance_sums([(clusters[i], clusters[j]) for i, j in pairs], block_bytes, n_jobs,
+                          progress and progress.sub(0.0, 0.5), 'DunnIndexMean', metric)
+    for (i, j), sum in zip(pairs, sums):
+        temp = sum * (1 / (len(C[i]) * len(C[j])))
+        if mind > temp:
+            mind = temp
     for i in range (0, len(C), 1):
-        for j in range (i+1, len(C), 1):
-                temp = MeanInterclusterDistance(C,i,j)
-                if mind > temp:
-                    mind = temp
-    for i in range (0, len(C), 1):
-        temp = MaxIntraCluster(C,i)
+        if progress is not None:
+            progress.report(0.5 + 0.5 * i / len(C), 'DunnIndexMean')
+        temp = MaxIntraCluster(C, i, progress, metric=metric)
         if temp > maxd:
             maxd = temp
+    if progress is not None:
+        progress.report(1.0, 'DunnIndexMean')
 
     return(mind/maxd)
 
 #------------------------------------------------------------#
 
 # DBi
-def normp(p, u, v):
+def normp(p, u, v, metric=None):
     """
     Вычисляет норму порядка p между векторами u и v.
 
@@ -182,17 +557,13 @@ def normp(p, u, v):
         p (int): Порядок нормы.
         u (List): Первый вектор.
         v (List): Второй вектор.
+        metric (str | float | DistanceMetric, optional): Метрика расстояния вместо нормы
+                                                         порядка p (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Значение нормы.
     """
-    sum = 0
-    for i in range(0, len(u), 1):
-        tempsum = 0
-        tempsum += abs(u[i] - v[i])
-        tempsum = tempsum ** p
-        sum += tempsum
-    return (sum ** (1 / p))
+    return float(get_metric(p if metric is None else metric).rowwise(u, v))
 
 
 def Mi(C, i):
@@ -204,25 +575,12 @@ def Mi(C, i):
         i (int): Индекс кластера.
 
     Возвращает:
-        List: Координаты центроида.
+        np.ndarray: Координаты центроида.
     """    
-    # Инициализация
-    mi = []
-    for j1 in range(0, len(C[i][0]), 1):
-        mi.append(0)
+    return _as_points(C[i]).mean(axis=0)
 
-    # Поиск средневзешенного центроида i
-    # Сумма координат точек
-    for i1 in C[i]:
-        for j1 in range(0, len(C[i][0]), 1):
-            mi[j1] += i1[j1]
-    # Нормализация
-    for j1 in range(0, len(C[i][0]), 1):
-        mi[j1] /= len(C[i])
-    return (mi)
 
-
-def IntraclusterSeparation(C, i, p, q):
+def IntraclusterSeparation(C, i, p, q, metric=None):
     """
     Вычисляет внутрикластерное рассеяние для кластера i.
 
@@ -231,22 +589,18 @@ def IntraclusterSeparation(C, i, p, q):
         i (int): Индекс кластера.
         p (int): Порядок нормы для расстояния.
         q (int): Порядок нормы для суммирования.
+        metric (str | float | DistanceMetric, optional): Метрика расстояния вместо нормы
+                                                         порядка p (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Внутрикластерное рассеяние.
     """    
-    Norm = 1 / len(C[i])
-    sum = 0
-
-    M = Mi(C, i)
-    for i1 in C[i]:
-        sum += normp(p, i1, M) ** q
-    sum *= Norm
-    sum = sum ** (1 / q)
-    return (sum)
+    points = _as_points(C[i])
+    metric = get_metric(p if metric is None else metric)
+    return float(np.mean(metric.rowwise(points, points.mean(axis=0)) ** q) ** (1 / q))
 
 
-def InterclusterSeparation(C, l, k, p):
+def InterclusterSeparation(C, l, k, p, metric=None):
     """
     Вычисляет расстояние между центроидами кластеров l и k.
 
@@ -255,32 +609,385 @@ def InterclusterSeparation(C, l, k, p):
         l (int): Индекс первого кластера.
         k (int): Индекс второго кластера.
         p (int): Порядок нормы.
+        metric (str | float | DistanceMetric, optional): Метрика расстояния вместо нормы
+                                                         порядка p (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Межкластерное расстояние.
     """    
     u = Mi(C, l)
     v = Mi(C, k)
-    res = normp(p, u, v)
+    res = normp(p, u, v, metric)
     return (res)
 
-def DBi(C,l,k,p,q):
+def DBi(C, l, k, p, q, metric=None):
     """
     Вычисляет индекс Дэвиса-Болдина между кластерами l и k.
 
+    Для оценки всего разбиения используйте DaviesBouldinIndex.
+
     Параметры:
         C (List): Список кластеров.
         l (int): Индекс первого кластера.
         k (int): Индекс второго кластера.
         p (int): Порядок нормы для расстояния.
         q (int): Порядок нормы для суммирования.
+        metric (str | float | DistanceMetric, optional): Метрика расстояния вместо нормы
+                                                         порядка p (см. DistanceMetrics.get_metric).
 
     Возвращает:
         float: Значение индекса Дэвиса-Болдина.
     """    
-    return((IntraclusterSeparation(C,l,p,q) + IntraclusterSeparation(C,k,p,q))/InterclusterSeparation(C,l,k,p))
+    return((IntraclusterSeparation(C, l, p, q, metric) + IntraclusterSeparation(C, k, p, q, metric))
+           / InterclusterSeparation(C, l, k, p, metric))
+
+
+def _cluster_ids(C):
+    # Все точки одним массивом и номер кластера каждой точки
+    if isinstance(C, ClusterGroups):
+        return C.points.reshape(len(C.points), -1), np.repeat(np.arange(len(C)), C.sizes)
+    clusters = [_as_points(c) for c in C]
+    return np.concatenate(clusters), np.repeat(np.arange(len(clusters)), [len(c) for c in clusters])
+
+
+def DaviesBouldinIndex(C, p=2, q=1, progress: ProgressToken = None, metric=None):
+    """
+    Вычисляет индекс Дэвиса-Болдина для всего разбиения на кластеры.
+
+    DB = 1/K * sum_i max_{j != i} (S_i + S_j) / M_ij, где
+    S_i = (1/|C_i| * sum ||x - c_i||_p^q)^(1/q) - рассеяние кластера i,
+    M_ij = ||c_i - c_j||_p - расстояние между центроидами.
+    Центроиды и рассеяния вычисляются одним проходом по всем точкам (np.bincount),
+    матрица отношений R_ij - через broadcasting. При p=2, q=1 совпадает с
+    sklearn.metrics.davies_bouldin_score. Чем меньше значение, тем лучше разбиение.
+
+    Параметры:
+        C (List): Список кластеров (или ClusterGroups).
+        p (float): Порядок нормы для расстояний (np.inf - максимум модулей).
+        q (float): Порядок усреднения внутрикластерных расстояний.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        metric (str | float | DistanceMetric, optional): Метрика расстояния вместо нормы
+                                                         порядка p (см. DistanceMetrics.get_metric).
+
+    Возвращает:
+        float: Значение индекса Дэвиса-Болдина. При совпадающих центроидах - inf.
+
+    Исключения:
+        ValueError: Меньше двух кластеров.
+    """
+    if len(C) < 2:
+        raise ValueError(f"Davies-Bouldin index requires at least 2 clusters, got {len(C)}")
+
+    metric = get_metric(p if metric is None else metric)
+    points, ids = _cluster_ids(C)
+    k = len(C)
+    sizes = np.bincount(ids, minlength=k)
+    centroids = np.stack([np.bincount(ids, points[:, d], k) for d in range(points.shape[1])], axis=1)
+    centroids /= sizes[:, None]
+    if progress is not None:
+        progress.report(0.5, 'DaviesBouldinIndex')
+
+    S = (np.bincount(ids, metric.rowwise(points, centroids[ids]) ** q, k) / sizes) ** (1 / q)
+    M = metric.rowwise(centroids[:, None, :], centroids[None, :, :])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R = (S[:, None] + S[None, :]) / M
+    # Совпадающие центроиды: отношение бесконечно (0/0 тоже считается inf)
+    R[M == 0] = np.inf
+    np.fill_diagonal(R, -np.inf)
+    if progress is not None:
+        progress.report(1.0, 'DaviesBouldinIndex')
+    return float(R.max(axis=1).mean())
+
+
+#------------------------------------------------------------#
+
+
+# Silhouette
+def SilhouetteSamples(C, progress: ProgressToken = None, rows=None,
+                      block_bytes: int = BLOCK_BYTES, n_jobs: int | None = None, metric='euclidean') -> np.ndarray:
+    """
+    Вычисляет силуэт точек: s = (b - a) / max(a, b), где a - среднее расстояние до
+    остальных точек своего кластера, b - наименьшее среднее расстояние до точек
+    другого кластера. Для кластера из одной точки s = 0.
+
+    Расстояния от блока строк до всех точек вычисляются metric.pairwise, суммы по
+    кластерам - np.add.reduceat по точкам, упорядоченным по кластерам. Блоки
+    обрабатываются в n_jobs потоках и вместе занимают не более block_bytes.
+
+    Параметры:
+        C (List): Список кластеров (или ClusterGroups).
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        rows (np.ndarray, optional): Номера точек (в порядке C[0], C[1], ...), для которых
+                                     вычисляется силуэт. По умолчанию - все точки.
+        block_bytes (int): Объём памяти под блоки матрицы расстояний всех потоков, байт.
+        n_jobs (int, optional): Число потоков. По умолчанию - число ядер.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
+
+    Возвращает:
+        np.ndarray: Силуэт точек в порядке C[0], C[1], ... (или строк rows). Для
+                    ClusterGroups исходные номера точек - C.order.
+
+    Исключения:
+        ValueError: Меньше двух кластеров.
+    """
+    if len(C) < 2:
+        raise ValueError(f"silhouette requires at least 2 clusters, got {len(C)}")
+
+    metric = get_metric(metric)
+    points, ids = _cluster_ids(C)
+    sizes = np.bincount(ids, minlength=len(C))
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    rows = np.arange(len(points)) if rows is None else np.asarray(rows)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    per_block = max(1, block_bytes // (8 * len(points) * n_jobs))
+
+    def run(block):
+        # Суммы расстояний от точек блока до точек каждого кластера
+        sums = np.add.reduceat(metric.pairwise(points[block], points), starts, axis=1)
+        own = ids[block]
+        line = np.arange(len(block))
+        a = sums[line, own] / np.maximum(sizes[own] - 1, 1)
+        means = sums / sizes
+        means[line, own] = np.inf
+        b = means.min(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = (b - a) / np.maximum(a, b)
+        s[(sizes[own] == 1) | ~np.isfinite(s)] = 0.0
+        return s
+
+    tasks = ((rows[i:i + per_block], len(rows[i:i + per_block]) * len(points))
+             for i in range(0, len(rows), per_block))
+    values = list(_run_blocks(tasks, run, n_jobs, len(rows) * len(points), progress, 'Silhouette'))
+    if progress is not None:
+        progress.report(1.0, 'Silhouette')
+    return np.concatenate(values) if values else np.empty(0)
+
+
+def SilhouetteScore(C, progress: ProgressToken = None, sample_size: int | None = None, seed: int | None = 0,
+                    block_bytes: int = BLOCK_BYTES, n_jobs: int | None = None, metric='euclidean') -> float:
+    """
+    Вычисляет средний силуэт разбиения (от -1 до 1, чем больше, тем лучше).
+
+    С sample_size силуэт вычисляется точно, но только для случайной выборки точек
+    (расстояния - до всех точек), что даёт несмещённую оценку среднего за
+    O(sample_size * n) вместо O(n^2).
+
+    Параметры:
+        C (List): Список кластеров (или ClusterGroups).
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        sample_size (int, optional): Число точек выборки. None - все точки.
+        seed (int, optional): Начальное значение генератора случайных чисел выборки.
+        block_bytes (int): Объём памяти под блоки матрицы расстояний всех потоков, байт.
+        n_jobs (int, optional): Число потоков. По умолчанию - число ядер.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
+
+    Возвращает:
+        float: Средний силуэт.
+
+    Исключения:
+        ValueError: Меньше двух кластеров.
+    """
+    n = sum(len(c) for c in C)
+    rows = None
+    if sample_size is not None and sample_size < n:
+        rows = np.sort(np.random.default_rng(seed).choice(n, sample_size, replace=False))
+    return float(SilhouetteSamples(C, progress, rows, block_bytes, n_jobs, metric).mean())
 
-# default:  DBi(C,0,1,1,1);
 
 #------------------------------------------------------------#
 
+# Совместное вычисление показателей
+
+# Показатели, которые вычисляет QualityIndices
+QUALITY_INDICES = ('DunnIndex', 'DunnIndexMean', 'DaviesBouldinIndex', 'Silhouette')
+
+
+def _is_near(values, best: float, lowest: bool):
+    # Значения в пределах допуска _EXACT_RTOL от экстремума best
+    tol = abs(best) * _EXACT_RTOL
+    return values <= best + tol if lowest else values >= best - tol
+
+
+def _block_extremes(D: np.ndarray, own: np.ndarray, ids: np.ndarray, starts: np.ndarray, r0: int):
+    """
+    Минимальное межкластерное и максимальное внутрикластерное расстояния блока
+    строк D = pairwise(points[r0:r1], points) (точки упорядочены по кластерам).
+
+    Возвращает:
+        (tuple, tuple): (экстремум, пары точек, их расстояния) для минимума и максимума.
+    """
+    line = np.arange(len(D))
+    # Минимум: ближайшая точка другого кластера для каждой строки, пары - только в строках у минимума
+    nearest = np.minimum.reduceat(D, starts, axis=1)
+    nearest[line, own] = np.inf
+    nearest = nearest.min(axis=1)
+    low = nearest.min()
+    if np.isfinite(low):
+        rows = np.flatnonzero(_is_near(nearest, low, True))
+        sub = D[rows]
+        r, c = np.nonzero(_is_near(sub, low, True) & (ids[None, :] != own[rows, None]))
+        low = (low, np.column_stack((rows[r] + r0, c)), sub[r, c])
+    else:
+        low = (low, np.empty((0, 2), dtype=int), np.empty(0))
+
+    # Максимум: подматрицы строк и столбцов одного кластера (строки блока упорядочены по кластерам)
+    segments = np.flatnonzero(np.r_[True, own[1:] != own[:-1]])
+    ends = np.r_[starts[1:], D.shape[1]]
+    blocks = [(a, b, starts[own[a]], ends[own[a]]) for a, b in zip(segments, np.r_[segments[1:], len(D)])]
+    maxima = [D[a:b, c:e].max() for a, b, c, e in blocks]
+    high = max(maxima)
+    pairs, values = [], []
+    for (a, b, c, e), value in zip(blocks, maxima):
+        if _is_near(value, high, False):
+            sub = D[a:b, c:e]
+            r, col = np.nonzero(_is_near(sub, high, False))
+            pairs.append(np.column_stack((r + a + r0, col + c)))
+            values.append(sub[r, col])
+    return low, (high, np.concatenate(pairs), np.concatenate(values))
+
+
+def _distance_sweep(points: np.ndarray, ids: np.ndarray, sizes: np.ndarray, metric: DistanceMetric,
+                    extremes: bool, block_bytes: int = BLOCK_BYTES, n_jobs: int | None = None,
+                    progress: ProgressToken = None):
+    """
+    Один блочный проход по матрице расстояний точек, упорядоченных по кластерам.
+
+    Из каждого блока строк metric.pairwise (как в SilhouetteSamples) извлекаются
+    силуэт строк, суммы расстояний по парам кластеров и, если extremes, пары
+    точек, близкие к минимальному межкластерному и максимальному
+    внутрикластерному расстояниям. Блоки обрабатываются в n_jobs потоках.
+
+    Возвращает:
+        (np.ndarray, np.ndarray, tuple, tuple): Силуэт точек, суммы расстояний sums[a, b]
+        между кластерами, (минимум, пары) межкластерных и (максимум, пары)
+        внутрикластерных расстояний.
+    """
+    n, k = len(points), len(sizes)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    per_block = max(1, block_bytes // (8 * n * n_jobs))
+
+    def run(span):
+        r0, r1 = span
+        D = metric.pairwise(points[r0:r1], points)
+        own = ids[r0:r1]
+        line = np.arange(r1 - r0)
+        sums = np.add.reduceat(D, starts, axis=1)
+
+        a = sums[line, own] / np.maximum(sizes[own] - 1, 1)
+        means = sums / sizes
+        means[line, own] = np.inf
+        b = means.min(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = (b - a) / np.maximum(a, b)
+        s[(sizes[own] == 1) | ~np.isfinite(s)] = 0.0
+
+        cluster_sums = np.zeros((k, k))
+        np.add.at(cluster_sums, own, sums)
+        return s, cluster_sums, _block_extremes(D, own, ids, starts, r0) if extremes else None
+
+    tasks = (((r0, min(r0 + per_block, n)), (min(r0 + per_block, n) - r0) * n) for r0 in range(0, n, per_block))
+    values, sums, lows, highs = [], np.zeros((k, k)), [], []
+    for s, cluster_sums, found in _run_blocks(tasks, run, n_jobs, n * n, progress, 'QualityIndices'):
+        values.append(s)
+        sums += cluster_sums
+        if extremes:
+            lows.append(found[0])
+            highs.append(found[1])
+
+    def select(blocks, lowest):
+        # Пары в пределах допуска от экстремума по всем блокам
+        blocks = [b for b in blocks if np.isfinite(b[0])]
+        if not blocks:
+            return (np.inf if lowest else -np.inf), np.empty((0, 2), dtype=int)
+        best = min(b[0] for b in blocks) if lowest else max(b[0] for b in blocks)
+        pairs = np.concatenate([b[1] for b in blocks])
+        return best, pairs[_is_near(np.concatenate([b[2] for b in blocks]), best, lowest)]
+
+    return np.concatenate(values), sums, select(lows, True), select(highs, False)
+
+
+def QualityIndices(C, names=QUALITY_INDICES, progress: ProgressToken = None, block_bytes: int = BLOCK_BYTES,
+                   n_jobs: int | None = None, metric='euclidean') -> Dict[str, float]:
+    """
+    Вычисляет несколько показателей качества с общими промежуточными результатами.
+
+    Если запрошен Silhouette, все попарные расстояния перебираются один раз
+    (см. _distance_sweep): из того же прохода берутся суммы расстояний между
+    кластерами для DunnIndexMean, а также минимальное межкластерное и
+    максимальное внутрикластерное расстояния для DunnIndex и DunnIndexMean.
+    Иначе полный перебор не нужен: диаметры кластеров вычисляются один раз для
+    обоих индексов Данна, минимум - KD-деревом, средние - блоками между
+    кластерами. DaviesBouldinIndex требует только центроидов.
+
+    Значения DunnIndex совпадают с DunnIndex до последнего бита, остальные - с
+    отдельными функциями с точностью до округления сумм. Пустые кластеры не
+    учитываются; DaviesBouldinIndex и Silhouette для одного кластера не определены
+    и в результат не входят.
+
+    Параметры:
+        C (List): Список кластеров (или ClusterGroups).
+        names (tuple): Названия показателей из QUALITY_INDICES.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        block_bytes (int): Объём памяти под блоки матрицы расстояний всех потоков, байт.
+        n_jobs (int, optional): Число потоков. По умолчанию - число ядер.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
+
+    Возвращает:
+        Dict[str, float]: Название показателя -> значение (в порядке names).
+
+    Исключения:
+        ValueError: Неизвестное название показателя.
+    """
+    unknown = [name for name in names if name not in QUALITY_INDICES]
+    if unknown:
+        raise ValueError(f"Unknown quality indices {unknown}, expected some of {QUALITY_INDICES}")
+    metric = get_metric(metric)
+    if not isinstance(C, ClusterGroups):
+        C = [_as_points(c) for c in C if len(c) > 0]
+    k = len(C)
+    dunn = 'DunnIndex' in names or 'DunnIndexMean' in names
+    sizes = np.array([len(c) for c in C])
+    pairs = [(i, j) for i in range(k) for j in range(i + 1, k)]
+    values = dict()
+
+    mind, maxd, sums = 100000, 0, None
+    if 'Silhouette' in names and k > 1:
+        points, ids = _cluster_ids(C)
+        s, sums, (low, low_pairs), (high, high_pairs) = _distance_sweep(
+            points, ids, sizes, metric, dunn, block_bytes, n_jobs, progress and progress.sub(0.0, 0.9))
+        values['Silhouette'] = float(s.mean())
+        if dunn:
+            # Точные экстремумы, как в DunnIndex: пересчёт metric.pair для близких к ним пар
+            mind = min(mind, min(metric.pair(points[a], points[b]) for a, b in low_pairs))
+            if high > 0:
+                maxd = max(metric.pair(points[a], points[b]) for a, b in high_pairs)
+            sums = [sums[i, j] for i, j in pairs]
+    elif dunn:
+        sub = progress and progress.sub(0.0, 0.9)
+        for i in range(k):
+            if sub is not None:
+                sub.report(0.3 * i / k, 'QualityIndices')
+            maxd = max(maxd, MaxIntraCluster(C, i, sub, block_bytes, metric))
+        if 'DunnIndex' in names and k > 1:
+            mind = min(mind, _min_intercluster_all([_as_points(c) for c in C], sub and sub.sub(0.3, 0.5), metric))
+        if 'DunnIndexMean' in names:
+            clusters = [_as_points(c) for c in C]
+            sums = _distance_sums([(clusters[i], clusters[j]) for i, j in pairs], block_bytes, n_jobs,
+                                  sub and sub.sub(0.5, 1.0), 'QualityIndices', metric)
+
+    if 'DunnIndex' in names:
+        values['DunnIndex'] = mind / maxd
+    if 'DunnIndexMean' in names:
+        mean = 100000
+        for (i, j), sum in zip(pairs, sums):
+            mean = min(mean, sum * (1 / (sizes[i] * sizes[j])))
+        values['DunnIndexMean'] = mean / maxd
+    if 'DaviesBouldinIndex' in names and k > 1:
+        values['DaviesBouldinIndex'] = DaviesBouldinIndex(C, metric=metric)
+    if progress is not None:
+        progress.report(1.0, 'QualityIndices')
+    return {name: float(values[name]) for name in names if name in values}
+
+
+#------------------------------------------------------------#
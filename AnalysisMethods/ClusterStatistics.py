@@ -0,0 +1,205 @@
+# This Python file uses the following encoding: utf-8
+"""
+Достаточные статистики кластеров и показатели, которые из них выводятся.
+
+Для каждого кластера один раз накапливаются число точек, сумма координат,
+сумма квадратов координат и ограничивающий прямоугольник. Из них без
+повторного обращения к точкам получаются центроиды, внутрикластерная сумма
+квадратов (SSE), среднеквадратичные радиусы, индекс Калинского-Харабаза и
+индекс Дэвиса-Болдина с евклидовой нормой и среднеквадратичным рассеянием
+(DaviesBouldinIndex(C, p=2, q=2)). При смене меток части точек статистики
+обновляются только по этим точкам.
+
+Координаты накапливаются относительно сдвига (среднего исходных точек), чтобы
+разность сумм квадратов в SSE не теряла точность на данных, удалённых от нуля.
+"""
+
+import numpy as np
+
+
+class ClusterStats:
+    """Достаточные статистики кластеров.
+
+    Массивы counts, sums, sumsq, mins, maxs упорядочены как labels (по
+    возрастанию меток). Кластер, из которого убраны все точки, остаётся в
+    массивах с counts = 0 и не участвует в показателях. После удаления точек
+    mins и maxs остаются верными, но, возможно, не точными границами.
+    """
+
+    def __init__(self, n_features: int, shift=None):
+        """
+        Аргументы:
+            n_features (int): Число признаков.
+            shift (array_like, optional): Сдвиг координат при накоплении. По умолчанию нули.
+        """
+        self.shift = np.zeros(n_features) if shift is None else np.asarray(shift, dtype=float)
+        self.labels = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.sums = np.empty((0, n_features))
+        self.sumsq = np.empty((0, n_features))
+        self.mins = np.empty((0, n_features))
+        self.maxs = np.empty((0, n_features))
+
+    @classmethod
+    def from_labels(cls, points, labels) -> 'ClusterStats':
+        """Статистики разбиения за один проход по точкам.
+
+        Аргументы:
+            points (array_like): Точки формы (n_samples, n_features).
+            labels (array_like): Метки кластеров.
+
+        Возвращает:
+            ClusterStats: Статистики всех кластеров.
+        """
+        points = _as_points(points)
+        stats = cls(points.shape[1], points.mean(axis=0) if len(points) else None)
+        stats.add(points, labels)
+        return stats
+
+    def _rows(self, labels: np.ndarray) -> np.ndarray:
+        # Строки массивов для меток; новые метки добавляются с нулевыми статистиками
+        new = np.setdiff1d(labels, self.labels)
+        if len(new):
+            at = np.searchsorted(self.labels, new)
+            d = self.sums.shape[1]
+            self.labels = np.insert(self.labels, at, new)
+            self.counts = np.insert(self.counts, at, 0)
+            self.sums = np.insert(self.sums, at, np.zeros(d), axis=0)
+            self.sumsq = np.insert(self.sumsq, at, np.zeros(d), axis=0)
+            self.mins = np.insert(self.mins, at, np.full(d, np.inf), axis=0)
+            self.maxs = np.insert(self.maxs, at, np.full(d, -np.inf), axis=0)
+        return np.searchsorted(self.labels, labels)
+
+    def _accumulate(self, points, labels, sign: int) -> np.ndarray:
+        points = _as_points(points)
+        labels = np.asarray(labels).ravel()
+        if len(points) != len(labels):
+            raise ValueError(f"points and labels lengths differ: {len(points)} != {len(labels)}")
+        unique = np.unique(labels)
+        if sign < 0 and not np.isin(unique, self.labels).all():
+            raise ValueError("removed points from a cluster that does not exist")
+        rows = self._rows(unique)[np.searchsorted(unique, labels)]
+        k = len(self.labels)
+        counts = np.bincount(rows, minlength=k)
+        if sign < 0 and (counts > self.counts).any():
+            raise ValueError("removed more points than a cluster contains")
+        centered = points - self.shift
+        self.counts += sign * counts
+        for d in range(centered.shape[1]):
+            self.sums[:, d] += sign * np.bincount(rows, centered[:, d], k)
+            self.sumsq[:, d] += sign * np.bincount(rows, centered[:, d] ** 2, k)
+        return rows
+
+    def add(self, points, labels) -> None:
+        """Добавляет точки в кластеры labels.
+        """
+        points = _as_points(points)
+        rows = self._accumulate(points, labels, +1)
+        np.minimum.at(self.mins, rows, points)
+        np.maximum.at(self.maxs, rows, points)
+
+    def remove(self, points, labels) -> None:
+        """Убирает точки из кластеров labels (точки должны были быть добавлены с этими метками).
+
+        Исключения:
+            ValueError: Кластера нет или в нём не хватает точек (статистики не изменяются).
+        """
+        self._accumulate(points, labels, -1)
+        empty = self.counts == 0
+        # Пустой кластер: обнуляем суммы, чтобы не копить погрешность
+        self.sums[empty] = 0
+        self.sumsq[empty] = 0
+        self.mins[empty] = np.inf
+        self.maxs[empty] = -np.inf
+
+    def update(self, points, old_labels, new_labels) -> None:
+        """Переносит точки из кластеров old_labels в new_labels.
+
+        Аргументы:
+            points (array_like): Точки, метки которых изменились.
+            old_labels (array_like): Прежние метки этих точек.
+            new_labels (array_like): Новые метки.
+        """
+        self.remove(points, old_labels)
+        self.add(points, new_labels)
+
+    # ------------------------------------------------------------------
+    # Производные величины (только непустые кластеры)
+    # ------------------------------------------------------------------
+
+    @property
+    def active(self) -> np.ndarray:
+        return self.counts > 0
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Число точек непустых кластеров
+        """
+        return self.counts[self.active]
+
+    @property
+    def centroids(self) -> np.ndarray:
+        """Центроиды непустых кластеров
+        """
+        active = self.active
+        return self.sums[active] / self.counts[active, None] + self.shift
+
+    @property
+    def sse(self) -> np.ndarray:
+        """Сумма квадратов расстояний точек до центроида для каждого непустого кластера
+        """
+        active = self.active
+        sums, counts = self.sums[active], self.counts[active]
+        return np.maximum((self.sumsq[active] - sums * sums / counts[:, None]).sum(axis=1), 0.0)
+
+    @property
+    def inertia(self) -> float:
+        """Внутрикластерная сумма квадратов (SSE) разбиения
+        """
+        return float(self.sse.sum())
+
+    @property
+    def radii(self) -> np.ndarray:
+        """Среднеквадратичные радиусы непустых кластеров sqrt(SSE / n)
+        """
+        return np.sqrt(self.sse / self.sizes)
+
+    def calinski_harabasz(self) -> float:
+        """Индекс Калинского-Харабаза (чем больше, тем лучше разбиение).
+
+        Исключения:
+            ValueError: Меньше двух непустых кластеров.
+        """
+        sizes = self.sizes
+        k, n = len(sizes), sizes.sum()
+        if k < 2:
+            raise ValueError(f"Calinski-Harabasz index requires at least 2 clusters, got {k}")
+        # Межкластерный разброс: в сдвинутых координатах общий центр - sums.sum() / n
+        means = self.sums[self.active] / sizes[:, None]
+        between = (sizes * ((means - self.sums.sum(axis=0) / n) ** 2).sum(axis=1)).sum()
+        within = self.inertia
+        return float(1.0 if within == 0 else between * (n - k) / (within * (k - 1)))
+
+    def davies_bouldin(self) -> float:
+        """Индекс Дэвиса-Болдина с евклидовой нормой и рассеянием S_i = radii[i]
+        (совпадает с DaviesBouldinIndex(C, p=2, q=2)).
+
+        Исключения:
+            ValueError: Меньше двух непустых кластеров.
+        """
+        centroids = self.centroids
+        if len(centroids) < 2:
+            raise ValueError(f"Davies-Bouldin index requires at least 2 clusters, got {len(centroids)}")
+        S = self.radii
+        diff = centroids[:, None, :] - centroids[None, :, :]
+        M = np.sqrt((diff * diff).sum(axis=-1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            R = (S[:, None] + S[None, :]) / M
+        R[M == 0] = np.inf
+        np.fill_diagonal(R, -np.inf)
+        return float(R.max(axis=1).mean())
+
+
+def _as_points(points) -> np.ndarray:
+    points = np.asarray(points, dtype=float)
+    return points.reshape(len(points), -1)
@@ -0,0 +1,132 @@
+# This Python file uses the following encoding: utf-8
+"""
+Метрики расстояния для показателей качества кластеризации.
+
+Каждая метрика задаётся векторными ядрами, которые обрабатывают целые блоки
+точек: матрица расстояний блока (pairwise), расстояния между соответствующими
+строками (rowwise) и расстояние между двумя точками (pair) - им пересчитываются
+только пары, близкие к экстремуму. Для метрик Минковского (и монотонных
+преобразований, как квадрат евклидова расстояния) известен порядок нормы, что
+позволяет искать ближайшие пары KD-деревом, отсекать кластеры по
+ограничивающим прямоугольникам и искать диаметр по выпуклой оболочке.
+
+Функции AnalysisAlgorithms принимают аргумент metric: название из METRICS,
+объект DistanceMetric или число - порядок нормы Минковского.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+import numpy as np
+from scipy.spatial import distance
+
+
+@dataclass(frozen=True)
+class DistanceMetric:
+    """Метрика расстояния с блочными ядрами
+    """
+
+    """Название метрики
+    """
+    name: str
+
+    """Матрица расстояний: (n, d), (m, d) -> (n, m)
+    """
+    pairwise: Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+    """Расстояния между строками с транслированием (broadcasting): (n, d), (n, d) или (1, d) -> (n,)
+    """
+    rowwise: Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+    """Расстояние между двумя точками
+    """
+    pair: Callable[[np.ndarray, np.ndarray], float]
+
+    """Порядок нормы Минковского, монотонной функцией которой является метрика;
+    None - метрика не нормированная (поиск экстремумов перебором блоков)
+    """
+    minkowski_p: float | None = None
+
+
+def _rowwise_minkowski(p: float) -> Callable:
+    def rowwise(A, B):
+        diff = np.abs(np.asarray(A, dtype=float) - np.asarray(B, dtype=float))
+        if p == np.inf:
+            return diff.max(axis=-1)
+        if p == 1:
+            return diff.sum(axis=-1)
+        if p == 2:
+            return np.sqrt((diff * diff).sum(axis=-1))
+        return (diff ** p).sum(axis=-1) ** (1 / p)
+    return rowwise
+
+
+def _rowwise_sqeuclidean(A, B):
+    diff = np.asarray(A, dtype=float) - np.asarray(B, dtype=float)
+    return (diff * diff).sum(axis=-1)
+
+
+def _rowwise_cosine(A, B):
+    A, B = np.broadcast_arrays(np.asarray(A, dtype=float), np.asarray(B, dtype=float))
+    norms = np.sqrt((A * A).sum(axis=-1) * (B * B).sum(axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 1.0 - (A * B).sum(axis=-1) / norms
+
+
+def minkowski(p: float) -> DistanceMetric:
+    """Метрика Минковского порядка p (p = 1, 2, inf - зарегистрированные метрики).
+
+    При p < 1 функция не является нормой: KD-дерево и выпуклая оболочка не
+    применяются (minkowski_p = None).
+
+    Исключения:
+        ValueError: p <= 0.
+    """
+    p = float(p)
+    if not p > 0:
+        raise ValueError(f"Minkowski order must be positive, got {p}")
+    for metric in METRICS.values():
+        if metric.minkowski_p == p and metric.name != 'sqeuclidean':
+            return metric
+    return DistanceMetric(f'minkowski{p:g}', lambda A, B: distance.cdist(A, B, 'minkowski', p=p),
+                          _rowwise_minkowski(p), lambda u, v: distance.minkowski(u, v, p),
+                          p if p >= 1 else None)
+
+
+"""Зарегистрированные метрики: название -> метрика
+"""
+METRICS: Dict[str, DistanceMetric] = dict()
+
+
+def register_metric(metric: DistanceMetric) -> DistanceMetric:
+    """Добавляет метрику в METRICS (доступна по названию в аргументе metric).
+    """
+    METRICS[metric.name] = metric
+    return metric
+
+
+def get_metric(metric: str | float | DistanceMetric = 'euclidean') -> DistanceMetric:
+    """Метрика по названию, порядку нормы Минковского или сам объект DistanceMetric.
+
+    Исключения:
+        ValueError: Неизвестная метрика.
+    """
+    if isinstance(metric, DistanceMetric):
+        return metric
+    if isinstance(metric, str):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric}, expected one of {sorted(METRICS)}")
+        return METRICS[metric]
+    return minkowski(metric)
+
+
+register_metric(DistanceMetric('euclidean', lambda A, B: distance.cdist(A, B, 'euclidean'),
+                               _rowwise_minkowski(2), distance.euclidean, 2.0))
+register_metric(DistanceMetric('sqeuclidean', lambda A, B: distance.cdist(A, B, 'sqeuclidean'),
+                               _rowwise_sqeuclidean, distance.sqeuclidean, 2.0))
+register_metric(DistanceMetric('manhattan', lambda A, B: distance.cdist(A, B, 'cityblock'),
+                               _rowwise_minkowski(1), distance.cityblock, 1.0))
+register_metric(DistanceMetric('chebyshev', lambda A, B: distance.cdist(A, B, 'chebyshev'),
+                               _rowwise_minkowski(np.inf), distance.chebyshev, np.inf))
+register_metric(DistanceMetric('cosine', lambda A, B: distance.cdist(A, B, 'cosine'),
+                               _rowwise_cosine, distance.cosine, None))
@@ -0,0 +1,209 @@
+# This Python file uses the following encoding: utf-8
+"""
+Внешние показатели качества кластеризации: сравнение найденных меток с
+эталонной разметкой (например, метками генератора распределений).
+
+Все показатели выводятся из разреженной таблицы сопряжённости: метки
+кодируются номерами 0..k-1, пара (эталонная, найденная) - одним числом
+true * k_pred + pred, а число точек в каждой ячейке - np.bincount по этим
+числам (или np.unique, если плотная таблица слишком велика). Таблица хранит
+только непустые ячейки, поэтому тысячи кластеров и шум в виде отдельных точек
+на миллионах точек обрабатываются за доли секунды.
+
+Значения ARI, NMI (среднее арифметическое энтропий) и V-меры совпадают с
+sklearn.metrics с точностью до округления.
+"""
+
+import numpy as np
+
+# Показатели, которые вычисляет external_scores
+EXTERNAL_METRICS = ('ARI', 'NMI', 'V-measure', 'Purity')
+
+# Способы учёта шума (метки noise_label в найденной разметке)
+NOISE_MODES = ('cluster', 'singletons', 'ignore')
+
+
+def _encode(labels: np.ndarray):
+    # Номера меток 0..k-1 в порядке возрастания меток и их число k
+    if labels.dtype.kind in 'iub' and len(labels):
+        labels = labels.astype(np.int64, copy=False)
+        low = labels.min()
+        span = int(labels.max()) - int(low) + 1
+        # Целые метки с небольшим разбросом: без сортировки
+        if span <= 4 * len(labels) + 1024:
+            shifted = labels - low
+            used = np.bincount(shifted, minlength=span) > 0
+            return (np.cumsum(used) - 1)[shifted], int(used.sum())
+    unique, codes = np.unique(labels, return_inverse=True)
+    return codes.ravel(), len(unique)
+
+
+def _entropy(sizes: np.ndarray) -> float:
+    sizes = sizes[sizes > 0].astype(float)
+    if len(sizes) <= 1:
+        return 0.0
+    total = sizes.sum()
+    return float(-np.sum((sizes / total) * (np.log(sizes) - np.log(total))))
+
+
+class Contingency:
+    """Разреженная таблица сопряжённости эталонных и найденных меток.
+
+    Непустые ячейки: rows[c], cols[c] - номера эталонного и найденного кластеров,
+    counts[c] - число общих точек. true_sizes и pred_sizes - размеры кластеров.
+    """
+
+    def __init__(self, labels_true, labels_pred, noise: str = 'cluster', noise_label=-1):
+        """
+        Аргументы:
+            labels_true (array_like): Эталонные метки.
+            labels_pred (array_like): Найденные метки.
+            noise (str): Учёт точек с меткой noise_label в labels_pred: 'cluster' - один
+                         кластер (как в sklearn), 'singletons' - каждая точка отдельный
+                         кластер, 'ignore' - точки не учитываются.
+            noise_label: Метка шума.
+
+        Исключения:
+            ValueError: Число меток различается или неизвестный способ учёта шума.
+        """
+        labels_true = np.asarray(labels_true).ravel()
+        labels_pred = np.asarray(labels_pred).ravel()
+        if len(labels_true) != len(labels_pred):
+            raise ValueError(f"labels lengths differ: {len(labels_true)} != {len(labels_pred)}")
+        if noise not in NOISE_MODES:
+            raise ValueError(f"Unknown noise mode {noise}, expected one of {NOISE_MODES}")
+
+        is_noise = labels_pred == noise_label if noise != 'cluster' else None
+        if noise == 'ignore':
+            labels_true, labels_pred = labels_true[~is_noise], labels_pred[~is_noise]
+        true, n_true = _encode(labels_true)
+        if noise == 'singletons':
+            # Отдельный номер после номеров кластеров для каждой точки шума
+            pred = np.empty(len(labels_pred), dtype=np.int64)
+            pred[~is_noise], n_pred = _encode(labels_pred[~is_noise])
+            pred[is_noise] = n_pred + np.arange(np.count_nonzero(is_noise))
+            n_pred += np.count_nonzero(is_noise)
+        else:
+            pred, n_pred = _encode(labels_pred)
+
+        self.n = len(true)
+        combined = true.astype(np.int64) * n_pred + pred
+        if n_true * n_pred <= 4 * self.n + 1024:
+            counts = np.bincount(combined, minlength=n_true * n_pred)
+            cells = np.flatnonzero(counts)
+            counts = counts[cells]
+        else:
+            cells, counts = np.unique(combined, return_counts=True)
+        self.rows, self.cols = np.divmod(cells, max(n_pred, 1))
+        self.counts = counts.astype(np.int64)
+        self.true_sizes = np.bincount(true, minlength=n_true).astype(np.int64)
+        self.pred_sizes = np.bincount(pred, minlength=n_pred).astype(np.int64)
+
+    @property
+    def n_true(self) -> int:
+        return len(self.true_sizes)
+
+    @property
+    def n_pred(self) -> int:
+        return len(self.pred_sizes)
+
+    def adjusted_rand_index(self) -> float:
+        """Скорректированный индекс Рэнда (1 - совпадение разбиений, около 0 - случайное).
+        """
+        # Матрица совпадений пар точек (как sklearn.metrics.cluster.pair_confusion_matrix), целые Python
+        n = self.n
+        sum_squares = int(np.dot(self.counts, self.counts))
+        tp = sum_squares - n
+        fp = int(np.dot(self.pred_sizes, self.pred_sizes)) - sum_squares
+        fn = int(np.dot(self.true_sizes, self.true_sizes)) - sum_squares
+        tn = n * n - fp - fn - sum_squares
+        if fn == 0 and fp == 0:
+            return 1.0
+        return 2.0 * (tp * tn - fn * fp) / ((tp + fn) * (fn + tn) + (tp + fp) * (fp + tn))
+
+    def mutual_info(self) -> float:
+        """Взаимная информация разбиений (в натах).
+        """
+        if self.n_true <= 1 or self.n_pred <= 1:
+            return 0.0
+        counts = self.counts.astype(float)
+        outer = self.true_sizes[self.rows].astype(float) * self.pred_sizes[self.cols]
+        mi = (counts / self.n) * (np.log(counts) + np.log(self.n) - np.log(outer))
+        mi[np.abs(mi) < np.finfo(float).eps] = 0.0
+        return float(max(mi.sum(), 0.0))
+
+    def normalized_mutual_info(self) -> float:
+        """Нормированная взаимная информация: MI / среднее арифметическое энтропий.
+        """
+        if self.n_true == self.n_pred <= 1:
+            return 1.0
+        mi = self.mutual_info()
+        if mi == 0:
+            return 0.0
+        normalizer = max((_entropy(self.true_sizes) + _entropy(self.pred_sizes)) / 2, np.finfo(float).eps)
+        return mi / normalizer
+
+    def homogeneity_completeness_v(self):
+        """Однородность, полнота и V-мера (их среднее гармоническое).
+
+        Возвращает:
+            (float, float, float): homogeneity, completeness, v_measure.
+        """
+        if self.n == 0:
+            return 1.0, 1.0, 1.0
+        h_true, h_pred = _entropy(self.true_sizes), _entropy(self.pred_sizes)
+        mi = self.mutual_info()
+        homogeneity = mi / h_true if h_true else 1.0
+        completeness = mi / h_pred if h_pred else 1.0
+        if homogeneity + completeness == 0.0:
+            return homogeneity, completeness, 0.0
+        return homogeneity, completeness, 2 * homogeneity * completeness / (homogeneity + completeness)
+
+    def purity(self) -> float:
+        """Чистота: доля точек, попавших в преобладающий эталонный класс своего кластера.
+        """
+        if self.n == 0:
+            return 1.0
+        best = np.zeros(self.n_pred, dtype=np.int64)
+        np.maximum.at(best, self.cols, self.counts)
+        return float(best.sum() / self.n)
+
+
+def adjusted_rand_index(labels_true, labels_pred, noise: str = 'cluster') -> float:
+    """Скорректированный индекс Рэнда (см. Contingency).
+    """
+    return Contingency(labels_true, labels_pred, noise).adjusted_rand_index()
+
+
+def normalized_mutual_info(labels_true, labels_pred, noise: str = 'cluster') -> float:
+    """Нормированная взаимная информация (см. Contingency).
+    """
+    return Contingency(labels_true, labels_pred, noise).normalized_mutual_info()
+
+
+def v_measure(labels_true, labels_pred, noise: str = 'cluster') -> float:
+    """V-мера - среднее гармоническое однородности и полноты (см. Contingency).
+    """
+    return Contingency(labels_true, labels_pred, noise).homogeneity_completeness_v()[2]
+
+
+def purity(labels_true, labels_pred, noise: str = 'cluster') -> float:
+    """Чистота разбиения (см. Contingency).
+    """
+    return Contingency(labels_true, labels_pred, noise).purity()
+
+
+def external_scores(labels_true, labels_pred, noise: str = 'cluster') -> dict:
+    """Все внешние показатели по одной таблице сопряжённости.
+
+    Аргументы:
+        labels_true (array_like): Эталонные метки.
+        labels_pred (array_like): Найденные метки.
+        noise (str): Учёт шума (метка -1), см. Contingency.
+
+    Возвращает:
+        Dict[str, float]: Название из EXTERNAL_METRICS -> значение.
+    """
+    table = Contingency(labels_true, labels_pred, noise)
+    return {'ARI': table.adjusted_rand_index(), 'NMI': table.normalized_mutual_info(),
+            'V-measure': table.homogeneity_completeness_v()[2], 'Purity': table.purity()}
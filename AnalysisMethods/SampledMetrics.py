@@ -0,0 +1,257 @@
+# This Python file uses the following encoding: utf-8
+"""
+Приближённые показатели качества кластеризации для больших данных (изображений).
+
+Точные показатели (DunnIndex, DunnIndexMean) требуют перебора пар точек и для
+изображений в миллионы пикселей слишком долги. Здесь показатель вычисляется
+по стратифицированной выборке: из каждого кластера берётся число точек,
+пропорциональное его размеру (но не меньше min_per_cluster, а при большом
+числе кластеров - не меньше доли бюджета), так что малые кластеры не теряются,
+а выборка не превышает бюджет. Выборка повторяется с новыми случайными точками исходных
+данных, пока не исчерпан бюджет повторений или времени. Распределение значений
+по независимым выборкам - распределение оценки при данном размере выборки
+(в отличие от бутстрепа, точки не повторяются внутри выборки, поэтому нулевые
+расстояния между копиями точки не искажают показатели); по нему строится
+процентильный доверительный интервал. Если до исчерпания времени выполнено
+меньше MIN_REPLICATES выборок, вместо интервала указывается размах значений.
+
+Интервал описывает случайный разброс оценки, но не её смещение: на выборке
+минимальное межкластерное расстояние обычно больше, а диаметр кластера меньше,
+чем на всех точках. Поэтому значения помечаются признаком approximate.
+"""
+
+import time
+
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+import numpy as np
+
+from AnalysisMethods.AnalysisAlgorithms import (
+    QUALITY_INDICES,
+    ClusterGroups,
+    QualityIndices,
+    group_by_label
+)
+from Frameworks_ccore.ProgressToken import ProgressToken
+
+# Число точек одной выборки по умолчанию
+DEFAULT_SAMPLE_BUDGET = 5_000
+
+# Число повторений выборки по умолчанию
+DEFAULT_REPLICATES = 30
+
+# Время на вычисление показателей по умолчанию, с
+DEFAULT_TIME_BUDGET = 10.0
+
+# Не меньше стольких точек из каждого кластера (или весь кластер, если он меньше)
+MIN_PER_CLUSTER = 20
+
+# Наименьшее число выборок для доверительного интервала; при меньшем - размах значений
+MIN_REPLICATES = 10
+
+
+@dataclass
+class MetricEstimate:
+    """Значение показателя качества с доверительным интервалом
+    """
+
+    """Значение показателя (для приближённого - среднее по выборкам)
+    """
+    value: float
+
+    """Нижняя граница доверительного интервала
+    """
+    low: float
+
+    """Верхняя граница доверительного интервала
+    """
+    high: float
+
+    """Вычислено ли значение по выборке (False - по всем точкам, интервал вырожден)
+    """
+    approximate: bool = False
+
+    """Число точек в одной выборке (или всех точек)
+    """
+    sample_size: int = 0
+
+    """Число выполненных повторений выборки
+    """
+    replicates: int = 1
+
+    """Доверительная вероятность интервала. None - low и high - размах значений
+    (выполнено меньше MIN_REPLICATES выборок)
+    """
+    confidence: float | None = 0.95
+
+
+class StratifiedSampler:
+    """Стратифицированные по кластерам выборки точек.
+
+    Точки группируются по меткам один раз (group_by_label); каждая выборка
+    копирует только выбранные точки из упорядоченного по кластерам массива.
+    """
+
+    def __init__(self, points, labels, budget: int = DEFAULT_SAMPLE_BUDGET,
+                 min_per_cluster: int = MIN_PER_CLUSTER, seed: int | None = 0):
+        """
+        Аргументы:
+            points (array_like): Точки формы (n_samples, n_features).
+            labels (array_like): Метки кластеров для каждой точки.
+            budget (int): Желаемое число точек в выборке.
+            min_per_cluster (int): Наименьшее число точек кластера в выборке.
+            seed (int, optional): Начальное значение генератора случайных чисел.
+
+        Исключения:
+            ValueError: Число точек и меток различается.
+        """
+        self._groups = group_by_label(points, labels)
+        self.sizes = self._groups.sizes
+        self.sample_sizes = self._allocate(self.sizes, budget, min_per_cluster)
+        self._rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def _allocate(sizes: np.ndarray, budget: int, min_per_cluster: int) -> np.ndarray:
+        # Не меньше min_per_cluster точек кластера (или весь кластер), остаток бюджета -
+        # пропорционально размеру; сумма не больше budget
+        total = sizes.sum()
+        if total <= budget:
+            return sizes.copy()
+        if len(sizes) > budget:
+            # Кластеров больше бюджета: по одной точке из budget крупнейших кластеров
+            share = np.zeros_like(sizes)
+            share[np.argsort(-sizes, kind='stable')[:budget]] = 1
+            return share
+        base = np.minimum(sizes, min(min_per_cluster, budget // len(sizes)))
+        rest = budget - base.sum()
+        excess = sizes - base
+        # Метод наибольших остатков: сумма долей равна rest, доля не больше excess
+        exact = excess * (rest / excess.sum())
+        share = np.floor(exact).astype(int)
+        share[np.argsort(share - exact)[:rest - share.sum()]] += 1
+        return base + share
+
+    @property
+    def exhaustive(self) -> bool:
+        """Выборка содержит все точки (показатель вычисляется точно)
+        """
+        return bool((self.sample_sizes == self.sizes).all())
+
+    @property
+    def sample_size(self) -> int:
+        return int(self.sample_sizes.sum())
+
+    def sample(self) -> ClusterGroups:
+        """Новая случайная выборка, сгруппированная по кластерам.
+        """
+        groups = self._groups
+        if self.exhaustive:
+            return groups
+        idx = np.concatenate([start + self._rng.choice(size, k, replace=False)
+                              for start, size, k in zip(groups.offsets[:-1], self.sizes, self.sample_sizes)])
+        return group_by_label(groups.points[idx], np.repeat(groups.labels, self.sample_sizes))
+
+
+def estimate_metric(metric: Callable, points, labels, budget: int = DEFAULT_SAMPLE_BUDGET,
+                    replicates: int = DEFAULT_REPLICATES, time_budget: float | None = DEFAULT_TIME_BUDGET,
+                    confidence: float = 0.95, seed: int | None = 0,
+                    progress: ProgressToken | None = None) -> MetricEstimate:
+    """Показатель качества по стратифицированным выборкам с доверительным интервалом.
+
+    Если все точки помещаются в budget, показатель вычисляется один раз по всем
+    точкам. Иначе выборки повторяются replicates раз, пока следующая выборка
+    (по времени предыдущей) укладывается в time_budget; первая выполняется
+    всегда. Интервал - процентили значений по выборкам, если их не меньше
+    MIN_REPLICATES, иначе размах значений (confidence = None).
+
+    Аргументы:
+        metric (Callable): Показатель вида metric(C) -> float (например, DunnIndex).
+        points (array_like): Точки формы (n_samples, n_features).
+        labels (array_like): Метки кластеров.
+        budget (int): Число точек одной выборки.
+        replicates (int): Наибольшее число повторений выборки.
+        time_budget (float, optional): Время на все повторения, с. None - без ограничения.
+        confidence (float): Доверительная вероятность интервала.
+        seed (int, optional): Начальное значение генератора случайных чисел.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+
+    Возвращает:
+        MetricEstimate: Значение, интервал и признак приближённого вычисления.
+    """
+    return _estimate(metric, StratifiedSampler(points, labels, budget, seed=seed),
+                     replicates, time_budget, confidence, progress)
+
+
+def _estimate(metric: Callable, sampler: StratifiedSampler, replicates: int, time_budget: float | None,
+              confidence: float, progress: ProgressToken | None) -> MetricEstimate:
+    name = getattr(metric, '__name__', 'metric')
+    return _estimate_all(lambda C: {name: metric(C)}, name, sampler, replicates, time_budget,
+                         confidence, progress)[name]
+
+
+def _estimate_all(evaluate: Callable, message: str, sampler: StratifiedSampler, replicates: int,
+                  time_budget: float | None, confidence: float,
+                  progress: ProgressToken | None) -> Dict[str, MetricEstimate]:
+    # evaluate(C) -> {название: значение}: все показатели по одной и той же выборке
+    if sampler.exhaustive:
+        values = evaluate(sampler.sample())
+        if progress is not None:
+            progress.report(1.0, message)
+        return {name: MetricEstimate(float(value), float(value), float(value), False, sampler.sample_size, 1, confidence)
+                for name, value in values.items()}
+
+    started = time.monotonic()
+    replicates = max(replicates, 1)
+    samples = []
+    for r in range(replicates):
+        if progress is not None:
+            progress.report(r / replicates, message)
+        replicate_started = time.monotonic()
+        samples.append(evaluate(sampler.sample()))
+        # Следующая выборка не начинается, если по времени предыдущей она не уложится в time_budget
+        now = time.monotonic()
+        if time_budget is not None and now - started + (now - replicate_started) > time_budget:
+            break
+    if progress is not None:
+        progress.report(1.0, message)
+
+    # По нескольким выборкам процентили не определены: только размах значений
+    if len(samples) < MIN_REPLICATES:
+        quantiles, confidence = [0.0, 1.0], None
+    else:
+        quantiles = [(1 - confidence) / 2, (1 + confidence) / 2]
+    estimates = dict()
+    for name in samples[0]:
+        values = [float(sample[name]) for sample in samples]
+        low, high = np.quantile(values, quantiles)
+        estimates[name] = MetricEstimate(float(np.mean(values)), float(low), float(high), True,
+                                         sampler.sample_size, len(values), confidence)
+    return estimates
+
+
+def estimate_quality(points, labels, budget: int = DEFAULT_SAMPLE_BUDGET,
+                     time_budget: float | None = DEFAULT_TIME_BUDGET,
+                     progress: ProgressToken | None = None, metric='euclidean') -> Dict[str, MetricEstimate]:
+    """Показатели качества окна результатов (DunnIndex, DunnIndexMean, DaviesBouldinIndex, Silhouette) по выборкам.
+
+    Все показатели вычисляются по одним и тем же выборкам совместно (QualityIndices),
+    поэтому time_budget не делится между ними.
+
+    Аргументы:
+        points (array_like): Точки (признаки пикселей) формы (n_samples, n_features).
+        labels (array_like): Метки кластеров.
+        budget (int): Число точек одной выборки.
+        time_budget (float, optional): Время на все показатели, с.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+        metric (str | float | DistanceMetric): Метрика расстояния (см. DistanceMetrics.get_metric).
+
+    Возвращает:
+        Dict[str, MetricEstimate]: Название -> оценка. Для одного кластера показатели
+                                   не определены, словарь пуст.
+    """
+    sampler = StratifiedSampler(points, labels, budget)
+    if len(sampler.sizes) < 2:
+        return dict()
+    evaluate = lambda C: QualityIndices(C, QUALITY_INDICES, metric=metric)
+    return _estimate_all(evaluate, 'QualityIndices', sampler, DEFAULT_REPLICATES, time_budget, 0.95, progress)
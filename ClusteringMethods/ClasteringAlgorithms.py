@@ -10,6 +10,7 @@ from dataclasses import dataclass
 from enum import Enum, auto
 import re
 import ctypes
+from contextlib import nullcontext
 
 import numpy as np                      # pip install numpy
 from pyclustering.cluster.birch import birch
@@ -26,9 +27,28 @@ from sklearn.mixture import GaussianMixture
 
 from skfuzzy.cluster import cmeans
 
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from ClusteringMethods.SpatialIndex import SpatialIndex
+from Frameworks_ccore.ProgressToken import ProgressToken
+from Frameworks_ccore.RunProfile import RunProfiler
+
 from typing import Dict, List
 
 
+"""Цвета кластеров при отображении результата кластеризации изображения
+"""
+LABEL_PALETTE = np.array([
+    (255, 0, 0),
+    (0, 255, 0),
+    (0, 0, 255),
+    (255, 255, 0),
+    (255, 0, 255),
+    (0, 255, 255),
+], dtype=np.uint8)
+
+
 @dataclass
 class StrategyParam:
     ui_name: str
@@ -69,19 +89,35 @@ class StrategyRunConfig:
 
         self._values[key] = val
 
+    def values(self) -> Dict[str, int | float | str | bool]:
+        """Фактические значения всех параметров, включая значения по умолчанию.
+        """
+        return {key: self[key] for key in self._params}
+
 
 class Context:
     """
     Контекст определяет интерфейс, представляющий интерес для клиентов.
     """
 
-    def __init__(self, strategy: Strategy) -> None:
+    def __init__(self, strategy: Strategy, spatial_index: SpatialIndex | None = None,
+                 progress: ProgressToken | None = None, profiler: RunProfiler | None = None) -> None:
         """
         Обычно Контекст принимает стратегию через конструктор, а также
         предоставляет сеттер для её изменения во время выполнения.
+
+        Общий пространственный индекс spatial_index (необязательно) передаётся
+        стратегиям, умеющим использовать заранее найденных соседей, чтобы
+        несколько стратегий на одних данных не повторяли поиск соседей.
+        Токен progress (необязательно) передаётся стратегии для сообщений о ходе
+        выполнения и проверки отмены. Сборщик profiler (необязательно) получает
+        затраты этапов prepare, fit и labels.
         """
 
         self._strategy = strategy
+        self._spatial_index = spatial_index
+        self._progress = progress
+        self._profiler = profiler
 
     @property
     def strategy(self) -> Strategy:
@@ -99,68 +135,191 @@ class Context:
         """
         self._strategy = strategy
 
-    def do_some_clustering_image(self, pixels: np.ndarray, params: StrategyRunConfig, i) -> np.ndarray:
+    @property
+    def spatial_index(self) -> SpatialIndex | None:
+        return self._spatial_index
+
+    @spatial_index.setter
+    def spatial_index(self, spatial_index: SpatialIndex | None) -> None:
+        self._spatial_index = spatial_index
+
+    @property
+    def progress(self) -> ProgressToken | None:
+        return self._progress
+
+    @progress.setter
+    def progress(self, progress: ProgressToken | None) -> None:
+        self._progress = progress
+
+    @property
+    def profiler(self) -> RunProfiler | None:
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: RunProfiler | None) -> None:
+        self._profiler = profiler
+
+    def _phase(self, name: str):
+        return self._profiler.phase(name) if self._profiler is not None else nullcontext()
+
+    def _bind_strategy(self, features) -> None:
+        self._strategy.progress = self._progress
+        if self._progress is not None:
+            self._progress.check()
+        self._bind_spatial_index(features)
+
+    def _bind_spatial_index(self, features) -> None:
+        # Индекс строится по тем же признакам, которые получает стратегия
+        if self._spatial_index is not None and self._strategy.uses_spatial_index and isinstance(features, np.ndarray):
+            self._spatial_index.bind(features)
+            self._strategy.spatial_index = self._spatial_index
+        else:
+            self._strategy.spatial_index = None
+
+    def _prepare_features(self, features, features_first: bool = False):
+        """Приводит признаки к размещению в памяти, объявленному стратегией (см. DataLayout).
+
+        Преобразование выполняется ровно один раз: если данные уже имеют нужный тип
+        и порядок, стратегия получает представление (view) без копирования.
+
+        Аргументы:
+            features: Признаки в виде np.ndarray или списка списков.
+            features_first (bool): True, если данные имеют форму (n_features, n_samples),
+                                   False - (n_samples, n_features).
+
+        Возвращает:
+            Признаки формы (n_samples, n_features) в размещении стратегии.
+        """
+        layout = self._strategy.data_layout
+
+        if layout == DataLayout.PyList and isinstance(features, list) and not features_first:
+            return features
+
+        arr = np.asarray(features, dtype=self._strategy.data_dtype)
+        if features_first:
+            arr = arr.transpose()
+
+        match layout:
+            case DataLayout.RowMajor:
+                return np.ascontiguousarray(arr)
+            case DataLayout.ColumnMajor:
+                return np.asfortranarray(arr)
+            case DataLayout.PyList:
+                return arr.tolist()
+
+        return arr
+
+    def do_some_clustering_image(self, pixels: np.ndarray, params: StrategyRunConfig, i, with_coords: bool = False) -> np.ndarray:
             """Выполняет кластеризацию изображения.
 
             Вместо того, чтобы самостоятельно реализовывать множественные версии
             алгоритма, Контекст делегирует некоторую работу объекту Стратегии.
 
             Аргументы:
-                pixels (np.ndarray): Массив пикселей изображения.
+                pixels (np.ndarray): Массив пикселей изображения (h, w, c) или (n, c).
                 params StrategyRunConfig: Параметры для алгоритма кластеризации.
-                i: Флаг, определяющий метод обработки.
+                i: Тип преобразования изображения (0 - без преобразования, 1 - HSV, 2 - HLS, 3 - YUV).
+                with_coords (bool): Добавлять ли к цвету координаты пикселя (x, y).
 
             Возвращает:
                 (np.ndarray) Метки кластеров для каждого пикселя.
             """
-            if i > 0:
-                # Извлечение координат и цветов всех пикселей в формате HSV
-                coords_and_colors = [
-                    (x, y, pixels[y, x])
-                    for y in range(pixels.shape[0])
-                    for x in range(pixels.shape[1])
-                ]
-                # Преобразование координат и цветов в двумерный массив для кластеризации
-                # X = np.array([[h, s, v] for (_, _, (h, s, v)) in coords_and_colors])
-                X = [[float(h), float(s), float(v)] for (_, _, (h, s, v)) in coords_and_colors]
-                # ------------------------------------------------------------------------------------- #
-                labels = self._strategy.clastering_image(X, params)
-                # ------------------------------------------------------------------------------------- #
-                # Визуализация результата кластеризации
-                colors = [
-                    (255, 0, 0),
-                    (0, 255, 0),
-                    (0, 0, 255),
-                    (255, 255, 0),
-                    (255, 0, 255),
-                    (0, 255, 255),
-                ]
-                clustered_image = np.zeros_like(pixels)
-                for index, (x, y, _) in enumerate(coords_and_colors):
-                    clustered_image[y, x] = colors[labels[index] % len(colors)]
-            else: 
-                # None(used Rashape)
-                labels = self._strategy.clastering_image(pixels.tolist(), params)
-            return labels
+            with self._phase('prepare'):
+                features = self._prepare_features(self.image_features(pixels, with_coords))
+                self._bind_strategy(features)
+            with self._phase('fit'):
+                labels = self._strategy.clastering_image(features, params)
+            with self._phase('labels'):
+                return np.asarray(labels)
+
+    @staticmethod
+    def image_features(pixels: np.ndarray, with_coords: bool = False) -> np.ndarray:
+        """Признаки пикселей изображения формы (n_pixels, n_features).
+
+        Цвета берутся представлением (reshape) исходного массива без копирования,
+        координаты строятся транслированием (broadcasting) индексов строк и столбцов.
+
+        Аргументы:
+            pixels (np.ndarray): Пиксели формы (h, w, c) или уже развёрнутые (n, c).
+            with_coords (bool): Добавить признаки x, y (только для формы (h, w, c)).
+
+        Возвращает:
+            np.ndarray: Признаки [c_1, ..., c_k] или [c_1, ..., c_k, x, y].
+
+        Исключения:
+            ValueError: Координаты запрошены для уже развёрнутого массива пикселей.
+        """
+        pixels = np.asarray(pixels)
+        features = pixels.reshape((-1, pixels.shape[-1]))
+        if not with_coords:
+            return features
+        if pixels.ndim != 3:
+            raise ValueError(f"coordinates require pixels of shape (h, w, c), got {pixels.shape}")
+
+        h, w = pixels.shape[:2]
+        coords = np.empty((h, w, 2), dtype=np.float64)
+        coords[..., 0] = np.arange(w)[np.newaxis, :]
+        coords[..., 1] = np.arange(h)[:, np.newaxis]
+        return np.hstack((features, coords.reshape((-1, 2))))
+
+    @staticmethod
+    def paint_labels(labels: np.ndarray, shape, palette: np.ndarray = None) -> np.ndarray:
+        """Раскрашивает метки кластеров в изображение таблицей цветов.
+
+        Аргументы:
+            labels (np.ndarray): Метки кластеров для каждого пикселя.
+            shape: Форма изображения (h, w) или (h, w, c).
+            palette (np.ndarray, optional): Таблица цветов (k, 3), по умолчанию LABEL_PALETTE.
+                                            Метка l получает цвет palette[l % k], шум (-1) - последний.
+
+        Возвращает:
+            np.ndarray: Изображение (h, w, 3) типа uint8.
+        """
+        if palette is None:
+            palette = LABEL_PALETTE
+        labels = np.asarray(labels).reshape(tuple(shape)[:2])
+        return palette[np.mod(labels, len(palette))]
 
     def do_some_clustering_points(self, data, params: StrategyRunConfig) -> np.ndarray:
         """
         Выполняет кластеризацию точек.
 
         Аргументы:
-            data: Входные данные в виде списка точек.
+            data: Входные данные в формате (n_features, n_samples): список списков или np.ndarray.
             params (StrategyRunConfig): Параметры для алгоритма кластеризации.
 
         Возвращает:
             (np.ndarray) Метки кластеров для каждой точки.
         """        
-        fitchs = np.array(data, dtype=float)
-        points = fitchs.transpose()
-        if isinstance(self._strategy, ConcreteStrategyBIRCH_from_SKLEARN_LEARN):
-            labels = self._strategy.clastering_points(points, params).tolist()
-        else:
+        with self._phase('prepare'):
+            points = self._prepare_features(data, features_first=True)
+            self._bind_strategy(points)
+        with self._phase('fit'):
             labels = self._strategy.clastering_points(points, params)
-        return labels
+        with self._phase('labels'):
+            return np.asarray(labels)
+
+
+class DataLayout(Enum):
+    """Размещение в памяти признаков, которые стратегия получает от Контекста.
+
+    Во всех случаях данные имеют форму (n_samples, n_features), отличается лишь
+    представление, поэтому прямой вызов clastering_points(X) с обычным массивом
+    остаётся корректным.
+    """
+
+    """np.ndarray, C-непрерывный (по строкам-объектам). Подходит для sklearn.
+    """
+    RowMajor = auto()
+
+    """np.ndarray, F-непрерывный: транспонирование даёт C-непрерывный массив
+    (n_features, n_samples) без копирования (например, для skfuzzy.cmeans).
+    """
+    ColumnMajor = auto()
+
+    """Список списков Python (например, для pyclustering).
+    """
+    PyList = auto()
 
 
 class StrategyParamType(Enum):
@@ -197,8 +356,31 @@ class Strategy(ABC):
 
     Контекст использует этот интерфейс для вызова алгоритма, определённого
     Конкретными Стратегиями.
+
+    Атрибуты data_layout и data_dtype объявляют, в каком виде стратегия ожидает
+    признаки: Контекст приводит данные к нему один раз перед вызовом.
+
+    Стратегии с uses_spatial_index = True могут использовать общий индекс соседей
+    spatial_index (см. SpatialIndex), который Контекст связывает с данными перед вызовом.
+
+    Атрибут progress - токен хода выполнения и отмены (см. ProgressToken) или None.
+    Стратегии, реализованные на Python, сообщают через него о ходе выполнения и
+    проверяют отмену на границах итераций.
     """
 
+    data_layout: DataLayout = DataLayout.RowMajor
+    data_dtype: type = np.float64
+    uses_spatial_index: bool = False
+    spatial_index: SpatialIndex | None = None
+    progress: ProgressToken | None = None
+
+    def _index_for(self, points) -> SpatialIndex | None:
+        """Общий индекс соседей, если он построен по этим точкам, иначе None.
+        """
+        if self.spatial_index is not None and self.spatial_index.matches(points):
+            return self.spatial_index
+        return None
+
     @classmethod
     def params(cls):
         """Возвращает набор параметров метода кластеризации
@@ -256,24 +438,29 @@ class Strategy(ABC):
     def clastering_points(self, points: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
         pass
 
-    def clusters_to_labels(self, clusters) -> List:
+    def clusters_to_labels(self, clusters) -> np.ndarray:
         """Метод преобразование cluster_index in labels для BIRCH из sklearn-learn.
 
         Аргументы:
             clusters (list): Список кластеров, где каждый кластер содержит индексы точек.
         
         Возвращает:
-            (list) Список меток для каждой точки.
+            (np.ndarray) Метки для каждой точки.
         """
 
         size = sum(map(lambda x: len(x), clusters))
-        labels = [0] * size
+        labels = np.zeros(size, dtype=int)
         for cluster_index in range(len(clusters)):
-            for i in clusters[cluster_index]:
-                labels[i] = cluster_index
+            labels[clusters[cluster_index]] = cluster_index
 
         return labels
 
+    @staticmethod
+    def as_list(points) -> List:
+        """Возвращает точки в виде списка списков, не копируя уже готовый список.
+        """
+        return points if isinstance(points, list) else np.asarray(points).tolist()
+
 
 @dataclass
 class StrategyDescription:
@@ -380,9 +567,25 @@ class StrategiesManager:
 Этот интерфейс делает их взаимозаменяемыми в Контексте.
 """
 
+@dataclass
+class DBSCANSweepPoint:
+    """Результат одной пары параметров при переборе DBSCAN (см. ConcreteStrategyDBSCAN_from_SKLEARN.sweep)
+    """
+    eps: float
+    min_samples: int
+    labels: np.ndarray
+    n_clusters: int
+    n_noise: int
+
+
 @StrategiesManager.registerStrategy("dbscan_sk", "DBSCAN (SKLearn)")
 class ConcreteStrategyDBSCAN_from_SKLEARN(Strategy):
 
+    uses_spatial_index = True
+
+    # Параметры, перебираемые методом sweep (в порядке его аргументов)
+    sweep_params = ('eps', 'min_samples')
+
     @classmethod
     def _setupParams(cls):
         cls._addParam("eps", "Максимальное расстояние между объектами", StrategyParamType.UFloating,
@@ -432,15 +635,91 @@ class ConcreteStrategyDBSCAN_from_SKLEARN(Strategy):
                       1)
 
     def clastering_image(self, pixels: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
-        model = DBSCAN(eps=params["eps"], min_samples=params["min_samples"], metric=params["metric"], algorithm=params["algorithm"],
-        leaf_size=params["leaf_size"], p=params["p"], n_jobs=params["n_jobs"])
-        return model.fit_predict(pixels)
+        return self.clastering_points(pixels, params)
 
     def clastering_points(self, points: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
+        index = self._index_for(points)
+        if index is not None:
+            graph = index.radius_graph(params["eps"], params["metric"], params["p"])
+            model = DBSCAN(eps=params["eps"], min_samples=params["min_samples"], metric="precomputed", n_jobs=params["n_jobs"])
+            return model.fit_predict(graph)
+
         model = DBSCAN(eps=params["eps"], min_samples=params["min_samples"], metric=params["metric"], algorithm=params["algorithm"],
         leaf_size=params["leaf_size"], p=params["p"], n_jobs=params["n_jobs"])
         return model.fit_predict(points)
 
+    def sweep(self, points: np.ndarray, eps_values, min_samples_values, params: StrategyRunConfig) -> List[DBSCANSweepPoint]:
+        """Перебор параметров eps и min_samples по одному графу соседей.
+
+        Граф соседей в радиусе max(eps_values) строится один раз, далее для каждой
+        пары (eps, min_samples) метки получаются отсечением рёбер графа по eps и
+        поиском компонент связности ядровых точек. Результат совпадает с
+        DBSCAN.fit_predict: граничная точка относится к кластеру с меньшим номером.
+
+        Аргументы:
+            points (np.ndarray): Точки формы (n_samples, n_features).
+            eps_values: Значения eps.
+            min_samples_values: Значения min_samples.
+            params (StrategyRunConfig): Остальные параметры (metric, algorithm, leaf_size, p, n_jobs).
+
+        Возвращает:
+            List[DBSCANSweepPoint]: Метки и число кластеров для каждой пары в порядке
+                                    перебора (eps - внешний цикл).
+        """
+        eps_values = [float(eps) for eps in eps_values]
+        min_samples_values = [int(m) for m in min_samples_values]
+        n = len(points)
+
+        index = self._index_for(points)
+        if index is None:
+            index = SpatialIndex(params["algorithm"], params["leaf_size"], params["n_jobs"])
+            index.bind(points)
+        # Граф включает саму точку, как и окрестность в DBSCAN
+        graph = index.radius_graph(max(eps_values), params["metric"], params["p"])
+        rows = np.repeat(np.arange(n), np.diff(graph.indptr))
+
+        table = []
+        for eps in eps_values:
+            mask = graph.data <= eps
+            edgeRows, edgeCols = rows[mask], graph.indices[mask]
+            degree = np.bincount(edgeRows, minlength=n)
+
+            for min_samples in min_samples_values:
+                labels = self._labels_from_graph(n, edgeRows, edgeCols, degree >= min_samples)
+                n_clusters = int(labels.max()) + 1 if n > 0 else 0
+                table.append(DBSCANSweepPoint(eps, min_samples, labels, n_clusters, int(np.count_nonzero(labels < 0))))
+
+        return table
+
+    @staticmethod
+    def _labels_from_graph(n: int, edgeRows: np.ndarray, edgeCols: np.ndarray, core: np.ndarray) -> np.ndarray:
+        labels = np.full(n, -1, dtype=np.intp)
+        coreIdx = np.flatnonzero(core)
+        if len(coreIdx) == 0:
+            return labels
+
+        # Компоненты связности ядровых точек по рёбрам ядро-ядро
+        coreEdges = core[edgeRows] & core[edgeCols]
+        adjacency = csr_matrix((np.ones(np.count_nonzero(coreEdges), dtype=np.int8),
+                                (edgeRows[coreEdges], edgeCols[coreEdges])), shape=(n, n))
+        _, component = connected_components(adjacency, directed=False)
+
+        # Номера кластеров в порядке первой ядровой точки, как в DBSCAN
+        first = np.full(n, n, dtype=np.intp)
+        np.minimum.at(first, component[coreIdx], coreIdx)
+        used = np.unique(component[coreIdx])
+        order = np.empty(n, dtype=np.intp)
+        order[used[np.argsort(first[used])]] = np.arange(len(used))
+        labels[coreIdx] = order[component[coreIdx]]
+
+        # Граничные точки - минимальный номер кластера среди соседних ядровых точек
+        borderEdges = ~core[edgeRows] & core[edgeCols]
+        border = np.full(n, n, dtype=np.intp)
+        np.minimum.at(border, edgeRows[borderEdges], labels[edgeCols[borderEdges]])
+        assigned = border < n
+        labels[assigned] = border[assigned]
+        return labels
+
 @StrategiesManager.registerStrategy("hdbscan_sk", "HDBSCAN (SKLearn)")
 class ConcreteStrategyHDBSCAN_from_SKLEARN(Strategy):
 
@@ -877,6 +1156,8 @@ class ConcreteStrategyBIRCH_from_PYCLUSTERING(Strategy):
     """Метод кластеризации точек с использованием BIRCH из pyclustering.
     """
 
+    data_layout = DataLayout.PyList
+
     @classmethod
     def _setupParams(cls):
         cls._addParam("n_clusters", "Количество кластеров", StrategyParamType.UNumber, """
@@ -906,19 +1187,19 @@ class ConcreteStrategyBIRCH_from_PYCLUSTERING(Strategy):
 
     def clastering_image(self, pixels: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
         typeMeasurement = self.TYPE(params["type_measurement"])
-        instance = birch(data=pixels, number_clusters=int(params["n_clusters"]), branching_factor=int(params["branching_factor"]),
+        instance = birch(data=self.as_list(pixels), number_clusters=int(params["n_clusters"]), branching_factor=int(params["branching_factor"]),
                          max_node_entries=int(params["max_node_entries"]), diameter=float(params["diameter"]), type_measurement=typeMeasurement,
                          entry_size_limit=int(params["entry_size_limit"]), diameter_multiplier=float(params["diameter_multiplier"]), ccore=bool(params["ccore"]))
         instance.process()
-        return np.array(self.clusters_to_labels(instance.get_clusters()))
+        return self.clusters_to_labels(instance.get_clusters())
 
     def clastering_points(self, points, params):
         typeMeasurement = self.TYPE(params["type_measurement"])
-        instance = birch(data=points.tolist(), number_clusters=int(params["n_clusters"]), branching_factor=int(params["branching_factor"]),
+        instance = birch(data=self.as_list(points), number_clusters=int(params["n_clusters"]), branching_factor=int(params["branching_factor"]),
                          max_node_entries=int(params["max_node_entries"]), diameter=float(params["diameter"]), type_measurement=typeMeasurement,
                          entry_size_limit=int(params["entry_size_limit"]), diameter_multiplier=float(params["diameter_multiplier"]), ccore=bool(params["ccore"]))
         instance.process()
-        return np.array(self.clusters_to_labels(instance.get_clusters()))
+        return self.clusters_to_labels(instance.get_clusters())
 
 
     def TYPE(self, param: str):
@@ -953,6 +1234,8 @@ class ConcreteStrategyCURE(Strategy):
     """Метод кластеризации пикселей с использованием CURE из pyclustering.
     """
 
+    data_layout = DataLayout.PyList
+
     @classmethod
     def _setupParams(cls):
         cls._addParam("n_clusters", "Количество выделенных кластеров", StrategyParamType.UNumber,
@@ -967,18 +1250,18 @@ class ConcreteStrategyCURE(Strategy):
             Если истинно, тогда используется C++ часть библиотеки для обработки""", True)
 
     def clastering_image(self, pixels: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
-        instance = cure(data=pixels, number_cluster=int(params["n_clusters"]),
+        instance = cure(data=self.as_list(pixels), number_cluster=int(params["n_clusters"]),
                         number_represent_points=int(params["number_represent_points"]),
                         compression=float(params["compression"]), ccore=bool(params["ccore"]))
         instance.process()
-        return np.array(self.clusters_to_labels(instance.get_clusters()))
+        return self.clusters_to_labels(instance.get_clusters())
 
     def clastering_points(self, points: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
-        instance = cure(data=points.tolist(), number_cluster=int(params["n_clusters"]),
+        instance = cure(data=self.as_list(points), number_cluster=int(params["n_clusters"]),
                         number_represent_points=int(params["number_represent_points"]),
                         compression=float(params["compression"]), ccore=bool(params["ccore"]))
         instance.process()
-        return np.array(self.clusters_to_labels(instance.get_clusters()))
+        return self.clusters_to_labels(instance.get_clusters())
 
 
 @StrategiesManager.registerStrategy("rock", "ROCK")
@@ -987,6 +1270,8 @@ class ConcreteStrategyROCK(Strategy):
     """Метод кластеризации пикселей с использованием ROCK из pyclustering.
     """
 
+    data_layout = DataLayout.PyList
+
     @classmethod
     def _setupParams(cls):
         cls._addParam("eps", "Радиус соединения (порог сходства)", StrategyParamType.Floating,
@@ -1002,17 +1287,17 @@ class ConcreteStrategyROCK(Strategy):
             Если истинно, тогда используется C++ часть библиотеки для обработки""", True)
 
     def clastering_image(self, pixels: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
-        instance = rock(data=pixels, eps=params["eps"], number_clusters=int(params["n_clusters"]),
+        instance = rock(data=self.as_list(pixels), eps=params["eps"], number_clusters=int(params["n_clusters"]),
                         threshold=float(params["threshold"]), ccore=bool(params["ccore"]))
         instance.process()
-        return np.array(self.clusters_to_labels(instance.get_clusters()))
+        return self.clusters_to_labels(instance.get_clusters())
 
     def clastering_points(self, points: np.ndarray, params: StrategyRunConfig):
-        instance = rock(data=points.tolist(), eps=params["eps"], number_clusters=int(params["n_clusters"]),
+        instance = rock(data=self.as_list(points), eps=params["eps"], number_clusters=int(params["n_clusters"]),
                         threshold=float(params["threshold"]), ccore=bool(params["ccore"]))
         instance.process()
         x = instance.get_clusters()
-        return np.array(self.clusters_to_labels(x))
+        return self.clusters_to_labels(x)
 
 @StrategiesManager.registerStrategy("bang", "BANG")
 class ConcreteStrategyBANG(Strategy):
@@ -1036,7 +1321,7 @@ class ConcreteStrategyBANG(Strategy):
         clusters = bang_instance.get_clusters()
         
         # Преобразование кластеров в метки
-        return np.array(self.clusters_to_labels(clusters))
+        return self.clusters_to_labels(clusters)
 
     def clastering_points(self, points: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
         # Создание и настройка объекта BANG
@@ -1050,13 +1335,16 @@ class ConcreteStrategyBANG(Strategy):
         clusters = bang_instance.get_clusters()
         
         # Преобразование кластеров в метки
-        return np.array(self.clusters_to_labels(clusters))
+        return self.clusters_to_labels(clusters)
 
 
 @StrategiesManager.registerStrategy("fuzzy_cmeans", "Fuzzy C-Means")
 class ConcreteStrategyFCM(Strategy):
     """Метод кластеризации с использованием Fuzzy C-Means из библиотеки scikit-fuzzy"""
 
+    # cmeans ожидает (n_features, n_samples): транспонирование F-массива не копирует данные
+    data_layout = DataLayout.ColumnMajor
+
     @classmethod
     def _setupParams(cls):
         cls._addParam("n_clusters", "Количество кластеров", StrategyParamType.UNumber,
@@ -0,0 +1,120 @@
+"""
+Общий пространственный индекс набора данных для стратегий кластеризации.
+
+Индекс (KD-дерево/Ball-дерево из scikit-learn) строится один раз на набор
+данных и метрику, результаты запросов соседей кэшируются: граф соседей в
+радиусе r отвечает на все запросы с меньшим радиусом. Стратегии, принимающие
+заранее вычисленные расстояния (metric='precomputed'), получают индекс через
+Context (атрибут Strategy.spatial_index) и не повторяют поиск соседей.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.neighbors import NearestNeighbors
+
+
+class SpatialIndex:
+    """Индекс соседей одного набора точек с кэшем запросов.
+    """
+
+    def __init__(self, algorithm: str = 'auto', leaf_size: int = 30, n_jobs: int | None = None):
+        """
+        Аргументы:
+            algorithm (str): Структура индекса NearestNeighbors: auto, ball_tree, kd_tree, brute.
+            leaf_size (int): Размер листа дерева.
+            n_jobs (int, optional): Число потоков для запросов.
+        """
+        self._algorithm = algorithm
+        self._leaf_size = leaf_size
+        self._n_jobs = n_jobs
+        self._points: np.ndarray | None = None
+        self._trees: Dict[Tuple, NearestNeighbors] = dict()
+        self._radius: Dict[Tuple, Tuple[float, csr_matrix]] = dict()
+
+    @property
+    def points(self) -> np.ndarray | None:
+        return self._points
+
+    def bind(self, points: np.ndarray) -> None:
+        """Связывает индекс с набором точек. Кэш сбрасывается, только если данные изменились.
+
+        Аргументы:
+            points (np.ndarray): Точки формы (n_samples, n_features).
+        """
+        points = np.asarray(points)
+        if self._points is not None and (self._points is points or np.array_equal(self._points, points)):
+            return
+
+        self._points = points
+        self._trees.clear()
+        self._radius.clear()
+
+    def matches(self, points: np.ndarray) -> bool:
+        """Построен ли индекс по этим точкам.
+        """
+        return self._points is not None and (self._points is points or
+                                             (self._points.shape == np.shape(points) and np.array_equal(self._points, points)))
+
+    def radius_graph(self, radius: float, metric: str = 'euclidean', p: float = 2.0) -> csr_matrix:
+        """Разреженный граф расстояний до соседей в радиусе radius, включая саму точку.
+
+        Подходит как вход для DBSCAN(metric='precomputed'): соседи в каждой строке
+        упорядочены по расстоянию, как после sklearn.neighbors.sort_graph_by_row_values.
+
+        Аргументы:
+            radius (float): Радиус окрестности.
+            metric (str): Метрика расстояния.
+            p (float): Степень для метрики minkowski.
+
+        Возвращает:
+            csr_matrix: Матрица (n_samples, n_samples).
+        """
+        key = self._metricKey(metric, p)
+        cached = self._radius.get(key)
+        if cached is None or cached[0] < radius:
+            graph = _sort_rows(self._tree(key).radius_neighbors_graph(self._points, radius=radius,
+                                                                      mode='distance').tocsr())
+            self._radius[key] = (radius, graph)
+            return graph
+
+        if cached[0] == radius:
+            return cached[1]
+        return _threshold(cached[1], radius)
+
+    def _metricKey(self, metric: str, p: float) -> Tuple:
+        if self._points is None:
+            raise ValueError("spatial index is not bound to data")
+        return (metric, float(p) if metric == 'minkowski' else None)
+
+    def _tree(self, key: Tuple) -> NearestNeighbors:
+        tree = self._trees.get(key)
+        if tree is None:
+            metric, p = key
+            tree = NearestNeighbors(algorithm=self._algorithm, leaf_size=self._leaf_size, metric=metric,
+                                    p=p if p is not None else 2, n_jobs=self._n_jobs)
+            tree.fit(self._points)
+            self._trees[key] = tree
+        return tree
+
+
+def _sort_rows(graph: csr_matrix) -> csr_matrix:
+    # Соседи каждой строки по возрастанию расстояния (устойчиво, как sort_graph_by_row_values,
+    # но одной сортировкой вместо цикла по строкам разной длины)
+    rows = np.repeat(np.arange(graph.shape[0]), np.diff(graph.indptr))
+    order = np.lexsort((graph.data, rows))
+    return csr_matrix((graph.data[order], graph.indices[order], graph.indptr), shape=graph.shape)
+
+
+def _threshold(graph: csr_matrix, radius: float) -> csr_matrix:
+    # Отсечение рёбер длиннее radius с сохранением явных нулевых расстояний (совпадающие точки);
+    # порядок соседей в строках сохраняется
+    n = graph.shape[0]
+    rows = np.repeat(np.arange(n), np.diff(graph.indptr))
+    mask = graph.data <= radius
+    indptr = np.zeros(n + 1, dtype=graph.indptr.dtype)
+    np.cumsum(np.bincount(rows[mask], minlength=n), out=indptr[1:])
+    return csr_matrix((graph.data[mask], graph.indices[mask], indptr), shape=graph.shape)
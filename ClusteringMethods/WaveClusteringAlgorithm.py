@@ -6,9 +6,12 @@ WaveClustering Algorithm Implementation
 
 # Импорты из стандартной библиотеки и внешних пакетов
 import numpy as np
+from dataclasses import dataclass
 from typing import Dict, List, Tuple
 import pywt  # PyWavelets library for wavelet transforms
 from scipy import ndimage
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 # ВАЖНО: Импорты из проекта DMM Clustering System
 from ClusteringMethods.ClasteringAlgorithms import (
@@ -17,6 +20,80 @@ from ClusteringMethods.ClasteringAlgorithms import (
     StrategyRunConfig,
     StrategiesManager
 )
+from Frameworks_ccore.ProgressToken import ProgressToken, checkpoints
+
+# Points processed per vectorized block (bounds temporary memory and progress granularity)
+_BLOCK_POINTS = 1 << 20
+
+# Grid storage modes: 'dense' - full n_grid**d array (2D/3D), 'sparse' - occupied cells only (any d),
+# 'auto' - dense for 2-3 features, sparse otherwise
+GRID_MODES = ('auto', 'dense', 'sparse')
+
+# Approximate peak bytes per dense grid cell: counts (up to uint32), float32 coefficients of the
+# first transform pass and int32 component labels at the next level (used with memory_budget)
+_DENSE_CELL_BYTES = 8
+
+# Dense grids up to this many cells label points through a per-cell int32 table; larger grids map
+# point cells to transformed cells directly (the table would be as large as the grid)
+_LABEL_TABLE_CELLS = 1 << 22
+
+# Bytes of a float32 slab converted from the integer grid at a time by the wavelet transform
+_SLAB_BYTES = 64 << 20
+
+# Memory limit of the sparse wavelet transform when memory_budget is not set. A filter of
+# length L spreads each stored cell over L/2 cells per axis, so long wavelets (db4, db6)
+# multiply the stored cells by up to (L/2)^d per level
+_SPARSE_MAX_BYTES = 1 << 30
+
+
+def _encode_cells(cells: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Sortable keys of grid cells: flat C-order index when the grid size fits in int64,
+    otherwise the raw bytes of the index row (equal cells - equal keys)
+    """
+    if np.prod(np.asarray(shape, dtype=float)) < 2.0 ** 63:
+        return np.ravel_multi_index(tuple(np.asarray(cells).T), shape).astype(np.int64, copy=False)
+    rows = np.ascontiguousarray(cells, dtype=np.int64)
+    return rows.view(np.dtype((np.void, rows.itemsize * rows.shape[1]))).ravel()
+
+
+def _decode_cells(keys: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Cell indices (m, d) from keys of _encode_cells
+    """
+    if keys.dtype.kind == 'V':
+        return keys.view(np.int64).reshape(len(keys), len(shape))
+    return np.stack(np.unravel_index(keys, shape), axis=1).astype(np.int64, copy=False)
+
+
+def _lookup(sorted_keys: np.ndarray, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of keys in sorted_keys and the mask of keys that are present
+    """
+    if len(sorted_keys) == 0:
+        return np.zeros(len(keys), dtype=np.intp), np.zeros(len(keys), dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return pos, sorted_keys[pos] == keys
+
+
+def _count_cells(codes: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Dense grid of point counts in the smallest unsigned integer dtype holding the largest count
+    """
+    n_cells = int(np.prod(shape))
+    if n_cells <= len(codes):
+        counts = np.bincount(codes, minlength=n_cells)
+        return counts.astype(np.min_scalar_type(counts.max(initial=0))).reshape(shape)
+    # Grid larger than the data: count occupied cells only, no int64 array of the grid size
+    cells, counts = np.unique(codes, return_counts=True)
+    grid = np.zeros(n_cells, dtype=np.min_scalar_type(counts.max(initial=0)))
+    grid[cells] = counts
+    return grid.reshape(shape)
+
+
+def _as_points(X) -> np.ndarray:
+    X = np.asarray(X)
+    return X.reshape(-1, 1) if X.ndim == 1 else X
 
 
 class WaveClustering:
@@ -26,83 +103,122 @@ class WaveClustering:
     Parameters:
     -----------
     n_grid : int, default=32
-        Number of grid divisions per dimension
+        Number of grid divisions per dimension (the longest one when
+        memory_budget is set)
     wavelet : str, default='haar'
         Wavelet type ('haar', 'db4', 'coif1', etc.)
     n_levels : int, default=2
         Number of wavelet transform levels (resolution)
     density_threshold : float, default=0.1
         Threshold for detecting dense regions (relative to max density)
+    grid_mode : str, default='auto'
+        Grid storage (see GRID_MODES). The sparse grid keeps only occupied cells,
+        so any number of features fits in memory
+    bounds : (array-like, array-like), optional
+        Bounding box (min, max) of the grid for partial_fit; by default the
+        extent of the first chunk
+    memory_budget : int, optional
+        Bytes available for the grid. For the dense grid the number of divisions
+        is then chosen per axis: proportional to the data extent (n_grid on the
+        longest axis) and reduced until the grid fits the budget; by default
+        n_grid on every axis. For the sparse grid it limits the wavelet
+        transform (by default _SPARSE_MAX_BYTES); a transform expected to
+        exceed it raises ValueError
+
+    After fit or partial_fit the grid is kept: grid_ (point counts in the
+    smallest unsigned integer dtype; for the sparse grid - occupied cells and
+    their counts), grid_metadata_ (bounds, cell sizes and shape) and the
+    cluster labels of cells used by predict. Wavelet coefficients of the dense
+    grid are float32, labels are int32.
     """
 
-    def __init__(self, n_grid=32, wavelet='haar', n_levels=2, density_threshold=0.1):
+    def __init__(self, n_grid=32, wavelet='haar', n_levels=2, density_threshold=0.1, grid_mode='auto',
+                 bounds=None, memory_budget=None):
+        if grid_mode not in GRID_MODES:
+            raise ValueError(f"Unknown grid mode {grid_mode}, expected one of {GRID_MODES}")
         self.n_grid = n_grid
         self.wavelet = wavelet
         self.n_levels = n_levels
         self.density_threshold = density_threshold
+        self.grid_mode = grid_mode
+        self.bounds = bounds
+        self.memory_budget = memory_budget
         self.labels_ = None
         self.n_clusters_ = 0
-
-    def _quantize_data(self, X: np.ndarray) -> Tuple[np.ndarray, Dict]:
+        # Fitted grid
+        self.sparse_ = False
+        self.n_features_in_ = None
+        self.grid_ = None
+        self.grid_metadata_ = None
+        self.scale_factor_ = 2 ** n_levels
+        self.labeled_grid_ = None       # dense grid: cluster labels of the transformed grid
+        self.cluster_cells_ = None      # sparse grid: (sorted keys, labels, shape) of dense transformed cells
+
+    def _quantize_data(self, X: np.ndarray, progress: ProgressToken = None) -> Tuple[np.ndarray, Dict]:
         """
         Step 1: Quantize feature space into grid cells
 
         Parameters:
         -----------
         X : array-like, shape (n_samples, n_features)
-            Input data
+            Input data (2 or 3 features)
+        progress : ProgressToken, optional
+            Progress and cancellation token
 
         Returns:
         --------
         grid : ndarray
-            Grid with density values
+            Grid with point counts (smallest unsigned integer dtype)
         metadata : dict
-            Information about grid bounds and cell sizes
+            Information about grid bounds, cell sizes and shape
         """
-        n_samples, n_features = X.shape
+        # Grid bounds, cell sizes and shape
+        metadata = self._grid_metadata(X.min(axis=0), X.max(axis=0))
 
-        # Calculate grid bounds
-        min_vals = X.min(axis=0)
-        max_vals = X.max(axis=0)
+        # Assign points to grid cells: one flat cell code per point, reused to read labels back
+        codes = self._cell_codes(X, metadata, progress, 'Квантование')
+        grid = _count_cells(codes, metadata['shape'])
+        metadata['codes'] = codes
 
-        # Calculate cell sizes
-        cell_sizes = (max_vals - min_vals) / self.n_grid
+        return grid, metadata
 
-        # Avoid division by zero
-        cell_sizes = np.where(cell_sizes == 0, 1, cell_sizes)
+    def _cell_codes(self, X: np.ndarray, metadata: Dict, progress: ProgressToken = None,
+                    message: str = '') -> np.ndarray:
+        """
+        Flat (C-order) indices of the grid cells containing each point
 
-        # Create grid based on dimensionality
-        if n_features == 2:
-            grid = np.zeros((self.n_grid, self.n_grid))
-        elif n_features == 3:
-            grid = np.zeros((self.n_grid, self.n_grid, self.n_grid))
-        else:
-            # For higher dimensions, use only first 2 features
-            print(f"⚠️  Warning: {n_features}D data detected. Using only first 2 dimensions.")
-            X = X[:, :2]
-            n_features = 2
-            min_vals = X.min(axis=0)
-            max_vals = X.max(axis=0)
-            cell_sizes = (max_vals - min_vals) / self.n_grid
-            cell_sizes = np.where(cell_sizes == 0, 1, cell_sizes)
-            grid = np.zeros((self.n_grid, self.n_grid))
-
-        # Assign points to grid cells
-        for point in X:
-            # Calculate grid indices
-            indices = ((point - min_vals) / cell_sizes).astype(int)
-            indices = np.clip(indices, 0, self.n_grid - 1)
-            grid[tuple(indices)] += 1
-
-        metadata = {
-            'min_vals': min_vals,
-            'max_vals': max_vals,
-            'cell_sizes': cell_sizes,
-            'n_features': n_features,
-            'original_X': X  # Save modified X if needed
-        }
+        Parameters:
+        -----------
+        X : ndarray, shape (n_samples, n_features)
+            Data points
+        metadata : dict
+            Grid metadata from _quantize_data
+        progress : ProgressToken, optional
+            Progress and cancellation token (checked once per block of points)
+        message : str
+            Progress stage name
 
-        return grid, metadata
+        Returns:
+        --------
+        codes : ndarray, shape (n_samples,)
+            Cell codes (int32 when the grid allows it)
+        """
+        shape = metadata['shape']
+        n_cells = int(np.prod(shape))
+        codes = np.empty(len(X), dtype=np.int32 if n_cells <= np.iinfo(np.int32).max else np.int64)
+
+        for b in checkpoints(progress, -(-len(X) // _BLOCK_POINTS), message, every=1):
+            block = slice(b * _BLOCK_POINTS, (b + 1) * _BLOCK_POINTS)
+            codes[block] = np.ravel_multi_index(tuple(self._cell_indices(X[block], metadata).T), shape)
+
+        return codes
+
+    def _cell_indices(self, X: np.ndarray, metadata: Dict) -> np.ndarray:
+        """
+        Grid cell index of each point along each axis, shape (n_samples, n_features)
+        """
+        indices = ((X - metadata['min_vals']) / metadata['cell_sizes']).astype(np.intp)
+        return np.clip(indices, 0, np.array(metadata['shape']) - 1, out=indices)
 
     def _apply_wavelet_transform(self, grid: np.ndarray, level: int = 1) -> np.ndarray:
         """
@@ -118,23 +234,40 @@ class WaveClustering:
         Returns:
         --------
         transformed_grid : ndarray
-            Wavelet-transformed grid (LL subband)
-        """
-        if grid.ndim == 2:
-            # 2D wavelet transform
-            coeffs = pywt.wavedec2(grid, self.wavelet, level=level)
-            approx = coeffs[0]
-        elif grid.ndim == 3:
-            # 3D wavelet transform (apply 1D transform along each axis)
-            temp = grid
-            for _ in range(level):
-                temp = pywt.dwt(temp, self.wavelet, axis=0)[0]
-                temp = pywt.dwt(temp, self.wavelet, axis=1)[0]
-                temp = pywt.dwt(temp, self.wavelet, axis=2)[0]
-            approx = temp
-        else:
-            raise ValueError(f"Unsupported grid dimensions: {grid.ndim}")
+            Wavelet-transformed grid (LL subband, float32)
+        """
+        approx = grid
+        for _ in range(level):
+            approx = self._wavelet_step(approx)
+        return approx
 
+    def _wavelet_step(self, grid: np.ndarray) -> np.ndarray:
+        """
+        One level of the separable wavelet transform: the approximation of
+        pywt.dwtn(grid, wavelet) (1D transform along each axis), in float32
+        """
+        approx = grid
+        for axis in range(grid.ndim):
+            approx = self._dwt_approx(approx, axis)
+        return approx
+
+    def _dwt_approx(self, grid: np.ndarray, axis: int) -> np.ndarray:
+        """
+        Approximation coefficients of pywt.dwt along one axis in float32. The grid is
+        processed in slabs along another axis, so integer counts are converted to
+        float32 one slab at a time instead of copying the whole grid
+        """
+        if grid.ndim == 1:
+            return pywt.dwt(grid.astype(np.float32, copy=False), self.wavelet)[0]
+        length = pywt.dwt_coeff_len(grid.shape[axis], pywt.Wavelet(self.wavelet).dec_len, 'symmetric')
+        approx = np.empty(grid.shape[:axis] + (length,) + grid.shape[axis + 1:], dtype=np.float32)
+        other = 1 if axis == 0 else 0
+        step = max(1, _SLAB_BYTES * grid.shape[other] // (grid.size * 4 or 1))
+        index = [slice(None)] * grid.ndim
+        for start in range(0, grid.shape[other], step):
+            index[other] = slice(start, start + step)
+            slab = grid[tuple(index)].astype(np.float32, copy=False)
+            approx[tuple(index)] = pywt.dwt(slab, self.wavelet, axis=axis)[0]
         return approx
 
     def _find_connected_components(self, grid: np.ndarray, threshold: float) -> Tuple[np.ndarray, int]:
@@ -163,49 +296,281 @@ class WaveClustering:
 
         return labeled_grid, n_clusters
 
-    def _map_points_to_clusters(self, X: np.ndarray, labeled_grid: np.ndarray,
-                                 metadata: Dict, scale_factor: int) -> np.ndarray:
+    def _cell_label_table(self, labeled_grid: np.ndarray, scale_factor: int,
+                          shape: Tuple[int, ...]) -> np.ndarray:
         """
-        Step 4: Map original points to cluster labels
+        Step 4: Map grid cells to cluster labels
 
         Parameters:
         -----------
-        X : ndarray
-            Original data points
         labeled_grid : ndarray
             Grid with cluster labels from transformed space
-        metadata : dict
-            Grid metadata
         scale_factor : int
             Scaling factor due to wavelet downsampling
+        shape : tuple
+            Shape of the original grid
 
         Returns:
         --------
-        labels : ndarray
-            Cluster labels for each point
+        cell_labels : ndarray, shape (prod(shape),)
+            Cluster label of every original grid cell (flat C order, indexed by cell codes)
         """
-        n_samples = X.shape[0]
-        labels = np.zeros(n_samples, dtype=int)
+        # Index of every original cell along each axis mapped to transformed space
+        axes = [np.minimum(np.arange(n) // scale_factor, size - 1) for n, size in zip(shape, labeled_grid.shape)]
+        return labeled_grid[np.ix_(*axes)].ravel()
 
-        min_vals = metadata['min_vals']
-        cell_sizes = metadata['cell_sizes']
+    def _dense_point_labels(self, codes: np.ndarray, labeled_grid: np.ndarray, scale_factor: int,
+                            shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Step 4: Cluster labels (int32) of points from their cell codes. Grids up to
+        _LABEL_TABLE_CELLS cells use the per-cell table of _cell_label_table; for
+        larger grids the cells of each block of points are mapped to transformed
+        cells directly
+        """
+        if np.prod(shape) <= _LABEL_TABLE_CELLS:
+            return self._cell_label_table(labeled_grid, scale_factor, shape).astype(np.int32)[codes]
+        labels = np.empty(len(codes), dtype=np.int32)
+        for start in range(0, len(codes), _BLOCK_POINTS):
+            block = slice(start, start + _BLOCK_POINTS)
+            indices = np.stack(np.unravel_index(codes[block], shape), axis=1)
+            labels[block] = self._coarse_cell_labels(indices, labeled_grid, scale_factor)
+        return labels
 
-        for i, point in enumerate(X):
-            # Calculate grid indices in original space
-            indices = ((point - min_vals) / cell_sizes).astype(int)
-            indices = np.clip(indices, 0, self.n_grid - 1)
+    @staticmethod
+    def _coarse_cell_labels(indices: np.ndarray, labeled_grid: np.ndarray, scale_factor: int) -> np.ndarray:
+        # Labels of original cells (n, n_features) read from the labeled transformed grid
+        coarse = np.minimum(indices // scale_factor, np.array(labeled_grid.shape) - 1)
+        return labeled_grid[tuple(coarse.T)]
 
-            # Map to transformed space
-            transformed_indices = indices // scale_factor
-            transformed_indices = np.clip(transformed_indices, 0,
-                                         np.array(labeled_grid.shape) - 1)
+    def _quantize_sparse(self, X: np.ndarray,
+                         progress: ProgressToken = None) -> Tuple[np.ndarray, np.ndarray, Dict]:
+        """
+        Step 1 (sparse grid): count points in occupied grid cells only
 
-            # Get cluster label
-            labels[i] = labeled_grid[tuple(transformed_indices)]
+        Parameters:
+        -----------
+        X : ndarray, shape (n_samples, n_features)
+            Input data (any number of features)
+        progress : ProgressToken, optional
+            Progress and cancellation token
 
-        return labels
+        Returns:
+        --------
+        cells : ndarray, shape (n_occupied, n_features)
+            Indices of occupied cells in C order
+        counts : ndarray, shape (n_occupied,)
+            Number of points in each cell
+        metadata : dict
+            Grid bounds, cell sizes, grid shape and 'inverse' - occupied cell of each point
+        """
+        metadata = self._grid_metadata(X.min(axis=0), X.max(axis=0), dense=False)
+        shape = metadata['shape']
 
-    def fit(self, X: np.ndarray) -> 'WaveClustering':
+        keys = [_encode_cells(self._cell_indices(X[b * _BLOCK_POINTS:(b + 1) * _BLOCK_POINTS], metadata), shape)
+                for b in checkpoints(progress, -(-len(X) // _BLOCK_POINTS), 'Квантование', every=1)]
+        keys, metadata['inverse'], counts = np.unique(np.concatenate(keys), return_inverse=True,
+                                                      return_counts=True)
+        metadata['inverse'] = metadata['inverse'].ravel()
+
+        return _decode_cells(keys, shape), counts.astype(float), metadata
+
+    def _sparse_wavelet_transform(self, cells: np.ndarray, values: np.ndarray, shape: Tuple[int, ...],
+                                  level: int = 1,
+                                  progress: ProgressToken = None) -> Tuple[np.ndarray, np.ndarray, Tuple]:
+        """
+        Step 2 (sparse grid): separable low-pass wavelet filtering of the stored cells
+
+        Along each axis the approximation is convolve(x, dec_lo)[1::2], as pywt.dwt
+        with mode='zero' on the equivalent dense grid. Haar maps every cell to one
+        cell; a filter of length L spreads a cell over up to L/2 cells per axis and level,
+        so each pass is checked against the memory limit before it allocates (ValueError).
+
+        Parameters:
+        -----------
+        cells, values : ndarray
+            Stored cells (C order) and their values
+        shape : tuple
+            Grid shape
+        level : int
+            Number of decomposition levels
+        progress : ProgressToken, optional
+            Cancellation token (checked per axis)
+
+        Returns:
+        --------
+        cells, values, shape
+            Non-zero cells of the approximation (C order), their values and the grid shape
+        """
+        taps = np.asarray(pywt.Wavelet(self.wavelet).dec_lo)
+        offsets = np.arange(len(taps))
+        for _ in range(level):
+            for axis in range(len(shape)):
+                if progress is not None:
+                    progress.check()
+                self._check_sparse_pass(len(cells), len(shape), len(taps) // 2)
+                # Index of each cell in the full convolution; odd ones survive downsampling
+                full = cells[:, axis, None] + offsets
+                rows, taps_idx = np.nonzero(full % 2 == 1)
+                spread = cells[rows]
+                spread[:, axis] = full[rows, taps_idx] // 2
+                shape = shape[:axis] + ((shape[axis] + len(taps) - 1) // 2,) + shape[axis + 1:]
+                keys, inverse = np.unique(_encode_cells(spread, shape), return_inverse=True)
+                values = np.bincount(inverse.ravel(), values[rows] * taps[taps_idx], len(keys))
+                nonzero = values != 0
+                cells, values = _decode_cells(keys[nonzero], shape), values[nonzero]
+        return cells, values, shape
+
+    def _check_sparse_pass(self, n_cells: int, n_features: int, spread: int) -> None:
+        """
+        Raise ValueError if one axis pass of the sparse transform would exceed the memory
+        limit (memory_budget or _SPARSE_MAX_BYTES): each of n_cells stored cells becomes
+        spread entries of about (n_features + 4) * 8 bytes before equal cells are merged
+        """
+        limit = self.memory_budget or _SPARSE_MAX_BYTES
+        needed = float(n_cells) * spread * (n_features + 4) * 8
+        if needed > limit:
+            raise ValueError(
+                f"Sparse '{self.wavelet}' transform of {n_features}D data needs about {needed / 2 ** 20:.0f} MiB "
+                f"(limit {limit / 2 ** 20:.0f} MiB): each cell spreads over {spread} cells per axis. "
+                f"Use wavelet='haar', a smaller n_grid or a larger memory_budget")
+
+    def _check_dense(self, n_features: int) -> None:
+        if n_features not in (2, 3):
+            raise ValueError(f"Dense grid supports 2 or 3 features, got {n_features}")
+
+    def _sparse_connected_components(self, cells: np.ndarray, values: np.ndarray, shape: Tuple[int, ...],
+                                     threshold: float) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Step 3 (sparse grid): connected dense cells (neighbours share a face, as in ndimage.label)
+
+        Returns:
+        --------
+        keys : ndarray
+            Sorted keys of dense cells
+        cell_labels : ndarray
+            Cluster label (1..n_clusters) of each dense cell
+        n_clusters : int
+            Number of clusters found
+        """
+        dense = cells[values > threshold]
+        keys = _encode_cells(dense, shape)
+        sources, targets = [], []
+        for axis in range(len(shape)):
+            inside = np.flatnonzero(dense[:, axis] + 1 < shape[axis])
+            neighbours = dense[inside]
+            neighbours[:, axis] += 1
+            pos, found = _lookup(keys, _encode_cells(neighbours, shape))
+            sources.append(inside[found])
+            targets.append(pos[found])
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+        adjacency = coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)),
+                               shape=(len(dense), len(dense)))
+        n_clusters, components = connected_components(adjacency, directed=False)
+        return keys, components + 1, int(n_clusters)
+
+    def _grid_metadata(self, min_vals: np.ndarray, max_vals: np.ndarray, dense: bool = True) -> Dict:
+        """
+        Grid bounds, cell sizes and shape for the bounding box [min_vals, max_vals]
+        """
+        min_vals = np.asarray(min_vals, dtype=float)
+        max_vals = np.asarray(max_vals, dtype=float)
+        extent = max_vals - min_vals
+        shape = self._grid_shape(extent) if dense else (self.n_grid,) * len(extent)
+        cell_sizes = extent / np.array(shape)
+        cell_sizes = np.where(cell_sizes == 0, 1, cell_sizes)
+        return {
+            'min_vals': min_vals,
+            'max_vals': max_vals,
+            'cell_sizes': cell_sizes,
+            'n_features': len(min_vals),
+            'shape': shape
+        }
+
+    def _grid_shape(self, extent: np.ndarray) -> Tuple[int, ...]:
+        """
+        Divisions per axis of the dense grid: n_grid on every axis, or with memory_budget
+        proportional to the extent (n_grid on the longest axis) and reduced uniformly
+        until prod(shape) * _DENSE_CELL_BYTES fits the budget
+        """
+        if self.memory_budget is None:
+            return (self.n_grid,) * len(extent)
+        longest = extent.max(initial=0.0)
+        sizes = self.n_grid * extent / longest if longest > 0 else np.full(len(extent), float(self.n_grid))
+        sizes = np.maximum(sizes, 1.0)
+        max_cells = max(float(self.memory_budget) / _DENSE_CELL_BYTES, 1.0)
+        if np.prod(sizes) > max_cells:
+            sizes = np.maximum(sizes * (max_cells / np.prod(sizes)) ** (1.0 / len(sizes)), 1.0)
+        shape = np.maximum(np.floor(sizes).astype(int), 1)
+        # Axes clipped at one division may leave the product above the budget
+        while np.prod(shape) > max_cells and shape.max() > 1:
+            shape[np.argmax(shape)] -= 1
+        return tuple(int(n) for n in shape)
+
+    def _use_sparse(self, n_features: int) -> bool:
+        return self.grid_mode == 'sparse' or (self.grid_mode == 'auto' and n_features not in (2, 3))
+
+    def _update_clusters(self, progress: ProgressToken = None) -> None:
+        """
+        Steps 2-4 on the stored grid: wavelet transform, connected dense regions and
+        the cell labels used to label points by lookup (see _labels_of_cells)
+
+        Parameters:
+        -----------
+        progress : ProgressToken, optional
+            Progress and cancellation token
+        """
+        if progress is not None:
+            progress.report(0.0, 'Вейвлет-преобразование')
+        self.scale_factor_ = 2 ** self.n_levels  # Downsampling factor
+        if self.sparse_:
+            cells, counts = self.grid_
+            cells, values, shape = self._sparse_wavelet_transform(
+                cells, counts, self.grid_metadata_['shape'], self.n_levels, progress)
+        else:
+            values = self._apply_wavelet_transform(self.grid_, level=self.n_levels)
+
+        # Calculate threshold based on maximum density
+        max_density = values.max(initial=0.0)
+        if max_density <= 0:
+            print("⚠️  Warning: No dense regions found. All points marked as noise.")
+            self.n_clusters_ = 0
+            if self.sparse_:
+                self.cluster_cells_ = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), shape)
+            else:
+                self.labeled_grid_ = np.zeros(values.shape, dtype=np.int32)
+            return
+
+        threshold = max_density * self.density_threshold
+        if progress is not None:
+            progress.report(0.5, 'Поиск связных областей')
+        if self.sparse_:
+            keys, labels, self.n_clusters_ = self._sparse_connected_components(cells, values, shape, threshold)
+            self.cluster_cells_ = (keys, labels, shape)
+        else:
+            self.labeled_grid_, self.n_clusters_ = self._find_connected_components(values, threshold)
+
+    def _labels_of_cells(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Cluster labels of grid cells given by their indices, shape (n, n_features)
+        """
+        if not self.sparse_:
+            return self._coarse_cell_labels(indices, self.labeled_grid_, self.scale_factor_)
+        return self._sparse_cell_labels(indices, self.cluster_cells_, self.scale_factor_)
+
+    @staticmethod
+    def _sparse_cell_labels(indices: np.ndarray, cluster_cells: Tuple, scale_factor: int) -> np.ndarray:
+        # Labels of original cells from the dense transformed cells (keys, labels, shape)
+        keys, labels, coarse_shape = cluster_cells
+        coarse = np.minimum(indices // scale_factor, np.array(coarse_shape) - 1)
+        pos, found = _lookup(keys, _encode_cells(coarse, coarse_shape))
+        return np.where(found, labels[pos], 0).astype(np.int32)
+
+    def _inside(self, X: np.ndarray) -> np.ndarray:
+        # Points inside the grid bounding box
+        metadata = self.grid_metadata_
+        return np.all((X >= metadata['min_vals']) & (X <= metadata['max_vals']), axis=1)
+
+    def fit(self, X: np.ndarray, progress: ProgressToken = None) -> 'WaveClustering':
         """
         Perform clustering on X.
 
@@ -213,48 +578,221 @@ class WaveClustering:
         -----------
         X : array-like, shape (n_samples, n_features)
             Training instances to cluster
+        progress : ProgressToken, optional
+            Progress and cancellation token (see Frameworks_ccore/ProgressToken.py)
 
         Returns:
         --------
         self : object
             Returns the instance itself
+
+        Raises:
+        -------
+        ValueError
+            Dense grid with other than 2 or 3 features, or a sparse wavelet
+            transform expected to exceed the memory limit (see memory_budget)
         """
-        X = np.asarray(X)
+        X = _as_points(X)
+        self.n_features_in_ = X.shape[1]
+        self.sparse_ = self._use_sparse(X.shape[1])
+        if not self.sparse_:
+            self._check_dense(X.shape[1])
 
         # Step 1: Quantize data into grid
-        grid, metadata = self._quantize_data(X)
+        if self.sparse_:
+            cells, counts, metadata = self._quantize_sparse(X, progress and progress.sub(0.0, 0.45))
+            self.grid_ = (cells, counts)
+        else:
+            self.grid_, metadata = self._quantize_data(X, progress and progress.sub(0.0, 0.45))
+        # Per-point arrays are not kept with the fitted grid
+        inverse, codes = metadata.pop('inverse', None), metadata.pop('codes', None)
+        self.grid_metadata_ = metadata
+
+        # Steps 2-3: wavelet transform and connected components
+        self._update_clusters(progress and progress.sub(0.45, 0.55))
+
+        # Step 4: Map points to clusters by their cells
+        if progress is not None:
+            progress.report(0.55, 'Разметка точек')
+        if self.sparse_:
+            self.labels_ = self._labels_of_cells(cells)[inverse]
+        else:
+            self.labels_ = self._dense_point_labels(codes, self.labeled_grid_, self.scale_factor_,
+                                                    metadata['shape'])
 
-        # Use modified X if available
-        if 'original_X' in metadata:
-            X = metadata['original_X']
+        return self
 
-        # Step 2: Apply wavelet transform
-        transformed_grid = self._apply_wavelet_transform(grid, level=self.n_levels)
+    def partial_fit(self, X: np.ndarray, progress: ProgressToken = None) -> 'WaveClustering':
+        """
+        Add a chunk of points to the grid and update the clusters.
 
-        # Step 3: Find connected components
-        # Calculate threshold based on maximum density
-        max_density = transformed_grid.max()
+        The bounding box is fixed by the first call (bounds or the extent of the
+        first chunk) or by a previous fit; points outside it are not counted.
+        Memory depends on the grid only, not on the number of points seen.
 
-        # Handle case when max_density is 0
-        if max_density == 0:
-            print("⚠️  Warning: No dense regions found. All points marked as noise.")
-            self.labels_ = np.zeros(X.shape[0], dtype=int)
-            self.n_clusters_ = 0
-            return self
+        Parameters:
+        -----------
+        X : array-like, shape (n_samples, n_features)
+            Chunk of points
+        progress : ProgressToken, optional
+            Progress and cancellation token
 
-        threshold = max_density * self.density_threshold
+        Returns:
+        --------
+        self : object
+            Returns the instance itself; labels_ - labels of the chunk
+        """
+        X = _as_points(X)
+        if self.grid_metadata_ is None:
+            self.n_features_in_ = X.shape[1]
+            self.sparse_ = self._use_sparse(X.shape[1])
+            if not self.sparse_:
+                self._check_dense(X.shape[1])
+            min_vals, max_vals = self.bounds if self.bounds is not None else (X.min(axis=0), X.max(axis=0))
+            self.grid_metadata_ = self._grid_metadata(min_vals, max_vals, dense=not self.sparse_)
+            if self.sparse_:
+                self.grid_ = (np.empty((0, X.shape[1]), dtype=np.int64), np.empty(0))
+            else:
+                self.grid_ = np.zeros(self.grid_metadata_['shape'], dtype=np.uint8)
+        elif X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+
+        metadata = self.grid_metadata_
+        inside = self._inside(X)
+        indices = self._cell_indices(X[inside], metadata)
+        shape = metadata['shape']
+        if self.sparse_:
+            cells, counts = self.grid_
+            keys, inverse = np.unique(np.concatenate([_encode_cells(cells, shape), _encode_cells(indices, shape)]),
+                                      return_inverse=True)
+            weights = np.concatenate([counts, np.ones(len(indices))])
+            self.grid_ = (_decode_cells(keys, shape), np.bincount(inverse.ravel(), weights, len(keys)))
+        else:
+            counts = _count_cells(np.ravel_multi_index(tuple(indices.T), shape), shape)
+            # Widen the count dtype only when the new totals need it
+            largest = int(self.grid_.max(initial=0)) + int(counts.max(initial=0))
+            self.grid_ = self.grid_.astype(np.promote_types(self.grid_.dtype, np.min_scalar_type(largest)),
+                                           copy=False)
+            self.grid_ += counts
+
+        self._update_clusters(progress)
+        self.labels_ = np.zeros(len(X), dtype=np.int32)
+        self.labels_[inside] = self._labels_of_cells(indices)
+        return self
 
-        labeled_grid, self.n_clusters_ = self._find_connected_components(
-            transformed_grid, threshold)
+    def predict(self, X: np.ndarray, progress: ProgressToken = None) -> np.ndarray:
+        """
+        Label points by the cell of the fitted grid they fall into.
 
-        # Step 4: Map points to clusters
-        scale_factor = 2 ** self.n_levels  # Downsampling factor
-        self.labels_ = self._map_points_to_clusters(
-            X, labeled_grid, metadata, scale_factor)
+        Parameters:
+        -----------
+        X : array-like, shape (n_samples, n_features)
+            New points
+        progress : ProgressToken, optional
+            Progress and cancellation token
 
-        return self
+        Returns:
+        --------
+        labels : ndarray, shape (n_samples,)
+            Cluster labels (int32); 0 for noise and for points outside the grid bounding box
+
+        Raises:
+        -------
+        ValueError
+            The model is not fitted or the number of features differs
+        """
+        if self.grid_metadata_ is None:
+            raise ValueError("WaveClustering is not fitted")
+        X = _as_points(X)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+
+        labels = np.zeros(len(X), dtype=np.int32)
+        for b in checkpoints(progress, -(-len(X) // _BLOCK_POINTS), 'Разметка точек', every=1):
+            block = slice(b * _BLOCK_POINTS, (b + 1) * _BLOCK_POINTS)
+            inside = self._inside(X[block])
+            labels[block][inside] = self._labels_of_cells(self._cell_indices(X[block][inside], self.grid_metadata_))
+        return labels
 
-    def fit_predict(self, X: np.ndarray) -> np.ndarray:
+    def sweep(self, X: np.ndarray, levels, thresholds,
+              progress: ProgressToken = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cluster X for every (n_levels, density_threshold) pair from one quantization
+        and one wavelet pyramid.
+
+        The approximation of each level is computed once from the previous one
+        (_wavelet_step, the step of _apply_wavelet_transform; for the sparse grid -
+        one level of _sparse_wavelet_transform), then every threshold only thresholds and labels
+        it. Labels equal those of fit with the same parameters.
+
+        Parameters:
+        -----------
+        X : array-like, shape (n_samples, n_features)
+            Training instances to cluster
+        levels : iterable of int
+            Values of n_levels
+        thresholds : iterable of float
+            Values of density_threshold
+        progress : ProgressToken, optional
+            Progress and cancellation token
+
+        Returns:
+        --------
+        labels : ndarray, shape (len(levels), len(thresholds), n_samples)
+            Cluster labels (int32) for every pair
+        n_clusters : ndarray, shape (len(levels), len(thresholds))
+            Number of clusters for every pair
+        """
+        levels = [int(level) for level in levels]
+        thresholds = [float(threshold) for threshold in thresholds]
+        X = _as_points(X)
+        sparse = self._use_sparse(X.shape[1])
+        if not sparse:
+            self._check_dense(X.shape[1])
+
+        # Step 1 once: grid and the cell of every point
+        if sparse:
+            cells, counts, metadata = self._quantize_sparse(X, progress and progress.sub(0.0, 0.4))
+            approx = (cells, counts, metadata['shape'])
+        else:
+            approx, metadata = self._quantize_data(X, progress and progress.sub(0.0, 0.4))
+
+        labels = np.zeros((len(levels), len(thresholds), len(X)), dtype=np.int32)
+        n_clusters = np.zeros((len(levels), len(thresholds)), dtype=int)
+        done, total = 0, len(levels) * len(thresholds)
+        # Step 2 once per level: each approximation is derived from the previous one
+        for level in range(max(levels, default=-1) + 1):
+            if level > 0:
+                if sparse:
+                    approx = self._sparse_wavelet_transform(*approx, level=1, progress=progress)
+                else:
+                    approx = self._wavelet_step(approx)
+            values = approx[1] if sparse else approx
+            max_density = values.max(initial=0.0)
+
+            # Steps 3-4 for every threshold on this level
+            rows = [i for i, value in enumerate(levels) if value == level]
+            for i in rows:
+                for j, threshold in enumerate(thresholds):
+                    if progress is not None:
+                        progress.report(0.4 + 0.6 * done / total, 'Поиск связных областей')
+                    done += 1
+                    if max_density <= 0:
+                        continue
+                    if sparse:
+                        cluster_cells = self._sparse_connected_components(*approx, max_density * threshold)
+                        n_clusters[i, j] = cluster_cells[2]
+                        cell_labels = self._sparse_cell_labels(cells, cluster_cells[:2] + (approx[2],), 2 ** level)
+                        labels[i, j] = cell_labels[metadata['inverse']]
+                    else:
+                        labeled_grid, n_clusters[i, j] = self._find_connected_components(
+                            approx, max_density * threshold)
+                        labels[i, j] = self._dense_point_labels(metadata['codes'], labeled_grid, 2 ** level,
+                                                                metadata['shape'])
+
+        return labels, n_clusters
+
+    def fit_predict(self, X: np.ndarray, progress: ProgressToken = None) -> np.ndarray:
         """
         Compute clusters and predict cluster index for each sample.
 
@@ -262,13 +800,32 @@ class WaveClustering:
         -----------
         X : array-like, shape (n_samples, n_features)
             Samples to cluster
+        progress : ProgressToken, optional
+            Progress and cancellation token
 
         Returns:
         --------
         labels : ndarray, shape (n_samples,)
             Index of the cluster each sample belongs to
         """
-        return self.fit(X).labels_
+        return self.fit(X, progress).labels_
+
+
+@dataclass
+class WaveSweepPoint:
+    """Результат одной пары параметров при переборе WaveClustering (см. ConcreteStrategyWaveClustering.sweep)
+    """
+    n_levels: int
+    density_threshold: float
+    labels: np.ndarray
+    n_clusters: int
+    n_noise: int
+
+
+def _memory_budget(params: StrategyRunConfig):
+    # Параметр memory_mb в байтах; 0 - без ограничения
+    memory_mb = int(params["memory_mb"])
+    return memory_mb << 20 if memory_mb > 0 else None
 
 
 # Integration with existing project structure
@@ -282,6 +839,9 @@ class ConcreteStrategyWaveClustering(Strategy):
     WaveClustering strategy for the DMM Clustering System
     """
 
+    # Параметры, перебираемые методом sweep (в порядке его аргументов)
+    sweep_params = ('n_levels', 'density_threshold')
+
     @classmethod
     def _setupParams(cls):
         cls._addParam("n_grid", "Количество делений сетки", StrategyParamType.UNumber,
@@ -315,6 +875,24 @@ class ConcreteStrategyWaveClustering(Strategy):
                      """,
                      0.1)
 
+        cls._addParam("grid_mode", "Хранение сетки", StrategyParamType.Switch,
+                     """
+                     Способ хранения сетки.
+                     auto - плотная сетка для 2-3 признаков, разреженная для остальных
+                     dense - плотный массив n_grid^d (2-3 признака)
+                     sparse - только непустые ячейки (любое число признаков)
+                     """,
+                     "auto",
+                     switches=list(GRID_MODES))
+
+        cls._addParam("memory_mb", "Память под сетку, МБ", StrategyParamType.UNumber,
+                     """
+                     Объём памяти под плотную сетку в мегабайтах (0 - без ограничения).
+                     Число делений выбирается по каждой оси пропорционально разбросу данных
+                     (n_grid по самой длинной оси) и уменьшается, пока сетка не поместится.
+                     """,
+                     0)
+
     def clastering_image(self, pixels: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
         """
         Кластеризация изображения методом WaveClustering
@@ -343,9 +921,11 @@ class ConcreteStrategyWaveClustering(Strategy):
             n_grid=int(params["n_grid"]),
             wavelet=params["wavelet"],
             n_levels=int(params["n_levels"]),
-            density_threshold=float(params["density_threshold"])
+            density_threshold=float(params["density_threshold"]),
+            grid_mode=params["grid_mode"],
+            memory_budget=_memory_budget(params)
         )
-        return model.fit_predict(pixels)
+        return model.fit_predict(pixels, self.progress)
 
     def clastering_points(self, points: np.ndarray, params: StrategyRunConfig) -> np.ndarray:
         """
@@ -376,6 +956,38 @@ class ConcreteStrategyWaveClustering(Strategy):
             n_grid=int(params["n_grid"]),
             wavelet=params["wavelet"],
             n_levels=int(params["n_levels"]),
-            density_threshold=float(params["density_threshold"])
+            density_threshold=float(params["density_threshold"]),
+            grid_mode=params["grid_mode"],
+            memory_budget=_memory_budget(params)
+        )
+        return model.fit_predict(points, self.progress)
+
+    def sweep(self, points: np.ndarray, n_levels_values, density_threshold_values,
+              params: StrategyRunConfig) -> List[WaveSweepPoint]:
+        """Перебор параметров n_levels и density_threshold по одному вейвлет-разложению.
+
+        Данные квантуются один раз, приближение каждого уровня вычисляется один
+        раз из предыдущего, для каждого порога ищутся только связные области
+        (см. WaveClustering.sweep). Результат совпадает с clastering_points.
+
+        Аргументы:
+            points (np.ndarray): Точки формы (n_samples, n_features).
+            n_levels_values: Значения n_levels.
+            density_threshold_values: Значения density_threshold.
+            params (StrategyRunConfig): Остальные параметры (n_grid, wavelet, grid_mode, memory_mb).
+
+        Возвращает:
+            List[WaveSweepPoint]: Метки и число кластеров для каждой пары в порядке
+                                  перебора (n_levels - внешний цикл).
+        """
+        model = WaveClustering(
+            n_grid=int(params["n_grid"]),
+            wavelet=params["wavelet"],
+            grid_mode=params["grid_mode"],
+            memory_budget=_memory_budget(params)
         )
-        return model.fit_predict(points)
+        labels, n_clusters = model.sweep(points, n_levels_values, density_threshold_values, self.progress)
+        return [WaveSweepPoint(int(n_levels), float(threshold), labels[i, j], int(n_clusters[i, j]),
+                               int(np.count_nonzero(labels[i, j] == 0)))
+                for i, n_levels in enumerate(n_levels_values)
+                for j, threshold in enumerate(density_threshold_values)]
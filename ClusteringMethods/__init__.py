@@ -5,6 +5,7 @@ ClusteringMethods Package
 
 # Импорт базовых классов и алгоритмов
 from ClusteringMethods.ClasteringAlgorithms import *
+from ClusteringMethods.SpatialIndex import SpatialIndex
 
 # Импорт WaveClustering
 try:
@@ -22,6 +23,7 @@ __all__ = [
     'Strategy',
     'StrategiesManager',
     'Context',
+    'SpatialIndex',
     'ConcreteStrategyWaveClustering',
     'WaveClustering'
 ]
@@ -17,11 +17,12 @@ from numpy.random import default_rng
         width (float): Ширина структуры (default = 0.5).
         min_u (float): Минимальное значение параметра для формирования витков (default = 0.0).
         max_u (float): Максимальное значение параметра для формирования витков (default = 3 * pi).
+        random_state (int): Зерно генератора случайных чисел для воспроизводимого результата (default = None).
 """
 def make_dna(n_samples: int = 300, center_box = (-1.0, 1.0),
-             width: float  = 0.5, min_u: float = 0.0, max_u: float = 3 * pi):
+             width: float  = 0.5, min_u: float = 0.0, max_u: float = 3 * pi, random_state = None):
     # ВЫЧИСЛЕНИЯ
-    rng = default_rng()
+    rng = default_rng(random_state)
     u = linspace(min_u, max_u, n_samples)
     x1, x2 = width * cos(u), - width * cos(u)
     y1, y2 = width * sin(u), - width * sin(u)
@@ -0,0 +1,449 @@
+# This Python file uses the following encoding: utf-8
+"""
+Пакетный (без графического интерфейса) запуск стратегий кластеризации.
+
+Задание описывается файлом JSON или TOML:
+
+    output = "results"          # каталог результатов (необязательно)
+    workers = 8                 # число процессов пула (необязательно)
+    cache = "cache"             # каталог кэша результатов (необязательно, по умолчанию без кэша)
+
+    [input]                     # данные по умолчанию для всех запусков
+    type = "points"             # points | image
+    path = "DatasetsImages/csv/dataPoints.csv"
+    labels = "dataLabels.csv"   # необязательно, эталонные метки точек (csv GUI или .npy)
+
+    [[jobs]]
+    strategy = "dbscan_sk"      # идентификатор из StrategiesManager
+    name = "dbscan_eps03"       # необязательно, по умолчанию идентификатор стратегии
+    repetitions = 3             # необязательно, по умолчанию 1
+    metrics = true              # необязательно, вычислять ли показатели качества (DunnIndex, DBi, силуэт...)
+    trace_memory = false        # необязательно, пик памяти этапов через tracemalloc (замедляет стратегии)
+    params = { eps = 0.3, min_samples = 5 }
+
+    [[jobs]]
+    strategy = "dbscan_sk"      # перебор параметров (только стратегии с методом sweep)
+    sweep = { eps = [0.1, 0.2, 0.3], min_samples = [3, 5, 10] }
+
+    [[jobs]]
+    strategy = "waveclustering" # перебираемые параметры - sweep_params стратегии
+    sweep = { n_levels = [1, 2, 3], density_threshold = [0.05, 0.1, 0.2] }
+
+Каждый запуск может переопределить данные собственной секцией input, пути
+задаются относительно файла задания. Точки
+читаются из csv в формате GUI (строки - признаки, разделитель ';') или из
+.npy/.npz (n_samples, n_features); для изображений задаётся img_type
+(none, hsv, hls, yuv) так же, как в окне приложения.
+
+Результаты: метки каждого запуска в labels/<name>_r<k>.npy и по одной строке
+JSON на запуск (время, метрики, параметры, профиль этапов profile - см.
+Frameworks_ccore/RunProfile.py) в results.jsonl. Метрики изображений
+вычисляются по выборкам пикселей, их доверительные интервалы - в поле
+metric_estimates (см. AnalysisMethods/SampledMetrics.py). Если заданы эталонные
+метки, в метрики добавляются ARI, NMI, V-мера и чистота (см.
+AnalysisMethods/ExternalMetrics.py). Перебор параметров
+даёт по строке на каждую пару (labels/<name>_r<k>_<i>.npy), поле elapsed этих
+строк - время всего перебора. Если задан кэш,
+запуск с теми же данными и параметрами берётся из него (поле cached записи),
+при этом повторения одного задания не пересчитываются.
+"""
+
+import argparse
+import csv
+import json
+import os
+import tomllib
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from PIL import Image
+
+from ClusteringMethods.ClasteringAlgorithms import (
+    Context,
+    StrategiesManager,
+    StrategyParamType,
+    StrategyRunConfig
+)
+from AnalysisMethods.AnalysisAlgorithms import QualityIndices, group_by_label
+from AnalysisMethods.ExternalMetrics import external_scores
+from AnalysisMethods.SampledMetrics import estimate_quality
+from Frameworks_ccore.ClusteringJob import ClusteringJob, ClusteringResult, run_clustering_job
+from ClusteringMethods.SpatialIndex import SpatialIndex
+from Frameworks_ccore.ResultCache import ResultCache, job_key
+from Frameworks_ccore.RunProfile import RunProfiler, profile_to_dicts
+
+IMAGE_TYPES = ['none', 'hsv', 'hls', 'yuv']
+
+
+def load_spec(path: str | os.PathLike) -> Dict[str, Any]:
+    """Читает описание пакетного задания.
+
+    Аргументы:
+        path (str | PathLike): Путь к файлу .json или .toml.
+
+    Возвращает:
+        Dict[str, Any]: Описание задания.
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.toml':
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def make_run_config(strat_id: str, values: Dict[str, Any]) -> StrategyRunConfig:
+    """Создаёт параметры запуска стратегии из словаря значений.
+
+    Целые значения для параметров с плавающей точкой приводятся к float,
+    так как в JSON/TOML `1` и `1.0` неразличимы для пользователя.
+
+    Исключения:
+        ValueError: Неизвестная стратегия или недопустимое значение параметра.
+    """
+    config = StrategiesManager.getStrategyRunConfigById(strat_id)
+    if config is None:
+        raise ValueError(f"Unknown strategy {strat_id}")
+
+    for key, val in values.items():
+        key = key.lower().strip().replace(" ", "").replace("-", "_")
+        param = config.params.get(key)
+        if param is not None and param.param_type in (StrategyParamType.Floating, StrategyParamType.UFloating) \
+                and isinstance(val, int) and not isinstance(val, bool):
+            val = float(val)
+        config[key] = val
+
+    return config
+
+
+def load_points(path: str) -> np.ndarray:
+    """Загружает точки в формате (n_features, n_samples), принятом в Context.
+
+    Аргументы:
+        path (str): csv в формате GUI (dataPoints.csv) либо .npy/.npz с массивом (n_samples, n_features).
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == '.npy':
+        return np.ascontiguousarray(np.load(path).transpose(), dtype=float)
+    if suffix == '.npz':
+        with np.load(path) as npz:
+            return np.ascontiguousarray(npz[npz.files[0]].transpose(), dtype=float)
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        rows = [row for row in csv.reader(f, dialect='excel', delimiter=';') if len(row) > 0]
+    # Старые версии GUI записывали каждый признак одной ячейкой вида "[x1, x2, ...]"
+    features = []
+    for row in rows:
+        if all(cell.startswith('[') for cell in row):
+            features += [json.loads(cell) for cell in row]
+        else:
+            features.append(row)
+    return np.array(features, dtype=float)
+
+
+def load_image(path: str, img_type: int) -> np.ndarray:
+    """Загружает пиксели изображения так же, как MainWindow.clickStartClustering.
+    """
+    if img_type == 0:
+        image = np.array(Image.open(path))
+        return image.reshape((-1, 3))
+
+    # opencv нужен только для цветовых пространств, не требуем его для точек
+    import cv2      # pip install opencv-python
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    match img_type:
+        case 1:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        case 2:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2HLS)
+        case 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2YUV)
+    raise ValueError(f"Unknown image type {img_type}")
+
+
+def load_labels(path: str) -> np.ndarray:
+    """Загружает эталонные метки точек.
+
+    Аргументы:
+        path (str): csv в формате GUI (dataLabels.csv, одна строка) либо .npy.
+    """
+    if Path(path).suffix.lower() == '.npy':
+        return np.load(path).ravel()
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        cells = [cell for row in csv.reader(f, dialect='excel', delimiter=';') for cell in row]
+    return np.array([int(float(cell)) for cell in cells])
+
+
+@lru_cache(maxsize=4)
+def _load_labels(path: str) -> np.ndarray:
+    return load_labels(path)
+
+
+@lru_cache(maxsize=4)
+def _load_input(kind: str, path: str, img_type: int) -> np.ndarray:
+    # Кэш на процесс: процесс пула читает один и тот же файл один раз.
+    if kind == 'image':
+        return load_image(path, img_type)
+    return load_points(path)
+
+
+@lru_cache(maxsize=4)
+def _get_spatial_index(kind: str, path: str, img_type: int) -> SpatialIndex:
+    # Индекс соседей на входной файл: запуски в одном процессе не повторяют поиск соседей.
+    return SpatialIndex()
+
+
+@lru_cache(maxsize=None)
+def _get_cache(directory: str) -> ResultCache:
+    # Один кэш на процесс пула: память процесса и общий каталог на диске.
+    return ResultCache(directory)
+
+
+def _parse_input(section: Dict[str, Any], base_dir: Path) -> Dict[str, Any]:
+    kind = section.get('type', 'points')
+    if kind not in ('points', 'image'):
+        raise ValueError(f"Unknown input type {kind}")
+    if 'path' not in section:
+        raise ValueError("input section must have a path")
+
+    img_type = section.get('img_type', 'none')
+    if isinstance(img_type, str):
+        img_type = IMAGE_TYPES.index(img_type.lower())
+
+    labels = section.get('labels')
+    return {'type': kind, 'path': str((base_dir / section['path']).resolve()), 'img_type': int(img_type),
+            'labels': str((base_dir / labels).resolve()) if labels else None}
+
+
+def _input_key(task: Dict[str, Any]) -> tuple:
+    return task['input']['type'], task['input']['path'], task['input']['img_type']
+
+
+def _run_task(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    config = make_run_config(task['strategy'], task['params'])
+    try:
+        data = _load_input(*_input_key(task))
+        labels_true = _load_labels(task['input']['labels']) if task['input'].get('labels') else None
+    except Exception as e:
+        result = ClusteringResult(task['strategy'], error=f"{type(e).__name__}: {e}")
+    else:
+        if task.get('sweep'):
+            return _run_sweep(task, config, data, labels_true)
+
+        job = ClusteringJob(task['strategy'], config, data, task['input']['type'],
+                            task['input']['img_type'], task['metrics'], trace_memory=task['trace_memory'],
+                            labels_true=labels_true)
+        cache = _get_cache(task['cache']) if task.get('cache') else None
+        key = job_key(job) if cache is not None else None
+        result = cache.get(key) if cache is not None else None
+        if result is None:
+            result = run_clustering_job(job, _get_spatial_index(*_input_key(task)))
+            if cache is not None:
+                cache.put(key, result)
+
+    return [_make_record(task, config.values(), result, f"{task['name']}_r{task['repetition']}")]
+
+
+def _run_sweep(task: Dict[str, Any], config: StrategyRunConfig, data: np.ndarray,
+               labels_true: np.ndarray | None = None) -> List[Dict[str, Any]]:
+    strat = StrategiesManager.createStrategyById(task['strategy'])
+    profiler = RunProfiler(task['trace_memory'])
+    with profiler.phase('prepare'):
+        if task['input']['type'] == 'image':
+            points = np.asarray(Context.image_features(data), dtype=float)
+        else:
+            points = np.ascontiguousarray(np.asarray(data, dtype=float).transpose())
+
+        strat.spatial_index = _get_spatial_index(*_input_key(task))
+        strat.spatial_index.bind(points)
+
+    sweep = task['sweep']
+    try:
+        with profiler.phase('fit'):
+            table = strat.sweep(points, *(sweep[name] for name in strat.sweep_params), config)
+        elapsed = profiler.get('fit').cpu
+    except Exception as e:
+        result = ClusteringResult(task['strategy'], error=f"{type(e).__name__}: {e}")
+        return [_make_record(task, config.values(), result, f"{task['name']}_r{task['repetition']}")]
+
+    records = []
+    for idx, row in enumerate(table):
+        result = ClusteringResult(task['strategy'], labels=row.labels, elapsed=elapsed)
+        # Этапы prepare и fit общие для всего перебора, labels и metrics - свои у каждой строки
+        rowProfiler = RunProfiler(task['trace_memory'], [replace(p) for p in profiler.phases])
+        if task['metrics'] and task['input']['type'] == 'image':
+            try:
+                with rowProfiler.phase('metrics'):
+                    result.metric_estimates = estimate_quality(points, row.labels)
+                    result.metrics = {name: e.value for name, e in result.metric_estimates.items()}
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+        elif task['metrics']:
+            try:
+                with rowProfiler.phase('labels'):
+                    C = group_by_label(points, row.labels)
+                with rowProfiler.phase('metrics'):
+                    result.metrics = QualityIndices(C)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+        if labels_true is not None:
+            try:
+                with rowProfiler.phase('external'):
+                    result.metrics.update(external_scores(labels_true, row.labels))
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+        result.profile = rowProfiler.phases
+        values = config.values() | {name: getattr(row, name) for name in strat.sweep_params}
+        record = _make_record(task, values, result, f"{task['name']}_r{task['repetition']}_{idx}")
+        record['sweep'] = idx
+        records.append(record)
+    return records
+
+
+def _make_record(task: Dict[str, Any], params: Dict[str, Any], result: ClusteringResult, labels_name: str) -> Dict[str, Any]:
+    record = {
+        'job': task['name'],
+        'strategy': task['strategy'],
+        'repetition': task['repetition'],
+        'input': task['input']['path'],
+        'params': params,
+        'elapsed': result.elapsed,
+        'metrics': result.metrics,
+        'labels': None,
+        'error': result.error,
+        'cached': result.cached,
+        'profile': profile_to_dicts(result.profile),
+    }
+    if result.metric_estimates:
+        record['metric_estimates'] = {name: asdict(e) for name, e in result.metric_estimates.items()}
+    if result.labels is not None:
+        labels_path = Path(task['output']) / 'labels' / f"{labels_name}.npy"
+        np.save(labels_path, result.labels)
+        record['labels'] = str(labels_path.relative_to(task['output']))
+        record['n_clusters'] = int(len(np.unique(result.labels)))
+
+    return record
+
+
+def build_tasks(spec: Dict[str, Any], output_dir: str | os.PathLike, base_dir: str | os.PathLike = '.',
+                cache_dir: str | os.PathLike | None = None) -> List[Dict[str, Any]]:
+    """Разворачивает описание задания в список отдельных запусков.
+
+    Исключения:
+        ValueError: Ошибка в описании задания (проверяется до запуска пула).
+    """
+    base_dir = Path(base_dir)
+    default_input = spec.get('input')
+    tasks = []
+    names = set()
+
+    for idx, job in enumerate(spec.get('jobs', [])):
+        strat_id = job.get('strategy')
+        if strat_id not in StrategiesManager.strategies():
+            raise ValueError(f"jobs[{idx}]: unknown strategy {strat_id}")
+
+        input_section = job.get('input', default_input)
+        if input_section is None:
+            raise ValueError(f"jobs[{idx}]: no input specified")
+
+        name = job.get('name', strat_id)
+        if name in names:
+            name = f"{name}_{idx}"
+        names.add(name)
+
+        params = job.get('params', {})
+        make_run_config(strat_id, params)   # проверка параметров до запуска
+
+        sweep = job.get('sweep')
+        if sweep is not None:
+            strategyType = StrategiesManager.strategies()[strat_id].strategyType
+            if not hasattr(strategyType, 'sweep'):
+                raise ValueError(f"jobs[{idx}]: strategy {strat_id} does not support sweep")
+            if not all(sweep.get(name) for name in strategyType.sweep_params):
+                raise ValueError(f"jobs[{idx}]: sweep must list {' and '.join(strategyType.sweep_params)}")
+
+        for rep in range(int(job.get('repetitions', 1))):
+            tasks.append({
+                'name': name,
+                'strategy': strat_id,
+                'repetition': rep,
+                'params': params,
+                'sweep': sweep,
+                'metrics': bool(job.get('metrics', True)),
+                'trace_memory': bool(job.get('trace_memory', False)),
+                'input': _parse_input(input_section, base_dir),
+                'output': str(output_dir),
+                'cache': str(cache_dir) if cache_dir is not None else None,
+            })
+
+    return tasks
+
+
+def run_batch(spec: Dict[str, Any] | str | os.PathLike, output_dir: str | os.PathLike | None = None,
+              max_workers: int | None = None, cache_dir: str | os.PathLike | None = None) -> List[Dict[str, Any]]:
+    """Выполняет пакетное задание в пуле процессов.
+
+    Аргументы:
+        spec (dict | str | PathLike): Описание задания или путь к файлу .json/.toml.
+        output_dir (str | PathLike, optional): Каталог результатов. По умолчанию поле output
+                                               задания или "results".
+        max_workers (int, optional): Число процессов. По умолчанию поле workers задания или
+                                     количество ядер.
+        cache_dir (str | PathLike, optional): Каталог кэша результатов. По умолчанию поле cache
+                                              задания (относительно файла задания) или без кэша.
+
+    Возвращает:
+        List[Dict[str, Any]]: Записи о запусках в порядке их описания в задании (они же
+                              записываются в results.jsonl).
+    """
+    base_dir = Path('.')
+    if not isinstance(spec, dict):
+        base_dir = Path(spec).parent
+        spec = load_spec(spec)
+
+    output_dir = Path(output_dir or spec.get('output', 'results'))
+    (output_dir / 'labels').mkdir(parents=True, exist_ok=True)
+    max_workers = max_workers or spec.get('workers') or os.cpu_count()
+
+    if cache_dir is None and spec.get('cache'):
+        cache_dir = (base_dir / spec['cache']).resolve()
+
+    tasks = build_tasks(spec, output_dir, base_dir, cache_dir)
+
+    records = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor, \
+            open(output_dir / 'results.jsonl', 'w', encoding='utf-8') as out:
+        for taskRecords in executor.map(_run_task, tasks):
+            for record in taskRecords:
+                out.write(json.dumps(record, ensure_ascii=False, default=float) + '\n')
+                records.append(record)
+            out.flush()
+
+    return records
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетный запуск стратегий кластеризации без графического интерфейса")
+    parser.add_argument('spec', help="файл задания (.json или .toml)")
+    parser.add_argument('-o', '--output', default=None, help="каталог результатов")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="число процессов (по умолчанию - число ядер)")
+    parser.add_argument('-c', '--cache', default=None, help="каталог кэша результатов")
+    args = parser.parse_args(argv)
+
+    records = run_batch(args.spec, args.output, args.workers, args.cache)
+    failed = 0
+    for record in records:
+        if record['error'] is not None:
+            failed += 1
+            print(f"{record['job']} #{record['repetition']}: {record['error']}")
+        else:
+            cached = " (кэш)" if record['cached'] else ""
+            print(f"{record['job']} #{record['repetition']}: {record['elapsed']:.4f} с{cached}, {record['metrics']}")
+
+    return 1 if failed > 0 else 0
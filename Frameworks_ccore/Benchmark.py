@@ -0,0 +1,473 @@
+# This Python file uses the following encoding: utf-8
+"""
+Набор тестов производительности стратегий кластеризации и показателей качества.
+
+Стратегии берутся из StrategiesManager.strategies() (с параметрами по
+умолчанию), данные - из генераторов make_blobs, make_moons, make_spheres и
+make_dna размером от 1e3 до 1e6 точек. Для каждого случая записываются время
+(реальное и процессорное, этап fit - см. Frameworks_ccore/RunProfile.py),
+память (пик tracemalloc и пик RSS процесса) и качество (ARI относительно
+эталонной разметки генератора, число кластеров, DunnIndex на небольших
+выборках). Функции AnalysisMethods/AnalysisAlgorithms.py измеряются
+отдельными случаями с меньшими размерами, так как их сложность O(n^2).
+
+Каждый случай выполняется в отдельном процессе с ограничением времени; если
+случай не уложился в ограничение, большие размеры той же пары стратегия -
+генератор пропускаются. Результаты дописываются строками JSON в файл истории
+и сравниваются с сохранённым базовым уровнем (baseline):
+
+    python benchmark.py                          # все стратегии и размеры
+    python benchmark.py -s dbscan_sk -g blobs -n 1000 10000
+    python benchmark.py --save-baseline          # принять результаты за базовый уровень
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import time
+
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+from sklearn.datasets import make_blobs, make_moons
+
+from ClusteringMethods.ClasteringAlgorithms import StrategiesManager
+from AnalysisMethods.AnalysisAlgorithms import (DBi, DaviesBouldinIndex, DunnIndex, DunnIndexMean, QualityIndices,
+                                                SilhouetteScore, group_by_label)
+from AnalysisMethods.ExternalMetrics import adjusted_rand_index
+from DatasetsGenerators.make_dna import make_dna
+from DatasetsGenerators.make_spheres import make_spheres
+from Frameworks_ccore.BatchRunner import make_run_config
+from Frameworks_ccore.ClusteringJob import ClusteringJob, run_clustering_job
+from Frameworks_ccore.RunProfile import RunProfiler, peak_rss
+
+
+def _blobs(n_samples: int, random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+    return make_blobs(n_samples=n_samples, centers=3, n_features=3, random_state=random_state)
+
+
+def _moons(n_samples: int, random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+    return make_moons(n_samples=n_samples, noise=0.05, random_state=random_state)
+
+
+def _spheres(n_samples: int, random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+    data, labels = make_spheres(n_samples=n_samples, shuffle=True, random_state=random_state)
+    return np.array(data).transpose(), np.array(labels)
+
+
+def _dna(n_samples: int, random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+    # make_dna возвращает по n_samples точек на каждую из двух спиралей
+    data, labels = make_dna(n_samples=n_samples // 2, random_state=random_state)
+    return np.array(data[0]).transpose(), np.concatenate(labels)
+
+
+"""Генераторы данных: название -> функция (n_samples, random_state) -> (X, y)
+"""
+GENERATORS: Dict[str, Callable[[int, int], Tuple[np.ndarray, np.ndarray]]] = {
+    'blobs': _blobs,
+    'moons': _moons,
+    'spheres': _spheres,
+    'dna': _dna,
+}
+
+def _dbi(C) -> float:
+    # Индекс Дэвиса-Болдина всего разбиения из попарных DBi (p=2, q=1)
+    k = len(C)
+    return float(np.mean([max(DBi(C, i, j, 2, 1) for j in range(k) if j != i) for i in range(k)]))
+
+
+"""Измеряемые показатели качества: название -> функция от списка кластеров, возвращающая
+значение или словарь значений (QualityIndices - все показатели за один проход)
+"""
+METRICS: Dict[str, Callable] = {
+    'DunnIndex': DunnIndex,
+    'DunnIndexMean': DunnIndexMean,
+    'DBi': _dbi,
+    'DaviesBouldinIndex': DaviesBouldinIndex,
+    'SilhouetteScore': SilhouetteScore,
+    'QualityIndices': QualityIndices,
+}
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_METRIC_SIZES = [250, 500, 1_000]
+
+
+@dataclass
+class BenchmarkCase:
+    """Один измеряемый случай
+    """
+
+    """'strategy' - стратегия кластеризации, 'metric' - показатель качества
+    """
+    kind: str
+
+    """Идентификатор стратегии или название показателя
+    """
+    name: str
+
+    """Название генератора данных (см. GENERATORS)
+    """
+    generator: str
+
+    n_samples: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.name}:{self.generator}:{self.n_samples}"
+
+
+def generate(generator: str, n_samples: int, random_state: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Данные генератора в формате (n_samples, n_features) и эталонные метки.
+    """
+    X, y = GENERATORS[generator](n_samples, random_state)
+    return np.ascontiguousarray(X, dtype=float), np.asarray(y)
+
+
+def build_cases(strategies: List[str] | None = None, generators: List[str] | None = None,
+                sizes: List[int] | None = None, metrics: List[str] | None = None,
+                metric_sizes: List[int] | None = None) -> List[BenchmarkCase]:
+    """Список случаев: все сочетания стратегия - генератор - размер и показатель - размер.
+
+    Аргументы:
+        strategies (List[str], optional): Идентификаторы стратегий. По умолчанию все зарегистрированные.
+        generators (List[str], optional): Генераторы. По умолчанию все из GENERATORS.
+        sizes (List[int], optional): Размеры данных для стратегий. По умолчанию DEFAULT_SIZES.
+        metrics (List[str], optional): Показатели качества. По умолчанию все из METRICS.
+        metric_sizes (List[int], optional): Размеры данных для показателей. По умолчанию DEFAULT_METRIC_SIZES.
+
+    Исключения:
+        ValueError: Неизвестная стратегия, генератор или показатель.
+    """
+    strategies = list(StrategiesManager.strategies()) if strategies is None else strategies
+    generators = list(GENERATORS) if generators is None else generators
+    metrics = list(METRICS) if metrics is None else metrics
+
+    for strat_id in strategies:
+        if strat_id not in StrategiesManager.strategies():
+            raise ValueError(f"Unknown strategy {strat_id}")
+    for generator in generators:
+        if generator not in GENERATORS:
+            raise ValueError(f"Unknown generator {generator}")
+    for metric in metrics:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric}")
+
+    cases = [BenchmarkCase('strategy', strat_id, generator, int(n))
+             for strat_id in strategies for generator in generators
+             for n in sorted(sizes or DEFAULT_SIZES)]
+    cases += [BenchmarkCase('metric', metric, 'blobs', int(n))
+              for metric in metrics for n in sorted(metric_sizes or DEFAULT_METRIC_SIZES)]
+    return cases
+
+
+def _measure(case: BenchmarkCase, X: np.ndarray, y: np.ndarray, trace_memory: bool,
+             quality_max_points: int) -> Dict[str, Any]:
+    # Время измеряется без tracemalloc; пик памяти - отдельным запуском под ним
+    if case.kind == 'metric':
+        C = group_by_label(X, y)
+        profiles = []
+        for traced in (False, True) if trace_memory else (False,):
+            profiler = RunProfiler(traced)
+            with profiler.phase('metrics'):
+                value = METRICS[case.name](C)
+            profiles.append(profiler.get('metrics'))
+        quality = {name: float(v) for name, v in value.items()} if isinstance(value, dict) \
+            else {case.name: float(value)}
+        return {'wall': profiles[0].wall, 'cpu': profiles[0].cpu, 'py_peak': profiles[-1].py_peak,
+                'quality': quality}
+
+    results = []
+    for traced in (False, True) if trace_memory else (False,):
+        job = ClusteringJob(case.name, make_run_config(case.name, {}), X.transpose(),
+                            compute_metrics=False, trace_memory=traced)
+        results.append(run_clustering_job(job))
+        if results[-1].error is not None:
+            raise RuntimeError(results[-1].error)
+
+    result = results[0]
+    phase = next(p for p in result.profile if p.name == 'fit')
+    peaks = [p.py_peak for p in results[-1].profile if p.py_peak is not None]
+    labels = result.labels
+    quality = {
+        'ARI': adjusted_rand_index(y, labels),
+        'n_clusters': int(len(np.unique(labels[labels >= 0]))),
+    }
+    if len(X) <= quality_max_points and len(np.unique(labels)) > 1:
+        quality['DunnIndex'] = float(DunnIndex(group_by_label(X, labels)))
+    return {'wall': phase.wall, 'cpu': phase.cpu, 'py_peak': max(peaks) if peaks else None,
+            'quality': quality}
+
+
+def _run_case_process(case: BenchmarkCase, X: np.ndarray, y: np.ndarray, trace_memory: bool,
+                      quality_max_points: int, conn: Connection) -> None:
+    # Точка входа дочернего процесса: отдельный процесс даёт собственный пик RSS
+    try:
+        record = _measure(case, X, y, trace_memory, quality_max_points)
+        record['status'] = 'ok'
+    except Exception as e:
+        record = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+    record['rss_peak'] = peak_rss()
+    conn.send(record)
+    conn.close()
+
+
+def run_case(case: BenchmarkCase, X: np.ndarray, y: np.ndarray, timeout: float = 300.0,
+             trace_memory: bool = True, quality_max_points: int = 2000) -> Dict[str, Any]:
+    """Измеряет один случай в отдельном процессе.
+
+    Аргументы:
+        case (BenchmarkCase): Случай.
+        X (np.ndarray): Данные (n_samples, n_features).
+        y (np.ndarray): Эталонные метки.
+        timeout (float): Ограничение времени, с. Процесс, не уложившийся в него, завершается.
+        trace_memory (bool): Измерять ли пик памяти tracemalloc. tracemalloc замедляет код на
+                             Python, поэтому пик измеряется повторным запуском, а время - без него.
+        quality_max_points (int): Наибольший размер данных, для которого вычисляется DunnIndex результата.
+
+    Возвращает:
+        Dict[str, Any]: Запись: поля случая, status ('ok', 'error', 'timeout'), wall, cpu,
+                        py_peak, rss_peak, quality, error.
+    """
+    record = {'key': case.key, 'kind': case.kind, 'name': case.name, 'generator': case.generator,
+              'n_samples': case.n_samples, 'status': 'timeout', 'wall': None, 'cpu': None,
+              'py_peak': None, 'rss_peak': None, 'quality': {}, 'error': None}
+
+    mp = multiprocessing.get_context()
+    parentConn, childConn = mp.Pipe(duplex=False)
+    process = mp.Process(target=_run_case_process,
+                         args=(case, X, y, trace_memory, quality_max_points, childConn), daemon=True)
+    process.start()
+    childConn.close()
+    try:
+        if parentConn.poll(timeout):
+            record.update(parentConn.recv())
+        else:
+            record['error'] = f"Timeout {timeout} s"
+    except EOFError:
+        record['status'] = 'error'
+        record['error'] = "Process terminated unexpectedly"
+    finally:
+        parentConn.close()
+        process.join(timeout=1.0)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    return record
+
+
+def run_benchmark(cases: List[BenchmarkCase], timeout: float = 300.0, trace_memory: bool = True,
+                  quality_max_points: int = 2000, random_state: int = 0,
+                  on_record: Callable[[Dict[str, Any]], None] | None = None) -> List[Dict[str, Any]]:
+    """Выполняет случаи по порядку.
+
+    Данные каждого генератора и размера создаются один раз. Если случай не уложился
+    во время, случаи той же стратегии (показателя) и генератора с большим размером
+    получают status 'skipped'.
+
+    Аргументы:
+        cases (List[BenchmarkCase]): Случаи (см. build_cases).
+        timeout (float): Ограничение времени одного случая, с.
+        trace_memory (bool): Измерять ли пик памяти tracemalloc.
+        quality_max_points (int): Наибольший размер данных для DunnIndex результата стратегии.
+        random_state (int): Зерно генераторов.
+        on_record (Callable, optional): Вызывается для каждой записи сразу после измерения.
+
+    Возвращает:
+        List[Dict[str, Any]]: Записи в порядке случаев.
+    """
+    datasets: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray]] = dict()
+    timedOut: Dict[Tuple[str, str, str], int] = dict()
+    records = []
+
+    for case in cases:
+        group = (case.kind, case.name, case.generator)
+        if group in timedOut and case.n_samples > timedOut[group]:
+            record = {'key': case.key, 'kind': case.kind, 'name': case.name, 'generator': case.generator,
+                      'n_samples': case.n_samples, 'status': 'skipped', 'wall': None, 'cpu': None,
+                      'py_peak': None, 'rss_peak': None, 'quality': {},
+                      'error': f"Skipped after timeout at {timedOut[group]} points"}
+        else:
+            data = datasets.get((case.generator, case.n_samples))
+            if data is None:
+                # Держим в памяти данные только одного размера
+                datasets = {(case.generator, case.n_samples): generate(case.generator, case.n_samples, random_state)}
+                data = datasets[(case.generator, case.n_samples)]
+            record = run_case(case, *data, timeout, trace_memory, quality_max_points)
+            if record['status'] == 'timeout':
+                timedOut[group] = min(timedOut.get(group, case.n_samples), case.n_samples)
+
+        records.append(record)
+        if on_record is not None:
+            on_record(record)
+
+    return records
+
+
+def environment() -> Dict[str, Any]:
+    """Описание окружения запуска для истории: версии, платформа, коммит git.
+    """
+    import scipy
+    import sklearn
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def append_history(path: str | os.PathLike, records: List[Dict[str, Any]], env: Dict[str, Any]) -> None:
+    """Дописывает записи в файл истории: по строке JSON на случай с описанием окружения.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps({'env': env} | record, ensure_ascii=False, default=float) + '\n')
+
+
+def load_history(path: str | os.PathLike) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_baseline(path: str | os.PathLike, records: List[Dict[str, Any]], env: Dict[str, Any]) -> None:
+    """Сохраняет записи как базовый уровень (файл JSON: окружение и записи по ключу случая).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'env': env, 'records': {r['key']: r for r in records}}, f,
+                  ensure_ascii=False, indent=1, default=float)
+
+
+def load_baseline(path: str | os.PathLike) -> Dict[str, Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['records']
+
+
+@dataclass
+class Regression:
+    """Ухудшение случая относительно базового уровня
+    """
+
+    key: str
+
+    """Что ухудшилось: wall, py_peak, status, качество (ARI) или значение показателя
+    """
+    field: str
+
+    baseline: Any
+    current: Any
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.field} {self.baseline} -> {self.current}"
+
+
+def compare(records: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float = 0.25,
+            min_time: float = 0.05, min_memory: int = 1024 * 1024, quality_tolerance: float = 0.05) -> List[Regression]:
+    """Сравнивает записи с базовым уровнем.
+
+    Регрессией считается: случай перестал выполняться (status не 'ok'); время fit выросло
+    более чем в (1 + tolerance) раз и не меньше чем на min_time; пик памяти tracemalloc
+    вырос так же, но не меньше чем на min_memory; ARI стратегии упал больше чем на
+    quality_tolerance; значение показателя качества изменилось (с точностью 1e-9).
+    Случаи, которых нет в базовом уровне, не сравниваются.
+
+    Возвращает:
+        List[Regression]: Найденные регрессии.
+    """
+    regressions = []
+    for record in records:
+        base = baseline.get(record['key'])
+        if base is None or base['status'] != 'ok':
+            continue
+        if record['status'] != 'ok':
+            regressions.append(Regression(record['key'], 'status', base['status'], record['status']))
+            continue
+
+        if record['wall'] > base['wall'] * (1 + tolerance) and record['wall'] - base['wall'] >= min_time:
+            regressions.append(Regression(record['key'], 'wall', base['wall'], record['wall']))
+        if record['py_peak'] is not None and base['py_peak'] is not None \
+                and record['py_peak'] > base['py_peak'] * (1 + tolerance) \
+                and record['py_peak'] - base['py_peak'] >= min_memory:
+            regressions.append(Regression(record['key'], 'py_peak', base['py_peak'], record['py_peak']))
+
+        if record['kind'] == 'metric':
+            for name, baseValue in base['quality'].items():
+                value = record['quality'].get(name)
+                if value is None or not np.isclose(value, baseValue, rtol=1e-9, atol=0.0):
+                    regressions.append(Regression(record['key'], name, baseValue, value))
+        elif 'ARI' in base['quality'] and record['quality']['ARI'] < base['quality']['ARI'] - quality_tolerance:
+            regressions.append(Regression(record['key'], 'ARI', base['quality']['ARI'], record['quality']['ARI']))
+
+    return regressions
+
+
+def _format_record(record: Dict[str, Any]) -> str:
+    text = f"{record['key']}: {record['status']}"
+    if record['status'] == 'ok':
+        text += f", {record['wall']:.4f} с (CPU {record['cpu']:.4f} с)"
+        if record['py_peak'] is not None:
+            text += f", пик {record['py_peak'] / 1024 / 1024:.1f} МиБ"
+        if record['rss_peak'] is not None:
+            text += f", RSS {record['rss_peak'] / 1024 / 1024:.0f} МиБ"
+        text += ", " + ", ".join(f"{k}={v:.4g}" for k, v in record['quality'].items())
+    elif record['error']:
+        text += f" ({record['error']})"
+    return text
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Тесты производительности стратегий кластеризации и показателей качества")
+    parser.add_argument('-s', '--strategies', nargs='+', default=None, help="идентификаторы стратегий (по умолчанию все)")
+    parser.add_argument('-g', '--generators', nargs='+', default=None, choices=list(GENERATORS), help="генераторы данных")
+    parser.add_argument('-n', '--sizes', nargs='+', type=int, default=None, help="размеры данных для стратегий")
+    parser.add_argument('-m', '--metrics', nargs='*', default=None, help="показатели качества (без значений - не измерять)")
+    parser.add_argument('--metric-sizes', nargs='+', type=int, default=None, help="размеры данных для показателей")
+    parser.add_argument('-t', '--timeout', type=float, default=300.0, help="ограничение времени случая, с")
+    parser.add_argument('--no-trace-memory', action='store_true', help="не измерять пик памяти tracemalloc")
+    parser.add_argument('--history', default='benchmark/history.jsonl', help="файл истории (строки JSON)")
+    parser.add_argument('--baseline', default='benchmark/baseline.json', help="файл базового уровня")
+    parser.add_argument('--save-baseline', action='store_true', help="сохранить результаты как базовый уровень")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="допустимый относительный рост времени и памяти")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.strategies, args.generators, args.sizes, args.metrics, args.metric_sizes)
+    env = environment()
+    records = run_benchmark(cases, args.timeout, not args.no_trace_memory,
+                            on_record=lambda record: print(_format_record(record), flush=True))
+    append_history(args.history, records, env)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, records, env)
+        print(f"Базовый уровень сохранён в {args.baseline}")
+        return 0
+
+    if not Path(args.baseline).exists():
+        print(f"Базовый уровень {args.baseline} не найден, сравнение не выполнено")
+        return 0
+
+    regressions = compare(records, load_baseline(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"РЕГРЕССИЯ {regression}")
+    return 1 if regressions else 0
@@ -0,0 +1,173 @@
+# This Python file uses the following encoding: utf-8
+import multiprocessing
+import os
+import time
+
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Deque, Dict, Tuple
+
+from PySide6.QtCore import (
+    QObject,
+    QTimer,
+    Signal,
+)
+
+from Frameworks_ccore.ClusteringJob import ClusteringJob, ClusteringResult, run_clustering_job
+from Frameworks_ccore.ProgressToken import ProgressToken
+from Frameworks_ccore.ResultCache import ResultCache, fingerprint_array, job_key
+
+# Время на кооперативную отмену до принудительного завершения процесса, с
+CANCEL_GRACE_PERIOD = 1.0
+
+
+def _run_job_process(job: ClusteringJob, conn: Connection, cancel_event) -> None:
+    # Точка входа дочернего процесса: ход выполнения и результат передаются через conn
+    progress = ProgressToken(lambda fraction, message: conn.send(('progress', fraction, message)), cancel_event)
+    result = run_clustering_job(job, progress=progress)
+    conn.send(('result', result))
+    conn.close()
+
+
+@dataclass
+class _RunningJob:
+    process: multiprocessing.Process
+    conn: Connection
+    cancel_event: object
+    key: str | None
+    cancel_deadline: float | None = None
+
+
+class ClusteringEngine(QObject):
+    '''
+        @brief  Параллельное выполнение стратегий кластеризации вне GUI-потока.
+
+        Каждое задание выполняется в отдельном процессе (не более max_workers одновременно),
+        результат передаётся в GUI-поток сигналом resultReady сразу после завершения
+        соответствующего задания, ход выполнения - сигналом progressChanged.
+        Отмена сначала выставляет признак отмены токена (стратегии на Python
+        останавливаются на границе итерации), а по истечении CANCEL_GRACE_PERIOD
+        процесс завершается принудительно - так прерываются стратегии сторонних библиотек.
+        Если задан кэш, повторный запуск с теми же данными и параметрами не отправляется
+        в процесс: результат из кэша передаётся сигналом resultReady сразу.
+    '''
+
+    resultReady = Signal(object)                # ClusteringResult
+    progressChanged = Signal(str, float, str)   # идентификатор стратегии, доля, этап
+
+    def __init__(self, max_workers: int | None = None, cache: ResultCache | None = None, parent=None):
+        super().__init__(parent)
+        self.__max_workers = max_workers or os.cpu_count()
+        self.__mp = multiprocessing.get_context()
+        self.__queue: Deque[Tuple[ClusteringJob, str | None]] = deque()
+        self.__running: Dict[str, _RunningJob] = dict()
+        self.__cache = cache
+        self.__fingerprint = (None, None)  # (данные, отпечаток) последнего задания
+        self.__timer = QTimer(self, interval=50)
+        self.__timer.timeout.connect(self.__poll)
+
+    '''
+        @brief  Постановка задания в очередь. Задания различаются идентификатором стратегии.
+    '''
+
+    def submit(self, job: ClusteringJob) -> None:
+        key = None
+        if self.__cache is not None:
+            # Все стратегии одного запуска получают один массив: хэшируем его один раз
+            if self.__fingerprint[0] is not job.data:
+                self.__fingerprint = (job.data, fingerprint_array(job.data))
+            key = job_key(job, self.__fingerprint[1])
+            result = self.__cache.get(key)
+            if result is not None:
+                self.resultReady.emit(result)
+                return
+
+        self.__queue.append((job, key))
+        self.__startPending()
+
+    '''
+        @brief  Отмена задания стратегии stratId (ожидающего или выполняемого).
+    '''
+
+    def cancel(self, stratId: str) -> None:
+        for item in self.__queue:
+            if item[0].strat_id == stratId:
+                self.__queue.remove(item)
+                self.resultReady.emit(ClusteringResult(stratId, error="Cancelled", cancelled=True))
+                return
+
+        running = self.__running.get(stratId)
+        if running is not None and running.cancel_deadline is None:
+            running.cancel_event.set()
+            running.cancel_deadline = time.monotonic() + CANCEL_GRACE_PERIOD
+
+    def cancelAll(self) -> None:
+        for job, _ in list(self.__queue):
+            self.cancel(job.strat_id)
+        for stratId in list(self.__running):
+            self.cancel(stratId)
+
+    def __startPending(self) -> None:
+        while self.__queue and len(self.__running) < self.__max_workers:
+            job, key = self.__queue.popleft()
+            parentConn, childConn = self.__mp.Pipe(duplex=False)
+            cancelEvent = self.__mp.Event()
+            process = self.__mp.Process(target=_run_job_process, args=(job, childConn, cancelEvent), daemon=True)
+            process.start()
+            childConn.close()
+            self.__running[job.strat_id] = _RunningJob(process, parentConn, cancelEvent, key)
+
+        if self.__running and not self.__timer.isActive():
+            self.__timer.start()
+
+    def __poll(self) -> None:
+        conns = {running.conn: stratId for stratId, running in self.__running.items()}
+        for conn in wait(list(conns), timeout=0):
+            stratId = conns[conn]
+            try:
+                while stratId in self.__running and conn.poll():
+                    message = conn.recv()
+                    if message[0] == 'progress':
+                        self.progressChanged.emit(stratId, message[1], message[2])
+                    else:
+                        self.__finish(stratId, message[1])
+            except (EOFError, OSError):
+                # Процесс завершился, не передав результат (например, аварийно)
+                self.__finish(stratId, ClusteringResult(stratId, error="Process terminated unexpectedly"))
+
+        now = time.monotonic()
+        for stratId, running in list(self.__running.items()):
+            if running.cancel_deadline is not None and now >= running.cancel_deadline:
+                running.process.terminate()
+                self.__finish(stratId, ClusteringResult(stratId, error="Cancelled", cancelled=True))
+
+        self.__startPending()
+        if not self.__running:
+            self.__timer.stop()
+
+    def __finish(self, stratId: str, result: ClusteringResult) -> None:
+        running = self.__running.pop(stratId, None)
+        if running is None:
+            return
+        running.conn.close()
+        running.process.join(timeout=CANCEL_GRACE_PERIOD)
+        if running.process.is_alive():
+            running.process.kill()
+            running.process.join()
+        if running.key is not None and self.__cache is not None:
+            self.__cache.put(running.key, result)
+        self.resultReady.emit(result)
+
+    '''
+        @brief  Остановка всех процессов и очистка очереди.
+    '''
+
+    def shutdown(self) -> None:
+        self.__queue.clear()
+        self.__timer.stop()
+        for running in self.__running.values():
+            running.process.kill()
+            running.process.join()
+            running.conn.close()
+        self.__running.clear()
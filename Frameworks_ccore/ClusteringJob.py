@@ -0,0 +1,178 @@
+# This Python file uses the following encoding: utf-8
+"""
+Описание одного запуска стратегии кластеризации и функция его выполнения.
+
+Модуль не зависит от Qt: функция run_clustering_job выполняется в дочерних
+процессах (см. Frameworks_ccore/ClusteringEngine.py), поэтому задание и
+результат должны сериализоваться через pickle.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from ClusteringMethods.ClasteringAlgorithms import (
+    Context,
+    StrategiesManager,
+    StrategyRunConfig
+)
+from ClusteringMethods.SpatialIndex import SpatialIndex
+from AnalysisMethods.AnalysisAlgorithms import QualityIndices, group_by_label
+from AnalysisMethods.ExternalMetrics import external_scores
+from AnalysisMethods.SampledMetrics import (
+    DEFAULT_SAMPLE_BUDGET,
+    DEFAULT_TIME_BUDGET,
+    MetricEstimate,
+    estimate_quality
+)
+from Frameworks_ccore.ProgressToken import ClusteringCancelled, ProgressToken
+from Frameworks_ccore.RunProfile import PhaseProfile, RunProfiler
+
+
+@dataclass
+class ClusteringJob:
+    """Задание на кластеризацию одной стратегией
+    """
+
+    """Идентификатор стратегии (см. StrategiesManager)
+    """
+    strat_id: str
+
+    """Параметры запуска стратегии
+    """
+    config: StrategyRunConfig
+
+    """Точки в формате (n_features, n_samples) или пиксели изображения
+    """
+    data: np.ndarray
+
+    """Тип кластеризации: 'points' или 'image'
+    """
+    mode: str = 'points'
+
+    """Тип преобразования изображения (индекс acb1_fr3), используется только для 'image'
+    """
+    img_type: int = 0
+
+    """Вычислять ли показатели качества кластеризации
+    """
+    compute_metrics: bool = True
+
+    """Добавлять ли координаты пикселя (x, y) к признакам, используется только для 'image'
+    """
+    with_coords: bool = False
+
+    """Отслеживать ли пик памяти этапов через tracemalloc (замедляет стратегии на Python,
+    поэтому время elapsed измеряется с ним неточно)
+    """
+    trace_memory: bool = False
+
+    """Число пикселей одной выборки для приближённых показателей качества, используется только для 'image'
+    """
+    sample_budget: int = DEFAULT_SAMPLE_BUDGET
+
+    """Время на приближённые показатели качества, с, используется только для 'image'
+    """
+    metrics_time_budget: float = DEFAULT_TIME_BUDGET
+
+    """Эталонные метки точек (например, генератора распределений); если заданы, в metrics
+    добавляются внешние показатели EXTERNAL_METRICS (ARI, NMI, V-мера, чистота)
+    """
+    labels_true: np.ndarray | None = None
+
+
+@dataclass
+class ClusteringResult:
+    """Результат выполнения задания ClusteringJob
+    """
+
+    strat_id: str
+    labels: np.ndarray | None = None
+
+    """Процессорное время работы алгоритма (этап fit), с
+    """
+    elapsed: float = 0.0
+
+    """Показатели качества кластеризации: название -> значение
+    """
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    """Доверительные интервалы приближённых (по выборке) показателей: название -> оценка
+    """
+    metric_estimates: Dict[str, MetricEstimate] = field(default_factory=dict)
+
+    """Текст ошибки, если кластеризация не удалась
+    """
+    error: str | None = None
+
+    """Результат взят из кэша (см. Frameworks_ccore/ResultCache.py)
+    """
+    cached: bool = False
+
+    """Выполнение отменено пользователем
+    """
+    cancelled: bool = False
+
+    """Затраты по этапам запуска (см. Frameworks_ccore/RunProfile.py)
+    """
+    profile: List[PhaseProfile] = field(default_factory=list)
+
+
+def run_clustering_job(job: ClusteringJob, spatial_index: SpatialIndex | None = None,
+                       progress: ProgressToken | None = None) -> ClusteringResult:
+    """Выполняет задание на кластеризацию.
+
+    Аргументы:
+        job (ClusteringJob): Задание на кластеризацию.
+        spatial_index (SpatialIndex, optional): Общий индекс соседей для заданий на одних данных.
+        progress (ProgressToken, optional): Токен хода выполнения и отмены.
+
+    Возвращает:
+        ClusteringResult: Метки, время работы, показатели качества и профиль. Исключения не
+                          пробрасываются, а записываются в поле error.
+    """
+    result = ClusteringResult(job.strat_id)
+
+    strat = StrategiesManager.createStrategyById(job.strat_id)
+    if strat is None:
+        result.error = f"Strategy {job.strat_id} does not exist"
+        return result
+
+    metrics = job.compute_metrics
+    profiler = RunProfiler(job.trace_memory)
+    context = Context(strat, spatial_index, progress and progress.sub(0.0, 0.7 if metrics else 1.0), profiler)
+    try:
+        if job.mode == 'image':
+            labels = context.do_some_clustering_image(job.data, job.config, job.img_type, job.with_coords)
+        else:
+            labels = context.do_some_clustering_points(job.data, job.config)
+        result.labels = np.asarray(labels)
+        result.elapsed = profiler.get('fit').cpu
+
+        # Для изображений точные показатели слишком долги: оценка по выборкам пикселей
+        if metrics and job.mode == 'image':
+            with profiler.phase('metrics'):
+                features = Context.image_features(job.data, job.with_coords)
+                result.metric_estimates = estimate_quality(features, result.labels, job.sample_budget,
+                                                           job.metrics_time_budget, progress and progress.sub(0.7, 1.0))
+                result.metrics = {name: e.value for name, e in result.metric_estimates.items()}
+        elif metrics:
+            with profiler.phase('labels'):
+                C = group_by_label(np.asarray(job.data).transpose(), result.labels)
+            with profiler.phase('metrics'):
+                # Все показатели за один проход по матрице расстояний
+                result.metrics = QualityIndices(C, progress=progress and progress.sub(0.7, 1.0))
+        if job.labels_true is not None:
+            with profiler.phase('external'):
+                result.metrics.update(external_scores(job.labels_true, result.labels))
+    except ClusteringCancelled:
+        result.labels = None
+        result.metrics = dict()
+        result.cancelled = True
+        result.error = "Cancelled"
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    result.profile = profiler.phases
+    return result
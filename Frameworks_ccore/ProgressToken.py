@@ -0,0 +1,118 @@
+# This Python file uses the following encoding: utf-8
+"""
+Токен хода выполнения и отмены для длительных вычислений.
+
+Контекст передаёт токен стратегии (атрибут Strategy.progress), а та - в
+собственные циклы, функции показателей качества и генераторы данных. Код,
+написанный на Python, вызывает report() или check() на границах итераций:
+при запрошенной отмене check() возбуждает ClusteringCancelled. Стратегии на
+основе сторонних библиотек токен не проверяют, их прерывает
+Frameworks_ccore/ClusteringEngine.py завершением процесса.
+
+Модуль не зависит от Qt и сторонних пакетов.
+"""
+
+import threading
+import time
+
+from typing import Callable
+
+
+class ClusteringCancelled(Exception):
+    """Вычисление прервано по запросу отмены.
+    """
+
+
+class ProgressToken:
+    """Признак отмены и получатель сообщений о ходе выполнения.
+
+    Дочерний токен (см. sub) отображает свой ход выполнения [0, 1] на часть
+    шкалы родителя и использует тот же признак отмены.
+    """
+
+    def __init__(self, callback: Callable[[float, str], None] | None = None, cancel_event=None,
+                 min_interval: float = 0.1):
+        """
+        Аргументы:
+            callback (Callable[[float, str], None], optional): Получатель хода выполнения (доля, сообщение).
+            cancel_event (optional): Объект с методами set/is_set (threading.Event или
+                                     multiprocessing.Event для отмены из другого процесса).
+            min_interval (float): Минимальный интервал между вызовами callback, с.
+        """
+        self._event = cancel_event if cancel_event is not None else threading.Event()
+        self._callback = callback
+        self._min_interval = min_interval
+        self._last_time = 0.0
+        self._start, self._stop = 0.0, 1.0
+        self._root = self
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Запрашивает отмену вычисления.
+        """
+        self._event.set()
+
+    def check(self) -> None:
+        """Проверка отмены на границе итерации.
+
+        Исключения:
+            ClusteringCancelled: Отмена запрошена.
+        """
+        if self._event.is_set():
+            raise ClusteringCancelled()
+
+    def report(self, fraction: float, message: str = '') -> None:
+        """Сообщает о ходе выполнения и проверяет отмену.
+
+        Аргументы:
+            fraction (float): Доля выполненной работы от 0 до 1 в шкале этого токена.
+            message (str): Название текущего этапа.
+
+        Исключения:
+            ClusteringCancelled: Отмена запрошена.
+        """
+        self.check()
+        root = self._root
+        if root._callback is None:
+            return
+
+        now = time.monotonic()
+        fraction = min(max(float(fraction), 0.0), 1.0)
+        if fraction < 1.0 and now - root._last_time < root._min_interval:
+            return
+        root._last_time = now
+        root._callback(self._start + (self._stop - self._start) * fraction, message)
+
+    def sub(self, start: float, stop: float) -> 'ProgressToken':
+        """Дочерний токен для этапа, занимающего часть [start, stop] шкалы этого токена.
+        """
+        child = ProgressToken.__new__(ProgressToken)
+        child._event = self._event
+        child._root = self._root
+        width = self._stop - self._start
+        child._start = self._start + width * start
+        child._stop = self._start + width * stop
+        return child
+
+
+def checkpoints(progress: ProgressToken | None, n: int, message: str = '', every: int = 4096):
+    """Перебирает range(n), сообщая о ходе выполнения каждые every итераций.
+
+    Аргументы:
+        progress (ProgressToken, optional): Токен; None - обычный range(n).
+        n (int): Число итераций.
+        message (str): Название этапа.
+        every (int): Период проверки.
+    """
+    if progress is None:
+        yield from range(n)
+        return
+
+    for i in range(n):
+        if i % every == 0:
+            progress.report(i / n, message)
+        yield i
+    progress.report(1.0, message)
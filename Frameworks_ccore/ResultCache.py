@@ -0,0 +1,192 @@
+# This Python file uses the following encoding: utf-8
+"""
+Кэш результатов кластеризации с адресацией по содержимому.
+
+Ключ результата - хэш отпечатка входного массива, идентификатора стратегии и
+фактических значений всех её параметров (включая значения по умолчанию), а
+также режима запуска. Кэш двухуровневый: LRU в памяти процесса и каталог
+файлов .npz на диске, размер которого ограничивается удалением давно не
+использованных записей.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from pathlib import Path
+
+import numpy as np
+
+from AnalysisMethods.SampledMetrics import MetricEstimate
+from Frameworks_ccore.ClusteringJob import ClusteringJob, ClusteringResult
+
+
+def fingerprint_array(data) -> str:
+    """Отпечаток массива: тип, форма и содержимое без копирования непрерывных данных.
+
+    Аргументы:
+        data: np.ndarray или объект, приводимый к нему.
+
+    Возвращает:
+        str: Шестнадцатеричный хэш blake2b.
+    """
+    arr = np.ascontiguousarray(data)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{arr.dtype.str}{arr.shape}".encode())
+    h.update(memoryview(arr.reshape(-1)).cast('B'))
+    return h.hexdigest()
+
+
+def job_key(job: ClusteringJob, fingerprint: str | None = None) -> str:
+    """Ключ кэша для задания на кластеризацию.
+
+    Аргументы:
+        job (ClusteringJob): Задание.
+        fingerprint (str, optional): Заранее вычисленный отпечаток job.data (чтобы не
+                                     хэшировать одни данные для каждой стратегии).
+
+    Возвращает:
+        str: Шестнадцатеричный ключ.
+    """
+    if fingerprint is None:
+        fingerprint = fingerprint_array(job.data)
+
+    description = json.dumps({
+        'strategy': job.strat_id,
+        'params': job.config.values(),
+        'mode': job.mode,
+        'img_type': job.img_type if job.mode == 'image' else 0,
+        'with_coords': job.with_coords if job.mode == 'image' else False,
+        'metrics': job.compute_metrics,
+        'sampling': [job.sample_budget, job.metrics_time_budget] if job.mode == 'image' else None,
+        'data': fingerprint,
+        'labels_true': None if job.labels_true is None else fingerprint_array(job.labels_true),
+    }, sort_keys=True, default=str)
+    return hashlib.blake2b(description.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """Двухуровневый кэш результатов ClusteringResult.
+
+    Кэшируются только успешные результаты (без ошибки). Методы потокобезопасны;
+    несколько процессов могут использовать один каталог: файлы записываются
+    атомарно, а отсутствие удалённого другим процессом файла считается промахом.
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None, max_items: int = 64,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        """
+        Аргументы:
+            directory (str | PathLike, optional): Каталог файлов .npz. None - только память.
+            max_items (int): Число результатов в памяти.
+            max_disk_bytes (int): Предельный суммарный размер файлов в каталоге, байт.
+        """
+        self._memory: OrderedDict[str, ClusteringResult] = OrderedDict()
+        self._max_items = max_items
+        self._max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._directory = None
+        if directory is not None:
+            self._directory = Path(directory)
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def directory(self) -> Path | None:
+        return self._directory
+
+    def get(self, key: str) -> ClusteringResult | None:
+        """Результат по ключу (с признаком cached) или None. Попадание на диск поднимает
+        запись в память.
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                return replace(result, cached=True)
+
+        result = self._load(key)
+        if result is not None:
+            self._remember(key, result)
+            result = replace(result, cached=True)
+        return result
+
+    def put(self, key: str, result: ClusteringResult) -> None:
+        """Сохраняет успешный результат в память и на диск. Профиль этапов не сохраняется:
+        у результата из кэша он описывает только последующие этапы (например, отрисовку).
+        """
+        if result.error is not None or result.labels is None:
+            return
+        result = replace(result, cached=False, profile=[])
+        self._remember(key, result)
+        self._store(key, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._directory is not None:
+            for path in self._directory.glob('*.npz'):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, result: ClusteringResult) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_items:
+                self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.npz"
+
+    def _load(self, key: str) -> ClusteringResult | None:
+        if self._directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path) as npz:
+                meta = json.loads(str(npz['meta']))
+                labels = npz['labels']
+            os.utime(path)      # время доступа для вытеснения давно не использованных
+        except (OSError, KeyError, ValueError):
+            return None
+        estimates = {name: MetricEstimate(**e) for name, e in meta.get('metric_estimates', {}).items()}
+        return ClusteringResult(meta['strat_id'], labels=labels, elapsed=meta['elapsed'],
+                                metrics=meta['metrics'], metric_estimates=estimates)
+
+    def _store(self, key: str, result: ClusteringResult) -> None:
+        if self._directory is None:
+            return
+        meta = json.dumps({'strat_id': result.strat_id, 'elapsed': result.elapsed,
+                           'metrics': result.metrics,
+                           'metric_estimates': {name: asdict(e) for name, e in result.metric_estimates.items()}},
+                          default=float)
+        fd, tmp = tempfile.mkstemp(suffix='.npz', dir=self._directory, prefix='.tmp_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, labels=np.asarray(result.labels), meta=np.array(meta))
+            os.replace(tmp, self._path(key))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._directory.glob('*.npz'):
+            if path.name.startswith('.tmp_'):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self._max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
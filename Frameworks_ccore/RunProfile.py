@@ -0,0 +1,165 @@
+# This Python file uses the following encoding: utf-8
+"""
+Профиль производительности одного запуска кластеризации по этапам.
+
+Для каждого этапа (подготовка данных, обучение, преобразование меток,
+показатели качества, отрисовка) записываются реальное время, процессорное
+время процесса (все потоки, включая BLAS и ccore), пик памяти Python/numpy
+по tracemalloc и резидентная память процесса (RSS). Профиль передаётся в
+ClusteringResult.profile, отображается в таблице результатов окна стратегии
+и выгружается строками JSON (см. append_jsonl).
+
+Модуль не зависит от Qt и сторонних пакетов.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+try:
+    import resource     # нет в Windows
+except ImportError:
+    resource = None
+
+
+"""Названия этапов для отображения пользователю
+"""
+PHASE_TITLES = {
+    'prepare': 'Подготовка данных',
+    'fit': 'Обучение',
+    'labels': 'Преобразование меток',
+    'metrics': 'Показатели качества',
+    'external': 'Внешние показатели',
+    'render': 'Отрисовка',
+}
+
+
+@dataclass
+class PhaseProfile:
+    """Затраты одного этапа запуска
+    """
+
+    """Идентификатор этапа (см. PHASE_TITLES)
+    """
+    name: str
+
+    """Реальное время, с
+    """
+    wall: float = 0.0
+
+    """Процессорное время процесса (все потоки), с
+    """
+    cpu: float = 0.0
+
+    """Пик памяти, выделенной на этапе (tracemalloc), байт. None - не отслеживалось
+    """
+    py_peak: int | None = None
+
+    """Резидентная память процесса на конец этапа, байт. None - недоступно в ОС
+    """
+    rss: int | None = None
+
+    """Наибольшая резидентная память процесса на конец этапа, байт. None - недоступно в ОС
+    """
+    rss_peak: int | None = None
+
+
+class RunProfiler:
+    """Сборщик профиля запуска.
+
+    Этапы не вкладываются друг в друга; повторный этап с тем же именем
+    добавляется к уже записанному (время суммируется, пики - максимум).
+    """
+
+    def __init__(self, trace_memory: bool = False, phases: List[PhaseProfile] | None = None):
+        """
+        Аргументы:
+            trace_memory (bool): Отслеживать ли пик памяти tracemalloc (замедляет код на Python).
+            phases (List[PhaseProfile], optional): Уже записанные этапы, к которым добавляются новые.
+        """
+        self._trace_memory = trace_memory
+        self._phases: Dict[str, PhaseProfile] = {p.name: p for p in phases or []}
+
+    @property
+    def phases(self) -> List[PhaseProfile]:
+        return list(self._phases.values())
+
+    def get(self, name: str) -> PhaseProfile | None:
+        return self._phases.get(name)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Измеряет затраты блока with как этапа name.
+        """
+        started = False
+        if self._trace_memory:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            py_peak = None
+            if self._trace_memory:
+                py_peak = max(tracemalloc.get_traced_memory()[1] - base, 0)
+                if started:
+                    tracemalloc.stop()
+            self._add(PhaseProfile(name, wall, cpu, py_peak, current_rss(), peak_rss()))
+
+    def _add(self, phase: PhaseProfile) -> None:
+        prev = self._phases.get(phase.name)
+        if prev is not None:
+            phase.wall += prev.wall
+            phase.cpu += prev.cpu
+            if prev.py_peak is not None:
+                phase.py_peak = max(phase.py_peak or 0, prev.py_peak)
+        self._phases[phase.name] = phase
+
+
+def current_rss() -> int | None:
+    """Резидентная память процесса, байт (Linux), иначе None.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss() -> int | None:
+    """Наибольшая резидентная память процесса за время его работы, байт, или None.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает килобайты, macOS - байты
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def profile_to_dicts(phases: List[PhaseProfile]) -> List[Dict[str, Any]]:
+    """Профиль в виде списка словарей для JSON.
+    """
+    return [asdict(p) for p in phases]
+
+
+def append_jsonl(path: str | os.PathLike, record: Dict[str, Any]) -> None:
+    """Дописывает запись строкой JSON в конец файла.
+
+    Аргументы:
+        path (str | PathLike): Файл .jsonl, каталог создаётся при необходимости.
+        record (Dict[str, Any]): Запись (например, стратегия, параметры и profile_to_dicts(...)).
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False, default=float) + '\n')
@@ -2,7 +2,7 @@
 import time
 import copy
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
@@ -15,6 +15,7 @@ from PySide6.QtCore import (
     QMargins,
     QSize,
     QPoint,
+    QStandardPaths,
     qDebug
 )
 from PySide6.QtGui import (
@@ -52,13 +53,19 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QTableWidget,
     QTableWidgetItem,
-    QHeaderView
+    QHeaderView,
+    QProgressBar
 )
 
 from Frameworks_ccore.SettingsApp import SettingsApp
 from Frameworks_interface.strategy_options_dialog import StrategyOptionsDialog
 from .ui_form import Ui_MainWindow
 from Frameworks_ccore.Loader import Loader
+from Frameworks_ccore.ClusteringEngine import ClusteringEngine
+from Frameworks_ccore.ResultCache import ResultCache
+from Frameworks_ccore.ClusteringJob import ClusteringJob, ClusteringResult
+from AnalysisMethods.ExternalMetrics import EXTERNAL_METRICS
+from Frameworks_ccore.RunProfile import PHASE_TITLES, PhaseProfile, RunProfiler, append_jsonl, profile_to_dicts
 from .widgets.sliderButton.QSliderButton import QSliderButton
 from .widgets.QSpliter.qspliter import QSpliter
 
@@ -71,7 +78,6 @@ from ClusteringMethods.ClasteringAlgorithms import (
     StrategiesManager,
     StrategyRunConfig
 )
-from AnalysisMethods.AnalysisAlgorithms import DunnIndex, DunnIndexMean, DBi, converter_to_c
 
 import qstylizer.parser     # pip install qstylizer
 import cv2                  # pip install opencv-python
@@ -217,6 +223,18 @@ class MainWindow(QMainWindow):
         self.dialog: SettingsApp | None = None
         # Хранилище опций стратегий
         self.__strategiesConfigs: Dict[str, StrategyRunConfig] = dict()
+        # Пул процессов для выполнения стратегий вне GUI-потока с кэшем результатов
+        cacheDir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+        self.__clusteringEngine = ClusteringEngine(
+            cache=ResultCache(os.path.join(cacheDir, 'results') if cacheDir else None), parent=self)
+        self.__clusteringEngine.resultReady.connect(self.__show_clustering_result)
+        self.__clusteringEngine.progressChanged.connect(self.__show_clustering_progress)
+        # Стратегии текущего запуска, результат которых ещё не получен, и данные запуска
+        self.__pendingStrategies: Set[str] = set()
+        self.__clusteringRun: Dict[str, Any] = dict()
+        # Профили запусков по этапам (строки JSON)
+        dataDir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        self.__profileLog = os.path.join(dataDir, 'profile.jsonl') if dataDir else None
         # Позиция перемещения курсора мышки при изменении размеров окна.
         self.setProperty('dragPos', None)
         # Флаг переключения подокон в левом окне.
@@ -331,11 +349,17 @@ class MainWindow(QMainWindow):
             genDockWidget(cnv11_wg.layout(), 1, 0, 1, 1, 1, fg1)
             genDockWidget(cnv11_wg.layout(), 1, 1, 1, 1, 2, fg2)
 
+            # Ход выполнения и отмена стратегии
+            stratId = subwin_id.removeprefix("sub_")
+            cnv11_wg.layout().addWidget(QProgressBar(objectName='spb', visible=False, textVisible=True), 2, 0)
+            cnv11_wg.layout().addWidget(QPushButton('Отмена', objectName='sbc', visible=False,
+                                                    clicked=lambda status: self.__clusteringEngine.cancel(stratId)), 2, 1)
+
             # Кнопки под результатами
             label = QLabel('Ок', styleSheet='QLabel {color: green; }', visible=False)
             spl1 = QSpliter('Параметры', subwin)
             grid = QGridLayout()
-            table = QTableWidget(rowCount=4, columnCount=2, objectName='stw',
+            table = QTableWidget(rowCount=9, columnCount=2, objectName='stw',
                                   minimumSize=QSize(250, 50), horizontalHeaderLabels=["Параметр", "Значение"])
             table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
             table.setItem(0, 0, QTableWidgetItem('Время работы алгоритма'))
@@ -343,7 +367,21 @@ class MainWindow(QMainWindow):
                                              toolTip='Минимальное расстояние между кластерами'))
             table.setCellWidget(2, 0, QLabel('Показатель DunnIndexMean',
                                              toolTip='Минимальное среднее расстояние между кластерами'))
-            table.setCellWidget(3, 0, QLabel('Показатель DBi', toolTip='...'))
+            table.setCellWidget(3, 0, QLabel('Показатель DBi',
+                                             toolTip='Индекс Дэвиса-Болдина: чем меньше, тем лучше разбиение'))
+            table.setCellWidget(4, 0, QLabel('Показатель Silhouette',
+                                             toolTip='Средний силуэт от -1 до 1: чем больше, тем лучше разбиение'))
+            # Внешние показатели: только при эталонной разметке (метки генератора распределений)
+            table.setCellWidget(5, 0, QLabel('Показатель ARI',
+                                             toolTip='Скорректированный индекс Рэнда: 1 - совпадение с эталонной разметкой, около 0 - случайное'))
+            table.setCellWidget(6, 0, QLabel('Показатель NMI',
+                                             toolTip='Нормированная взаимная информация с эталонной разметкой от 0 до 1'))
+            table.setCellWidget(7, 0, QLabel('Показатель V-мера',
+                                             toolTip='Среднее гармоническое однородности и полноты от 0 до 1'))
+            table.setCellWidget(8, 0, QLabel('Показатель чистоты',
+                                             toolTip='Доля точек из преобладающего эталонного класса своего кластера'))
+            for row in range(5, 9):
+                table.setRowHidden(row, True)
             table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
             genDockWidget(grid, 0, 0, 5, 1, 3, table)
             spl1.setContentLayout(grid)
@@ -913,6 +951,7 @@ class MainWindow(QMainWindow):
         cnv1_ax.figure.add_subplot(1, 1, 1)
         cnv2_ax.figure.add_subplot(projection="3d")
         Data = [[], [], []]
+        Labels = []     # Эталонные метки точек Data (метки генераторов)
         for row in range(table.rowCount()):
             param = table.cellWidget(row, 0).currentText()
             n_samples = int((table.item(row, 1).text().isdigit()) and (
@@ -1015,7 +1054,14 @@ class MainWindow(QMainWindow):
                 Data[0] = data_image1
                 Data[1] = data_image2
                 Data[2] = data_image3
+            # Метки следующей строки таблицы продолжают нумерацию, если её точки добавлены к Data
+            row_labels = np.ravel(labels).astype(int)
+            if len(Data[0]) == len(Labels) + len(row_labels):
+                Labels += (row_labels + (max(Labels) + 1 if Labels else 0)).tolist()
+            else:
+                Labels = row_labels.tolist()
         self.setProperty('Data', Data)
+        self.setProperty('Labels', Labels if len(Labels) == len(Data[0]) else None)
         cnv1_ax.figure.savefig('image2D.png')
         cnv2_ax.figure.savefig('image3D.png')
         with open('dataPoints.csv', 'w', newline='', encoding='utf-8') as myfile:
@@ -1025,7 +1071,7 @@ class MainWindow(QMainWindow):
         with open('dataLabels.csv', 'w', newline='', encoding='utf-8') as myfile:
             writer = csv.writer(myfile, dialect='excel', delimiter=";",
                                 quoting=csv.QUOTE_ALL)  # quoting=csv.QUOTE_ALL
-            writer.writerow(labels)  # writer.writerows(data)
+            writer.writerow(Labels)  # writer.writerows(data)
             lb_res.setVisible(True)
             wg.setEnabled(True)
             self.button_start.setEnabled(True)
@@ -1178,6 +1224,7 @@ class MainWindow(QMainWindow):
                     data_image1, data_image2, data_image3, c='r')
                 cnv2_ax.draw()
             self.setProperty('Data', Data)
+            self.setProperty('Labels', None)    # Точки заданы вручную: эталонных меток нет
             with open('dataPoints.csv', 'w', newline='', encoding='utf-8') as myfile:
                 writer = csv.writer(myfile, dialect='excel', delimiter=";",
                                     quoting=csv.QUOTE_ALL)  # quoting=csv.QUOTE_ALL
@@ -1193,13 +1240,15 @@ class MainWindow(QMainWindow):
 
     '''
         @brief  Кластеризация данных.
+
+        Отмеченные стратегии отправляются в пул процессов ClusteringEngine и выполняются
+        параллельно; результат каждой стратегии отображается в её подокне сразу после
+        завершения (см. __show_clustering_result).
     '''
 
     def clickStartClustering(self):
         rowCount = self.__algorithm_parameters_table.rowCount()
 
-        context: Context|None = None
-
         # Находим нужные виджеты для определения типа кластеризации
         # TODO: Найти где они создаются и добавить как переменную у класса окна, чтобы вот так не
         #       искать
@@ -1217,6 +1266,45 @@ class MainWindow(QMainWindow):
         frame3: QFrame = grid.parentWidget().findChild(
             QFrame, 'frame3')
 
+        # Подготавливаем данные один раз для всех стратегий
+        if rb1_fr2.isChecked(): # Кластеризация точек
+            # Генерация распределений или Генерация изображений 
+            if not (srb2_fr1.isChecked() or srb1_fr1.isChecked()):
+                return
+            Data: List[List[float]] | List[float] = self.property('Data')  # Получение данных
+            mode, data, image, imgType = 'points', np.array(Data, dtype=float), None, 0
+            # Эталонные метки генератора: внешние показатели (ARI, NMI, ...) в таблице результатов
+            labels_true = self.property('Labels')
+            if labels_true is not None and len(labels_true) != data.shape[-1]:
+                labels_true = None
+        else: # Кластеризация изображений
+            acb1_fr3: QComboBox = frame3.findChild(QComboBox, 'acb1_fr3')
+            le1_fr2: QLineEdit = self.widget1.findChild(QLineEdit, 'le1_fr2')
+            image_path = le1_fr2.text()
+
+            imgType = acb1_fr3.currentIndex()
+            if imgType > 0:
+                image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
+
+            match imgType:
+                # Преобразуем пиксели фотографии в преобразуемые данные
+                case 0:  # None
+                    image = Image.open(image_path)
+                    image = np.array(image)
+                    pixels = image.reshape((-1, 3))
+                case 1:  # HSV
+                    pixels = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+                case 2:  # HLS
+                    pixels = cv2.cvtColor(image, cv2.COLOR_BGR2HLS)
+                case 3:  # YUV
+                    pixels = cv2.cvtColor(image, cv2.COLOR_BGR2YUV)
+                case _:
+                    return
+            mode, data, labels_true = 'image', pixels, None
+
+        self.__clusteringRun = {'mode': mode, 'data': data, 'image': image}
+        self.__pendingStrategies.clear()
+
         # Перебираем все обнаруженные методы кластеризации
         for idx in range(rowCount):
             checkBox: QCheckBox = self.__algorithm_parameters_table.cellWidget(idx, 0)
@@ -1229,142 +1317,188 @@ class MainWindow(QMainWindow):
             self._mdiarea.findChild(
                 QMdiSubWindow, "sub_" + stratId).setVisible(True)
 
-            strat = StrategiesManager.createStrategyById(stratId)
-            if strat is None:
+            if stratId not in StrategiesManager.strategies():
                 qDebug(f"Tried to make strategy {stratId}, but it does not exist")
                 continue
 
-            if context is None:
-                context = Context(strat)
-            else:
-                context.strategy = strat
-
-            # Сгенерировать и кластеризовать данные
-            if rb1_fr2.isChecked(): # Кластеризация точек
-                # Генерация распределений или Генерация изображений 
-                if srb2_fr1.isChecked() or srb1_fr1.isChecked():
-                    Data: List[List[float]] | List[float] = self.property('Data')  # Получение данных
-
-                    # Подокно с результатми
-                    qmv: QMdiSubWindow = self._mdiarea.findChild(QMdiSubWindow, "sub_" + stratId)
-                    qmv.setVisible(True)
-
-                    # Вычисляем
-                    tic = time.process_time()
-                    labels = context.do_some_clustering_points(
-                        Data, self.__strategiesConfigs[stratId])
-                    toc = time.process_time()
-                    elapsed = toc - tic
-
-                    # Отображаем полученные данные
-                    spl: QSpliter = qmv.layout().itemAt(1).widget()
-                    qmvv: QMainWindow = spl.layoutContentArea().itemAt(0).widget()
-                    tw: QTableWidget = qmvv.findChild(QTableWidget, 'stw')
-                    tw.setItem(0, 1, QTableWidgetItem(str(elapsed)))
-                    C = converter_to_c(
-                        np.array(Data).transpose().tolist(), labels)
-                    dunn = DunnIndex(C)
-                    tw.setItem(1, 1, QTableWidgetItem(str(dunn)))
-                    dunnMean = DunnIndexMean(C)
-                    tw.setItem(2, 1, QTableWidgetItem(str(dunnMean)))
-
-                    subWinBody: QWidget = self._mdiarea.findChild(QWidget, 'sub_' + stratId + '_cnv')
-                    cnv11: FigureCanvasQTAgg = subWinBody \
-                        .layout().itemAtPosition(1, 0).widget().findChild(QDockWidget, 'dw1') \
-                        .widget().layout().itemAtPosition(0, 0).widget()
-                    qmv1 = subWinBody.layout().itemAtPosition(1, 1).widget()
-                    cnv12: FigureCanvasQTAgg = qmv1.findChild(QDockWidget, 'dw2') \
-                        .widget().layout().itemAtPosition(0, 0).widget()
-                    cnv11.figure.clear()
-                    cnv11.figure.add_subplot(1, 1, 1)
-                    cnv11.figure.axes[0].scatter(Data[0], Data[1], c=labels,
-                                                    # c=scatter.cmap(0.7) # jet
-                                                    cmap="rainbow")
-                    cnv11.draw()
-                    qmv1.setVisible(True)
-                    cnv12.figure.clear()
-                    cnv12.figure.add_subplot(projection="3d")
-                    cnv12.figure.axes[0].scatter(
-                        Data[0], Data[1], Data[2], c=labels, cmap="rainbow")
-                    cnv12.draw()
-
-            else: # Кластеризация изображений
-                acb1_fr3: QComboBox = frame3.findChild(QComboBox, 'acb1_fr3')
-                le1_fr2: QLineEdit = self.widget1.findChild(QLineEdit, 'le1_fr2')
-                image_path = le1_fr2.text()
-
-                imgType = acb1_fr3.currentIndex()
-                if imgType > 0:
-                    image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
-
-                match imgType:
-                    # Преобразуем пиксели фотографии в преобразуемые данные
-                    case 0:  # None
-                        image = Image.open(image_path)
-                        image = np.array(image)
-                        pixels = image.reshape((-1, 3))
-                    case 1:  # HSV
-                        pixels = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-                    case 2:  # HLS
-                        pixels = cv2.cvtColor(image, cv2.COLOR_BGR2HLS)
-                    case 3:  # YUV
-                        pixels = cv2.cvtColor(image, cv2.COLOR_BGR2YUV)
-                    case _:
-                        continue
-
-                # Вычисляем
-                labels = None
-
-                try:
-                    tic = time.process_time()
-                    labels = context.do_some_clustering_image(
-                        pixels, self.__strategiesConfigs[stratId], imgType)
-                    toc = time.process_time()
-                    clustered_image = labels.reshape(image.shape[:2])
-                    elapsed = toc - tic
-                except:
-                    self.statusBar().showMessage(
-                        f'При данных параметрах кластеризация {StrategiesManager.strategies()[stratId].name} не возможна!')
-                    continue
+            self.__pendingStrategies.add(stratId)
+            self.__set_progress_visible(stratId, True)
+            self.__clusteringEngine.submit(ClusteringJob(
+                stratId, copy.copy(self.__strategiesConfigs[stratId]), data, mode, imgType,
+                labels_true=None if labels_true is None else np.asarray(labels_true)))
 
-                # Отображаем
-                qmv: QMdiSubWindow = self._mdiarea.findChild(
-                    QMdiSubWindow, "sub_" + stratId)
-                spl: QSpliter = qmv.layout().itemAt(1).widget()
-                qmvv: QMainWindow = spl.layoutContentArea().itemAt(0).widget()
-                tw: QTableWidget = qmvv.findChild(QTableWidget, 'stw')
-                tw.setItem(0, 1, QTableWidgetItem(str(elapsed)))
-                # C = converter_to_c(pixels.tolist(), labels)    # Оценка изображений отключена
-                # из-за слишком долгого времени расчета.
-                # dunn = DunnIndex(C) # Медленная
-                # tw.setItem(1, 1, QTableWidgetItem(str(dunn)))
-                # dunnMean = DunnIndexMean(C)
-                # tw.setItem(2, 1, QTableWidgetItem(str(dunnMean)))
-                # dbi = DBi(C, 0, 1, 1, 1)
-                # tw.setItem(3, 1, QTableWidgetItem(str(dbi)))
-                subWinBody = self._mdiarea.findChild(QWidget, "sub_" + stratId + "_cnv")
-
-                cnv11: FigureCanvasQTAgg = subWinBody \
-                    .layout().itemAtPosition(1, 0).widget().findChild(QDockWidget, 'dw1') \
-                    .widget().layout().itemAtPosition(0, 0).widget()
-                qmv1 = subWinBody \
-                    .layout().itemAtPosition(1, 1).widget()
-                cnv12: FigureCanvasQTAgg = qmv1.findChild(QDockWidget, 'dw2') \
-                    .widget().layout().itemAtPosition(0, 0).widget()
-                cnv11.figure.clear()
-                cnv11.figure.add_subplot(1, 1, 1)
-                cnv11.figure.axes[0].imshow(image)
-                cnv11.draw()
-                qmv1.setVisible(True)
-                cnv12.figure.clear()
-                cnv12.figure.add_subplot(1, 1, 1)
-                cnv12.figure.axes[0].imshow(clustered_image)
-                cnv12.draw()
+        if len(self.__pendingStrategies) > 0:
+            self.button_start.setEnabled(False)
+            self.statusBar().showMessage(f'Выполняется кластеризация ({len(self.__pendingStrategies)})...')
 
-            self.statusBar().showMessage('Кластеризация успешно проведена!')
-        
         self._mdiarea.tileSubWindows()
 
+    '''
+        @brief  Отображение результата одной стратегии в её подокне (вызывается в GUI-потоке).
+    '''
+
+    def __show_clustering_result(self, result: ClusteringResult):
+        stratId = result.strat_id
+        if stratId not in self.__pendingStrategies:
+            return
+        self.__pendingStrategies.discard(stratId)
+        self.__set_progress_visible(stratId, False)
+
+        if len(self.__pendingStrategies) == 0:
+            self.button_start.setEnabled(True)
+
+        if result.cancelled:
+            self.statusBar().showMessage(
+                f'Кластеризация {StrategiesManager.strategies()[stratId].name} отменена')
+            return
+
+        if result.labels is None:
+            self.statusBar().showMessage(
+                f'При данных параметрах кластеризация {StrategiesManager.strategies()[stratId].name} не возможна!')
+            return
+
+        labels = result.labels
+        run = self.__clusteringRun
+
+        # Подокно с результатми
+        qmv: QMdiSubWindow = self._mdiarea.findChild(QMdiSubWindow, "sub_" + stratId)
+        qmv.setVisible(True)
+        spl: QSpliter = qmv.layout().itemAt(1).widget()
+        qmvv: QMainWindow = spl.layoutContentArea().itemAt(0).widget()
+        tw: QTableWidget = qmvv.findChild(QTableWidget, 'stw')
+        tw.setItem(0, 1, QTableWidgetItem(str(result.elapsed)))
+        for row, name in enumerate(('DunnIndex', 'DunnIndexMean', 'DaviesBouldinIndex', 'Silhouette'), 1):
+            if name in result.metrics:
+                tw.setItem(row, 1, self.__metric_item(result, name))
+        for row, name in enumerate(EXTERNAL_METRICS, 5):
+            tw.setRowHidden(row, name not in result.metrics)
+            if name in result.metrics:
+                tw.setItem(row, 1, QTableWidgetItem(str(result.metrics[name])))
+
+        profiler = RunProfiler(phases=result.profile)
+        with profiler.phase('render'):
+            self.__draw_clustering_result(stratId, labels, run)
+        self.__show_profile(tw, profiler.phases)
+        if self.__profileLog is not None:
+            append_jsonl(self.__profileLog, {
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'strategy': stratId, 'mode': run['mode'],
+                'params': self.__strategiesConfigs[stratId].values() if stratId in self.__strategiesConfigs else None,
+                'cached': result.cached, 'elapsed': result.elapsed, 'profile': profile_to_dicts(profiler.phases)})
+
+        if result.error is not None:
+            self.statusBar().showMessage(
+                f'{StrategiesManager.strategies()[stratId].name}: не удалось вычислить показатели качества ({result.error})')
+        elif len(self.__pendingStrategies) == 0:
+            self.statusBar().showMessage('Кластеризация успешно проведена!')
+        else:
+            self.statusBar().showMessage(f'Выполняется кластеризация ({len(self.__pendingStrategies)})...')
+
+    '''
+        @brief  Отрисовка меток стратегии stratId на холстах её подокна.
+    '''
+
+    def __draw_clustering_result(self, stratId: str, labels: np.ndarray, run: Dict[str, Any]):
+        subWinBody: QWidget = self._mdiarea.findChild(QWidget, 'sub_' + stratId + '_cnv')
+        cnv11: FigureCanvasQTAgg = subWinBody \
+            .layout().itemAtPosition(1, 0).widget().findChild(QDockWidget, 'dw1') \
+            .widget().layout().itemAtPosition(0, 0).widget()
+        qmv1 = subWinBody.layout().itemAtPosition(1, 1).widget()
+        cnv12: FigureCanvasQTAgg = qmv1.findChild(QDockWidget, 'dw2') \
+            .widget().layout().itemAtPosition(0, 0).widget()
+
+        if run['mode'] == 'points':
+            Data = run['data']
+            cnv11.figure.clear()
+            cnv11.figure.add_subplot(1, 1, 1)
+            cnv11.figure.axes[0].scatter(Data[0], Data[1], c=labels,
+                                            # c=scatter.cmap(0.7) # jet
+                                            cmap="rainbow")
+            cnv11.draw()
+            qmv1.setVisible(True)
+            cnv12.figure.clear()
+            cnv12.figure.add_subplot(projection="3d")
+            cnv12.figure.axes[0].scatter(
+                Data[0], Data[1], Data[2], c=labels, cmap="rainbow")
+            cnv12.draw()
+        else:
+            image = run['image']
+            clustered_image = Context.paint_labels(labels, image.shape)
+            cnv11.figure.clear()
+            cnv11.figure.add_subplot(1, 1, 1)
+            cnv11.figure.axes[0].imshow(image)
+            cnv11.draw()
+            qmv1.setVisible(True)
+            cnv12.figure.clear()
+            cnv12.figure.add_subplot(1, 1, 1)
+            cnv12.figure.axes[0].imshow(clustered_image)
+            cnv12.draw()
+
+    '''
+        @brief  Ячейка показателя качества. Приближённое (по выборке) значение
+                выводится с доверительным интервалом.
+    '''
+
+    @staticmethod
+    def __metric_item(result: ClusteringResult, name: str) -> QTableWidgetItem:
+        estimate = result.metric_estimates.get(name)
+        if estimate is None or not estimate.approximate:
+            return QTableWidgetItem(str(result.metrics[name]))
+        item = QTableWidgetItem(f'≈ {estimate.value:.4g} [{estimate.low:.4g}; {estimate.high:.4g}]')
+        interval = 'размах значений' if estimate.confidence is None \
+            else f'доверительный интервал {estimate.confidence:.0%}'
+        item.setToolTip(f'Приближённо: {estimate.replicates} выборок по {estimate.sample_size} точек, {interval}')
+        return item
+
+    '''
+        @brief  Вывод профиля запуска по этапам в строки таблицы результатов после показателей качества.
+    '''
+
+    def __show_profile(self, tw: QTableWidget, phases: List[PhaseProfile]):
+        mib = 1024 * 1024
+        tw.setRowCount(9 + len(phases))
+        for row, phase in enumerate(phases, 9):
+            text = f'{phase.wall:.4f} с, CPU {phase.cpu:.4f} с'
+            if phase.py_peak is not None:
+                text += f', пик {phase.py_peak / mib:.1f} МиБ'
+            if phase.rss_peak is not None:
+                text += f', RSS {phase.rss_peak / mib:.0f} МиБ'
+            tw.setItem(row, 0, QTableWidgetItem(f'Этап: {PHASE_TITLES.get(phase.name, phase.name)}'))
+            tw.setItem(row, 1, QTableWidgetItem(text))
+
+    '''
+        @brief  Показ и скрытие индикатора хода выполнения и кнопки отмены в подокне стратегии.
+    '''
+
+    def __set_progress_visible(self, stratId: str, visible: bool):
+        subWinBody: QWidget = self._mdiarea.findChild(QWidget, 'sub_' + stratId + '_cnv')
+        progressBar: QProgressBar = subWinBody.findChild(QProgressBar, 'spb')
+        # До первого сообщения о ходе выполнения индикатор "занят" (стратегии сторонних библиотек)
+        progressBar.setRange(0, 0)
+        progressBar.setFormat('%p%')
+        progressBar.setVisible(visible)
+        subWinBody.findChild(QPushButton, 'sbc').setVisible(visible)
+
+    '''
+        @brief  Отображение хода выполнения стратегии (вызывается в GUI-потоке).
+    '''
+
+    def __show_clustering_progress(self, stratId: str, fraction: float, message: str):
+        if stratId not in self.__pendingStrategies:
+            return
+        subWinBody: QWidget = self._mdiarea.findChild(QWidget, 'sub_' + stratId + '_cnv')
+        progressBar: QProgressBar = subWinBody.findChild(QProgressBar, 'spb')
+        progressBar.setRange(0, 100)
+        progressBar.setValue(int(fraction * 100))
+        progressBar.setFormat(f'{message} %p%' if message else '%p%')
+
+    '''
+        @brief  Остановка процессов кластеризации при закрытии окна.
+    '''
+
+    def closeEvent(self, event):
+        self.__clusteringEngine.shutdown()
+        super().closeEvent(event)
+
     '''
         @brief  Загрузка изображений.
     '''
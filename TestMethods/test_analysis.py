@@ -0,0 +1,401 @@
+"""
+Тестовый скрипт для проверки показателей качества кластеризации (AnalysisMethods/AnalysisAlgorithms.py)
+
+Описание:
+Скрипт сравнивает векторизованные функции индекса Данна с попарным
+перебором точек (исходной реализацией) на разных наборах данных: результаты
+должны совпадать точно, включая повторяющиеся точки и равные расстояния.
+Индекс Дэвиса-Болдина сравнивается с перебором и sklearn с точностью до округления.
+Для других метрик расстояния показатели сравниваются с полной матрицей cdist.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+from scipy.spatial import distance
+from sklearn.datasets import make_blobs, make_moons
+from sklearn.metrics import davies_bouldin_score, silhouette_samples, silhouette_score
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from AnalysisMethods.AnalysisAlgorithms import (
+    DBi,
+    DaviesBouldinIndex,
+    DunnIndex,
+    DunnIndexMean,
+    MaxIntraCluster,
+    MeanInterclusterDistance,
+    MinInterCluster,
+    QUALITY_INDICES,
+    QualityIndices,
+    SilhouetteSamples,
+    SilhouetteScore,
+    converter_to_c,
+    group_by_label
+)
+from AnalysisMethods.DistanceMetrics import get_metric, minkowski
+
+# ============================================================================
+# ЭТАЛОННАЯ РЕАЛИЗАЦИЯ (попарный перебор)
+# ============================================================================
+
+def reference_converter(points, labels):
+    # Прежний converter_to_c: поточечное добавление в списки
+    label_to_index = {label: idx for idx, label in enumerate(np.unique(labels))}
+    C = [[] for _ in label_to_index]
+    for index, label in enumerate(labels):
+        C[label_to_index[label]].append(points[index])
+    return [np.array(cluster) for cluster in C]
+
+
+def reference_min_inter(C, i, j):
+    mind = 100000
+    for i1 in C[i]:
+        for j1 in C[j]:
+            temp = distance.euclidean(i1, j1)
+            if temp < mind:
+                mind = temp
+    return mind
+
+
+def reference_max_intra(C, i):
+    if len(C[i]) <= 1:
+        return 0
+    maxd = 0
+    for idx1 in range(len(C[i])):
+        for idx2 in range(idx1 + 1, len(C[i])):
+            temp = distance.euclidean(C[i][idx1], C[i][idx2])
+            if temp > maxd:
+                maxd = temp
+    return maxd
+
+
+def reference_dunn(C):
+    mind = 100000
+    maxd = 0
+    for i in range(len(C)):
+        for j in range(i + 1, len(C)):
+            mind = min(mind, reference_min_inter(C, i, j))
+    for i in range(len(C)):
+        maxd = max(maxd, reference_max_intra(C, i))
+    return mind / maxd
+
+
+def reference_mean_inter(C, i, j):
+    total = 0
+    for i1 in C[i]:
+        for j1 in C[j]:
+            total += distance.euclidean(i1, j1)
+    return total * (1 / (len(C[i]) * len(C[j])))
+
+
+def reference_normp(p, u, v):
+    total = 0
+    for i in range(len(u)):
+        total += abs(u[i] - v[i]) ** p
+    return total ** (1 / p)
+
+
+def reference_scatter(cluster, p, q):
+    centroid = [sum(point[d] for point in cluster) / len(cluster) for d in range(len(cluster[0]))]
+    total = sum(reference_normp(p, point, centroid) ** q for point in cluster)
+    return (total / len(cluster)) ** (1 / q), centroid
+
+
+def reference_davies_bouldin(C, p, q):
+    scatter = [reference_scatter(cluster, p, q) for cluster in C]
+    total = 0
+    for i in range(len(C)):
+        total += max((scatter[i][0] + scatter[j][0]) / reference_normp(p, scatter[i][1], scatter[j][1])
+                     for j in range(len(C)) if j != i)
+    return total / len(C)
+
+
+def datasets():
+    rng = np.random.default_rng(0)
+    X, y = make_blobs(n_samples=300, centers=4, n_features=2, random_state=0)
+    yield "blobs 2D", X, y
+    X, y = make_blobs(n_samples=300, centers=3, n_features=3, random_state=1)
+    yield "blobs 3D", X, y
+    X, y = make_blobs(n_samples=200, centers=3, n_features=5, random_state=2)
+    yield "blobs 5D", X, y
+    X, y = make_moons(n_samples=300, noise=0.05, random_state=0)
+    yield "moons", X, y
+    yield "1D", rng.normal(size=(100, 1)), rng.integers(0, 3, 100)
+    # Целочисленная решётка: много равных расстояний и точки на гранях оболочки
+    grid = np.array([(x, y) for x in range(12) for y in range(12)], dtype=float)
+    yield "grid", grid, (grid[:, 0] > 5).astype(int) + 2 * (grid[:, 1] > 7)
+    # Повторяющиеся точки в разных кластерах и плоские 3D-данные
+    X = np.round(rng.normal(size=(200, 3)), 1)
+    X[:, 2] = 1.0
+    yield "duplicates, flat 3D", X, rng.integers(-1, 4, 200)
+    yield "single points", rng.normal(size=(5, 2)), np.arange(5)
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_dunn_identical():
+    print("="*80)
+    print("ТЕСТ 1: Совпадение с попарным перебором")
+    print("="*80)
+
+    for name, X, y in datasets():
+        C = converter_to_c(X, y)
+        for i in range(len(C)):
+            assert MaxIntraCluster(C, i) == reference_max_intra(C, i), name
+            for j in range(i + 1, len(C)):
+                assert MinInterCluster(C, i, j) == reference_min_inter(C, i, j), name
+        try:
+            expected = reference_dunn(C)
+        except ZeroDivisionError:
+            # Все кластеры из одной точки: как и прежде, деление на нулевой диаметр
+            try:
+                DunnIndex(C)
+            except ZeroDivisionError:
+                print(f"  {name}: ZeroDivisionError")
+                continue
+            raise AssertionError(name)
+        assert DunnIndex(C) == expected, name
+        print(f"  {name}: DunnIndex = {expected}")
+    print("✅ Результаты совпадают точно\n")
+
+
+def test_dunn_large():
+    print("="*80)
+    print("ТЕСТ 2: Большие данные")
+    print("="*80)
+
+    X, y = make_blobs(n_samples=200000, centers=5, n_features=3, random_state=0)
+    C = converter_to_c(X, y)
+    value = DunnIndex(C)
+    assert 0 < value < 1
+    print(f"✅ DunnIndex для 200000 точек: {value}\n")
+
+
+def test_mean_inter_blocked():
+    print("="*80)
+    print("ТЕСТ 3: Среднее межкластерное расстояние по блокам")
+    print("="*80)
+
+    for name, X, y in datasets():
+        C = converter_to_c(X, y)
+        for i in range(len(C)):
+            for j in range(i + 1, len(C)):
+                expected = reference_mean_inter(C, i, j)
+                # 256 байт - блоки по 32 расстояния, много заданий в пуле потоков
+                for block_bytes, n_jobs in ((64 << 20, None), (256, 1), (256, 4)):
+                    value = MeanInterclusterDistance(C, i, j, block_bytes=block_bytes, n_jobs=n_jobs)
+                    assert np.isclose(value, expected, rtol=1e-12, atol=0), name
+        if max(len(c) for c in C) > 1:
+            value = DunnIndexMean(C, block_bytes=256, n_jobs=3)
+            # Суммы блоков складываются math.fsum: порядок потоков не влияет на результат
+            assert value == DunnIndexMean(C, block_bytes=256, n_jobs=3), name
+            assert np.isclose(value, DunnIndexMean(C), rtol=1e-12, atol=0), name
+            print(f"  {name}: DunnIndexMean = {value}")
+    print("✅ Результаты совпадают с попарным перебором\n")
+
+
+def test_group_by_label():
+    print("="*80)
+    print("ТЕСТ 4: Группировка точек по меткам")
+    print("="*80)
+
+    for name, X, y in datasets():
+        C = group_by_label(X, y)
+        expected = reference_converter(X, y)
+        assert len(C) == len(expected), name
+        for i, cluster in enumerate(C):
+            assert np.array_equal(cluster, expected[i]), name
+            assert cluster.base is C.points, name
+            assert np.array_equal(X[C.indices(i)], cluster), name
+        assert list(C.sizes) == [len(c) for c in expected], name
+        if max(C.sizes) > 1:
+            assert DunnIndex(C) == DunnIndex(expected), name
+            assert DunnIndexMean(C) == DunnIndexMean(expected), name
+        print(f"  {name}: {len(C)} кластеров")
+    print("✅ Кластеры совпадают с поточечной группировкой\n")
+
+
+def test_davies_bouldin():
+    print("="*80)
+    print("ТЕСТ 5: Индекс Дэвиса-Болдина")
+    print("="*80)
+
+    for name, X, y in datasets():
+        if len(np.unique(y)) < 2 or name == "single points":
+            continue
+        C = group_by_label(X.reshape(len(X), -1), y)
+        for p, q in ((2, 1), (1, 1), (3, 2)):
+            expected = reference_davies_bouldin(C, p, q)
+            assert np.isclose(DaviesBouldinIndex(C, p, q), expected, rtol=1e-9), name
+            assert np.isclose(DaviesBouldinIndex(list(C), p, q), expected, rtol=1e-9), name
+        assert np.isclose(DaviesBouldinIndex(C), davies_bouldin_score(X.reshape(len(X), -1), y), rtol=1e-9), name
+        pair = (reference_scatter(C[0], 1, 1)[0] + reference_scatter(C[1], 1, 1)[0]) / \
+            reference_normp(1, reference_scatter(C[0], 1, 1)[1], reference_scatter(C[1], 1, 1)[1])
+        assert np.isclose(DBi(C, 0, 1, 1, 1), pair, rtol=1e-9), name
+        print(f"  {name}: DaviesBouldinIndex = {DaviesBouldinIndex(C)}")
+
+    try:
+        DaviesBouldinIndex(group_by_label(np.zeros((3, 2)), [0, 0, 0]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("один кластер")
+
+    X, y = make_blobs(n_samples=1_000_000, centers=8, n_features=3, random_state=0)
+    value = DaviesBouldinIndex(group_by_label(X, y))
+    assert np.isclose(value, davies_bouldin_score(X, y), rtol=1e-9)
+    print(f"✅ Совпадает с перебором и sklearn, 1000000 точек: {value}\n")
+
+
+def test_silhouette():
+    print("="*80)
+    print("ТЕСТ 6: Силуэт")
+    print("="*80)
+
+    for name, X, y in datasets():
+        if len(np.unique(y)) < 2 or len(np.unique(y)) == len(y):
+            continue
+        C = group_by_label(X, y)
+        expected = silhouette_samples(X, y)[C.order]
+        # 4096 байт - блоки по несколько строк, много заданий в пуле потоков
+        for block_bytes, n_jobs in ((64 << 20, None), (4096, 1), (4096, 3)):
+            values = SilhouetteSamples(C, block_bytes=block_bytes, n_jobs=n_jobs)
+            assert np.allclose(values, expected, rtol=1e-9, atol=1e-12), name
+        assert np.isclose(SilhouetteScore(list(C)), silhouette_score(X, y), rtol=1e-9), name
+        print(f"  {name}: Silhouette = {SilhouetteScore(C)}")
+
+    # Выборка: силуэт выбранных точек точный, среднее близко к полному
+    X, y = make_blobs(n_samples=5000, centers=4, random_state=0)
+    C = group_by_label(X, y)
+    rows = np.array([0, 10, 4999])
+    assert np.allclose(SilhouetteSamples(C, rows=rows), silhouette_samples(X, y)[C.order][rows])
+    assert abs(SilhouetteScore(C, sample_size=1000) - silhouette_score(X, y)) < 0.02
+    print("✅ Силуэт совпадает с sklearn\n")
+
+
+# Метрика -> (название scipy, параметры cdist)
+METRIC_REFERENCES = {
+    'euclidean': ('euclidean', {}),
+    'sqeuclidean': ('sqeuclidean', {}),
+    'manhattan': ('cityblock', {}),
+    'chebyshev': ('chebyshev', {}),
+    3: ('minkowski', {'p': 3}),
+    0.5: ('minkowski', {'p': 0.5}),
+    'cosine': ('cosine', {}),
+}
+
+
+def test_distance_metrics():
+    print("="*80)
+    print("ТЕСТ 7: Метрики расстояния")
+    print("="*80)
+
+    assert get_metric('euclidean') is minkowski(2) and get_metric(1).name == 'manhattan'
+    assert get_metric(np.inf).name == 'chebyshev'
+    for bad in ('unknown', 0):
+        try:
+            get_metric(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(bad)
+
+    rng = np.random.default_rng(3)
+    for name, X, y in datasets():
+        if len(np.unique(y)) < 2 or len(np.unique(y)) == len(y):
+            continue
+        # Без нулевого вектора: косинусное расстояние до него не определено
+        X = X + 20.0
+        C = group_by_label(X, y)
+        clusters = list(C)
+        for metric, (scipy_name, kwargs) in METRIC_REFERENCES.items():
+            if metric == 'cosine' and X.shape[1] == 1:
+                continue    # в 1D все косинусные расстояния нулевые
+            cdist = lambda A, B: distance.cdist(A, B, scipy_name, **kwargs)
+            D = cdist(X, X)
+            same = y[:, None] == y[None, :]
+            mind, maxd = D[~same].min(), D[same].max()
+            assert np.isclose(DunnIndex(C, metric=metric), mind / maxd, rtol=1e-12), (name, metric)
+            i, j = rng.choice(len(C), 2, replace=False)
+            assert np.isclose(MinInterCluster(C, i, j, metric=metric), cdist(C[i], C[j]).min(), rtol=1e-12)
+            assert np.isclose(MaxIntraCluster(C, i, metric=metric), cdist(C[i], C[i]).max(), rtol=1e-12)
+            assert np.isclose(MeanInterclusterDistance(C, i, j, metric=metric, block_bytes=4096),
+                              cdist(C[i], C[j]).mean(), rtol=1e-12)
+
+            mean = min(cdist(clusters[a], clusters[b]).mean()
+                       for a in range(len(C)) for b in range(a + 1, len(C)))
+            assert np.isclose(DunnIndexMean(C, metric=metric), mean / maxd, rtol=1e-12), (name, metric)
+
+            centroids = np.array([c.mean(axis=0) for c in clusters])
+            S = np.array([cdist(c, centroids[a:a + 1]).mean() for a, c in enumerate(clusters)])
+            M = cdist(centroids, centroids)
+            R = (S[:, None] + S[None, :]) / np.where(M == 0, np.nan, M)
+            np.fill_diagonal(R, -np.inf)
+            assert np.isclose(DaviesBouldinIndex(C, metric=metric), np.nanmax(R, axis=1).mean(), rtol=1e-9)
+            if M[i, j] > 0:
+                assert np.isclose(DBi(C, i, j, 2, 1, metric=metric), R[i, j], rtol=1e-9), (name, metric)
+
+            expected = silhouette_samples(D, y, metric='precomputed')[C.order]
+            assert np.allclose(SilhouetteSamples(C, metric=metric, block_bytes=4096), expected,
+                               rtol=1e-9, atol=1e-12), (name, metric)
+        print(f"  {name}: {len(METRIC_REFERENCES)} метрик совпадают с cdist")
+
+    # Евклидова метрика по умолчанию - прежний результат до последнего бита
+    C = group_by_label(*make_blobs(n_samples=500, centers=3, random_state=0))
+    assert DunnIndex(C) == DunnIndex(C, metric='euclidean') == DunnIndex(C, metric=2)
+    assert DaviesBouldinIndex(C) == DaviesBouldinIndex(C, metric='euclidean')
+    assert DBi(C, 0, 1, 2, 1) == DBi(C, 0, 1, 2, 1, metric='euclidean')
+    print("✅ Все метрики совпадают с полной матрицей расстояний\n")
+
+
+def test_quality_indices():
+    print("="*80)
+    print("ТЕСТ 8: Совместное вычисление показателей")
+    print("="*80)
+
+    for name, X, y in datasets():
+        if len(np.unique(y)) == len(y):
+            continue    # диаметры нулевые, индексы Данна не определены
+        C = group_by_label(X, y)
+        for metric in ('euclidean', 'manhattan'):
+            separate = {'DunnIndex': DunnIndex(C, metric=metric), 'DunnIndexMean': DunnIndexMean(C, metric=metric)}
+            if len(C) > 1:
+                separate['DaviesBouldinIndex'] = DaviesBouldinIndex(C, metric=metric)
+                separate['Silhouette'] = SilhouetteScore(C, metric=metric)
+            # С силуэтом - общий проход по матрице расстояний, без него - общие диаметры
+            for names in (QUALITY_INDICES, ('DunnIndexMean', 'DunnIndex'), ('Silhouette', 'DunnIndex')):
+                for block_bytes, n_jobs in ((64 << 20, None), (4096, 3)):
+                    values = QualityIndices(list(C), names, block_bytes=block_bytes, n_jobs=n_jobs, metric=metric)
+                    assert list(values) == [n for n in names if n in separate], (name, names)
+                    assert values['DunnIndex'] == separate['DunnIndex'], (name, names, metric)
+                    for key, value in values.items():
+                        assert np.isclose(value, separate[key], rtol=1e-12, atol=1e-15), (name, key, metric)
+        print(f"  {name}: {QualityIndices(C)}")
+
+    try:
+        QualityIndices(C, ('DunnIndex', 'Unknown'))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("неизвестный показатель")
+    # Для одного кластера DaviesBouldinIndex и Silhouette не определены
+    assert list(QualityIndices(group_by_label(X, np.zeros(len(X))))) == ['DunnIndex', 'DunnIndexMean']
+    print("✅ Показатели совпадают с отдельными функциями\n")
+
+
+def main():
+    test_dunn_identical()
+    test_dunn_large()
+    test_mean_inter_blocked()
+    test_group_by_label()
+    test_davies_bouldin()
+    test_silhouette()
+    test_distance_metrics()
+    test_quality_indices()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Тестовый скрипт для проверки пакетного запуска стратегий (Frameworks_ccore/BatchRunner.py)
+
+Описание:
+Скрипт формирует задание на кластеризацию набора точек несколькими
+стратегиями, выполняет его в пуле процессов и проверяет записанные
+метки, время работы и показатели качества.
+"""
+
+import json
+import sys
+import tempfile
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import make_blobs
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from Frameworks_ccore.BatchRunner import build_tasks, load_points, make_run_config, run_batch
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_make_run_config():
+    print("="*80)
+    print("ТЕСТ 1: Параметры запуска из JSON/TOML")
+    print("="*80)
+
+    config = make_run_config("dbscan_sk", {"eps": 1, "min_samples": 3})
+    assert config["eps"] == 1.0 and isinstance(config["eps"], float)
+    assert config["min_samples"] == 3
+    assert config["metric"] == "euclidean"  # значение по умолчанию
+
+    try:
+        make_run_config("dbscan_sk", {"metric": "cosine"})
+        assert False, "ожидалась ошибка для недопустимого значения"
+    except ValueError:
+        pass
+    print("✅ Параметры приводятся и проверяются\n")
+
+
+def test_run_batch():
+    print("="*80)
+    print("ТЕСТ 2: Пакетный запуск в пуле процессов")
+    print("="*80)
+
+    X, _ = make_blobs(n_samples=200, centers=3, cluster_std=0.5, random_state=42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        np.save(tmp / "points.npy", X)
+        spec = {
+            "input": {"type": "points", "path": str(tmp / "points.npy")},
+            "jobs": [
+                {"strategy": "dbscan_sk", "params": {"eps": 0.5}, "repetitions": 2},
+                {"strategy": "birch_sk", "name": "birch", "metrics": False},
+            ],
+        }
+        assert len(build_tasks(spec, tmp / "out")) == 3
+        np.testing.assert_allclose(load_points(str(tmp / "points.npy")), X.T)
+
+        records = run_batch(spec, tmp / "out", max_workers=2)
+
+        assert [r["job"] for r in records] == ["dbscan_sk", "dbscan_sk", "birch"]
+        for record in records:
+            assert record["error"] is None, record["error"]
+            labels = np.load(tmp / "out" / record["labels"])
+            assert labels.shape == (200,)
+            print(f"  {record['job']} #{record['repetition']}: {record['n_clusters']} кластеров, {record['metrics']}")
+
+        assert "DunnIndex" in records[0]["metrics"]
+        assert records[2]["metrics"] == {}
+
+        lines = (tmp / "out" / "results.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3 and json.loads(lines[0])["params"]["eps"] == 0.5
+    print("✅ Пакетный запуск работает\n")
+
+
+def test_run_batch_sweep():
+    print("="*80)
+    print("ТЕСТ 3: Перебор параметров DBSCAN и WaveClustering в пакетном задании")
+    print("="*80)
+
+    X, _ = make_blobs(n_samples=200, centers=3, cluster_std=0.5, random_state=42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        np.save(tmp / "points.npy", X)
+        spec = {
+            "input": {"type": "points", "path": str(tmp / "points.npy")},
+            "jobs": [{"strategy": "dbscan_sk", "metrics": False,
+                      "sweep": {"eps": [0.3, 0.5], "min_samples": [3, 5]}},
+                     {"strategy": "waveclustering", "metrics": False,
+                      "sweep": {"n_levels": [1, 2], "density_threshold": [0.1]}}],
+        }
+        records = run_batch(spec, tmp / "out", max_workers=1)
+
+        assert [(r["params"]["eps"], r["params"]["min_samples"]) for r in records[:4]] == [(0.3, 3), (0.3, 5), (0.5, 3), (0.5, 5)]
+        assert [(r["params"]["n_levels"], r["params"]["density_threshold"]) for r in records[4:]] == [(1, 0.1), (2, 0.1)]
+        for record in records:
+            assert record["error"] is None, record["error"]
+            assert np.load(tmp / "out" / record["labels"]).shape == (200,)
+
+        try:
+            build_tasks({"input": spec["input"], "jobs": [{"strategy": "optics_sk", "sweep": {"eps": [0.1], "min_samples": [3]}}]}, tmp)
+            assert False, "ожидалась ошибка для стратегии без перебора"
+        except ValueError:
+            pass
+    print("✅ Перебор параметров записан построчно\n")
+
+
+def main():
+    test_make_run_config()
+    test_run_batch()
+    test_run_batch_sweep()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Тестовый скрипт для проверки набора тестов производительности (Frameworks_ccore/Benchmark.py)
+
+Описание:
+Скрипт проверяет обнаружение стратегий и генераторов, измерение случаев в
+отдельных процессах с ограничением времени, историю запусков и поиск
+регрессий относительно базового уровня.
+"""
+
+import sys
+import copy
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ClusteringMethods.ClasteringAlgorithms import StrategiesManager
+from Frameworks_ccore.Benchmark import (
+    GENERATORS,
+    METRICS,
+    append_history,
+    build_cases,
+    compare,
+    environment,
+    generate,
+    load_baseline,
+    load_history,
+    run_benchmark,
+    save_baseline
+)
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_discovery():
+    print("="*80)
+    print("ТЕСТ 1: Обнаружение стратегий и генераторов")
+    print("="*80)
+
+    cases = build_cases(sizes=[1000])
+    strategies = {c.name for c in cases if c.kind == 'strategy'}
+    assert strategies == set(StrategiesManager.strategies())
+    assert {c.generator for c in cases if c.kind == 'strategy'} == set(GENERATORS)
+    assert {c.name for c in cases if c.kind == 'metric'} == set(METRICS) >= {'DunnIndex', 'DunnIndexMean', 'DBi', 'DaviesBouldinIndex', 'SilhouetteScore', 'QualityIndices'}
+
+    for generator in GENERATORS:
+        X, y = generate(generator, 1000)
+        assert X.shape[0] == len(y) == 1000, generator
+        # Одно зерно - одни и те же данные
+        assert (X == generate(generator, 1000)[0]).all(), generator
+    print("✅ Случаи построены для всех стратегий и генераторов\n")
+
+
+def test_run_and_regressions():
+    print("="*80)
+    print("ТЕСТ 2: Измерение, история и регрессии")
+    print("="*80)
+
+    cases = build_cases(['dbscan_sk', 'waveclustering'], ['blobs'], [300], ['DunnIndex', 'QualityIndices'], [100])
+    records = run_benchmark(cases, timeout=60)
+    assert [r['status'] for r in records] == ['ok'] * 4, records
+    assert all(r['wall'] > 0 and r['py_peak'] is not None for r in records)
+    assert 0.0 <= records[0]['quality']['ARI'] <= 1.0 and 'DunnIndex' in records[0]['quality']
+    # QualityIndices записывает все показатели одного прохода
+    assert records[3]['quality']['DunnIndex'] == records[2]['quality']['DunnIndex'] and 'Silhouette' in records[3]['quality']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        env = environment()
+        append_history(tmp / "history.jsonl", records, env)
+        append_history(tmp / "history.jsonl", records, env)
+        history = load_history(tmp / "history.jsonl")
+        assert len(history) == 8 and history[0]['env']['python'] == env['python']
+
+        save_baseline(tmp / "baseline.json", records, env)
+        baseline = load_baseline(tmp / "baseline.json")
+        assert compare(records, baseline) == []
+
+        slower = copy.deepcopy(records)
+        slower[0]['wall'] = records[0]['wall'] * 2 + 1.0
+        slower[1]['status'] = 'timeout'
+        slower[2]['quality']['DunnIndex'] += 1e-3
+        slower[3]['quality']['Silhouette'] += 1e-3
+        found = {(r.key, r.field) for r in compare(slower, baseline)}
+        assert found == {(records[0]['key'], 'wall'), (records[1]['key'], 'status'),
+                         (records[2]['key'], 'DunnIndex'), (records[3]['key'], 'Silhouette')}, found
+    print("✅ Регрессии времени, выполнения и значений показателей найдены\n")
+
+
+def test_timeout():
+    print("="*80)
+    print("ТЕСТ 3: Ограничение времени")
+    print("="*80)
+
+    cases = build_cases(['optics_sk'], ['blobs'], [2000, 4000], [])
+    records = run_benchmark(cases, timeout=0.01)
+    assert [r['status'] for r in records] == ['timeout', 'skipped'], records
+    print("✅ Случай прерван, большие размеры пропущены\n")
+
+
+def main():
+    test_discovery()
+    test_run_and_regressions()
+    test_timeout()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Тестовый скрипт для проверки достаточных статистик кластеров (AnalysisMethods/ClusterStatistics.py)
+
+Описание:
+Скрипт сравнивает показатели, выведенные из статистик (SSE, радиусы,
+индексы Калинского-Харабаза и Дэвиса-Болдина), с вычислением по точкам и
+проверяет, что обновление при смене части меток совпадает с пересчётом.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import make_blobs
+from sklearn.metrics import calinski_harabasz_score
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from AnalysisMethods.AnalysisAlgorithms import DaviesBouldinIndex, group_by_label
+from AnalysisMethods.ClusterStatistics import ClusterStats
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_derived_metrics():
+    print("="*80)
+    print("ТЕСТ 1: Показатели из статистик")
+    print("="*80)
+
+    X, y = make_blobs(n_samples=3000, centers=4, n_features=3, random_state=0)
+    # Данные далеко от нуля: суммы квадратов накапливаются относительно сдвига
+    X += 1e5
+    y[:50] = -1
+    stats = ClusterStats.from_labels(X, y)
+    C = group_by_label(X, y)
+
+    assert list(stats.labels) == [-1, 0, 1, 2, 3]
+    assert list(stats.sizes) == list(C.sizes)
+    centroids = np.array([c.mean(axis=0) for c in C])
+    sse = np.array([((c - c.mean(axis=0)) ** 2).sum() for c in C])
+    assert np.allclose(stats.centroids, centroids, rtol=1e-12)
+    assert np.allclose(stats.sse, sse, rtol=1e-7)
+    assert np.allclose(stats.radii, np.sqrt(sse / C.sizes), rtol=1e-7)
+    assert np.allclose(stats.mins, [c.min(axis=0) for c in C]) and np.allclose(stats.maxs, [c.max(axis=0) for c in C])
+
+    assert np.isclose(stats.calinski_harabasz(), calinski_harabasz_score(X, y), rtol=1e-6)
+    assert np.isclose(stats.davies_bouldin(), DaviesBouldinIndex(C, p=2, q=2), rtol=1e-7)
+    print(f"  CH = {stats.calinski_harabasz():.2f}, DB = {stats.davies_bouldin():.4f}, SSE = {stats.inertia:.2f}")
+
+    try:
+        ClusterStats.from_labels(X, np.zeros(len(X))).calinski_harabasz()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("один кластер")
+    print("✅ Показатели совпадают с вычислением по точкам\n")
+
+
+def test_incremental_update():
+    print("="*80)
+    print("ТЕСТ 2: Обновление при смене меток")
+    print("="*80)
+
+    rng = np.random.default_rng(0)
+    X, y = make_blobs(n_samples=5000, centers=3, random_state=1)
+    stats = ClusterStats.from_labels(X, y)
+
+    # Часть точек переходит в другие и в новый кластер 9, кластер 2 опустошается
+    new = y.copy()
+    moved = rng.choice(len(X), 500, replace=False)
+    new[moved] = rng.choice([0, 1, 9], len(moved))
+    new[y == 2] = 9
+    changed = np.flatnonzero(new != y)
+    stats.update(X[changed], y[changed], new[changed])
+    expected = ClusterStats.from_labels(X, new)
+
+    assert list(stats.labels) == [0, 1, 2, 9] and list(stats.counts) == [*expected.counts[:2], 0, expected.counts[2]]
+    assert np.allclose(stats.centroids, expected.centroids)
+    assert np.allclose(stats.sse, expected.sse, rtol=1e-9)
+    assert np.isclose(stats.calinski_harabasz(), expected.calinski_harabasz(), rtol=1e-9)
+    assert np.isclose(stats.davies_bouldin(), expected.davies_bouldin(), rtol=1e-9)
+    # Границы после удаления точек остаются верными, хотя могут быть шире
+    assert (stats.mins[stats.active] <= expected.mins).all() and (stats.maxs[stats.active] >= expected.maxs).all()
+
+    for labels in ([2], [5]):
+        try:
+            stats.remove(X[:1], labels)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("удаление из пустого или несуществующего кластера")
+    assert list(stats.labels) == [0, 1, 2, 9] and stats.counts.sum() == len(X)
+    print(f"✅ Обновление по {len(changed)} точкам совпадает с пересчётом\n")
+
+
+def main():
+    test_derived_metrics()
+    test_incremental_update()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Тестовый скрипт для проверки подготовки данных в Context (ClusteringMethods/ClasteringAlgorithms.py)
+
+Описание:
+Скрипт проверяет приведение точек к размещению в памяти, объявленному
+стратегией (DataLayout), построение признаков пикселей изображения и
+раскраску меток кластеров таблицей цветов.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import ClusteringMethods
+from ClusteringMethods.ClasteringAlgorithms import (
+    Context,
+    DataLayout,
+    LABEL_PALETTE,
+    StrategiesManager
+)
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_prepare_features():
+    print("="*80)
+    print("ТЕСТ 1: Размещение данных для стратегий")
+    print("="*80)
+
+    data = np.arange(12, dtype=float).reshape((3, 4))    # (n_features, n_samples)
+    expected = data.transpose()
+
+    for stratId, layout in (("dbscan_sk", DataLayout.RowMajor),
+                            ("fuzzy_cmeans", DataLayout.ColumnMajor),
+                            ("birch_pyc", DataLayout.PyList)):
+        context = Context(StrategiesManager.createStrategyById(stratId))
+        assert context.strategy.data_layout == layout
+        points = context._prepare_features(data, features_first=True)
+        np.testing.assert_array_equal(np.asarray(points), expected)
+
+        match layout:
+            case DataLayout.RowMajor:
+                assert points.flags.c_contiguous
+            case DataLayout.ColumnMajor:
+                assert points.flags.f_contiguous and np.shares_memory(points, data)
+            case DataLayout.PyList:
+                assert isinstance(points, list)
+        print(f"  {stratId}: {layout.name}")
+    print("✅ Данные приводятся к размещению стратегии\n")
+
+
+def test_image_features():
+    print("="*80)
+    print("ТЕСТ 2: Признаки пикселей и раскраска меток")
+    print("="*80)
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (4, 5, 3), dtype=np.uint8)
+
+    features = Context.image_features(image)
+    assert features.shape == (20, 3) and np.shares_memory(features, image)
+
+    features = Context.image_features(image, with_coords=True)
+    assert features.shape == (20, 5)
+    for y in range(image.shape[0]):
+        for x in range(image.shape[1]):
+            np.testing.assert_array_equal(features[y * image.shape[1] + x], [*image[y, x], x, y])
+
+    labels = np.array([0, 1, 2, -1, 7, 5])
+    painted = Context.paint_labels(labels, (2, 3, 3))
+    assert painted.shape == (2, 3, 3) and painted.dtype == np.uint8
+    for label, color in zip(labels, painted.reshape((-1, 3))):
+        np.testing.assert_array_equal(color, LABEL_PALETTE[label % len(LABEL_PALETTE)])
+    print("✅ Признаки и раскраска построены без циклов по пикселям\n")
+
+
+def main():
+    test_prepare_features()
+    test_image_features()
+
+
+if __name__ == "__main__":
+    main()
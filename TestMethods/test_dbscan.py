@@ -32,6 +32,7 @@ try:
         Context,
         StrategiesManager
     )
+    from ClusteringMethods.SpatialIndex import SpatialIndex
     ALGORITHM_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️  Предупреждение: {e}")
@@ -338,6 +339,62 @@ def test_strategy_integration():
     
     print()
 
+def test_parameter_sweep():
+    print("="*80)
+    print("ТЕСТ 6: Перебор параметров по одному графу соседей")
+    print("="*80)
+
+    if not STRATEGY_AVAILABLE:
+        print("❌ Strategy Pattern не доступен. Пропускаем тест.")
+        return
+
+    X, _ = generate_test_data_2d('blobs', n_samples=500, centers=4, cluster_std=1.0)
+    X = np.vstack([X, X[:20]])     # совпадающие точки
+
+    config = StrategiesManager.getStrategyRunConfigById("dbscan_sk")
+    strategy = ConcreteStrategyDBSCAN_from_SKLEARN()
+    table = strategy.sweep(X, [0.2, 0.4, 0.8], [2, 5, 15], config)
+    assert [(row.eps, row.min_samples) for row in table] == [(e, m) for e in (0.2, 0.4, 0.8) for m in (2, 5, 15)]
+
+    for row in table:
+        config["eps"] = row.eps
+        config["min_samples"] = row.min_samples
+        expected = strategy.clastering_points(X, config)
+        np.testing.assert_array_equal(row.labels, expected)
+        assert row.n_clusters == len(np.unique(expected[expected != -1]))
+        assert row.n_noise == np.sum(expected == -1)
+        print(f"  eps={row.eps}, min_samples={row.min_samples}: {row.n_clusters} кластеров, шум: {row.n_noise}")
+    print("✅ Метки перебора совпадают с DBSCAN.fit_predict")
+    print()
+
+def test_shared_spatial_index():
+    print("="*80)
+    print("ТЕСТ 7: Общий индекс соседей для нескольких запусков")
+    print("="*80)
+
+    if not STRATEGY_AVAILABLE:
+        print("❌ Strategy Pattern не доступен. Пропускаем тест.")
+        return
+
+    X, _ = generate_test_data_2d('blobs', n_samples=500, centers=4, cluster_std=1.0)
+    X = np.vstack([X, X[:20]])
+    index = SpatialIndex()
+
+    for eps, min_samples in ((0.8, 5), (0.3, 5), (0.5, 10)):
+        config = StrategiesManager.getStrategyRunConfigById("dbscan_sk")
+        config["eps"] = eps
+        config["min_samples"] = min_samples
+
+        shared = Context(ConcreteStrategyDBSCAN_from_SKLEARN(), index).do_some_clustering_points(X.T, config)
+        alone = Context(ConcreteStrategyDBSCAN_from_SKLEARN()).do_some_clustering_points(X.T, config)
+        np.testing.assert_array_equal(shared, alone)
+
+    # Меньшие радиусы получены из графа для eps=0.8 без нового поиска соседей
+    assert index.radius_graph(0.3).nnz < index.radius_graph(0.8).nnz
+    assert len(index._radius) == 1 and index._radius[("euclidean", None)][0] == 0.8
+    print("✅ Запуски с общим индексом совпадают с независимыми")
+    print()
+
 # ============================================================================
 # ГЛАВНАЯ ФУНКЦИЯ
 # ============================================================================
@@ -357,6 +414,8 @@ def main():
         test_different_datasets()
         test_3d_clustering()
         test_strategy_integration()
+        test_parameter_sweep()
+        test_shared_spatial_index()
         
         print("="*80)
         print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ УСПЕШНО! ✅")
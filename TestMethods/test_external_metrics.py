@@ -0,0 +1,155 @@
+"""
+Тестовый скрипт для проверки внешних показателей качества (AnalysisMethods/ExternalMetrics.py)
+
+Описание:
+Скрипт сравнивает ARI, NMI, V-меру и чистоту по разреженной таблице
+сопряжённости с sklearn.metrics (в том числе при разных способах учёта шума),
+проверяет время на миллионах точек и тысячах кластеров и вывод внешних
+показателей при запуске стратегий с эталонными метками.
+"""
+
+import csv
+import sys
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score, v_measure_score
+from sklearn.metrics.cluster import contingency_matrix
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from AnalysisMethods.ExternalMetrics import EXTERNAL_METRICS, Contingency, external_scores
+from Frameworks_ccore.BatchRunner import make_run_config, run_batch
+from Frameworks_ccore.ClusteringJob import ClusteringJob, run_clustering_job
+
+# ============================================================================
+# ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ
+# ============================================================================
+
+def reference_scores(labels_true, labels_pred) -> dict:
+    table = contingency_matrix(labels_true, labels_pred)
+    return {'ARI': adjusted_rand_score(labels_true, labels_pred),
+            'NMI': normalized_mutual_info_score(labels_true, labels_pred),
+            'V-measure': v_measure_score(labels_true, labels_pred),
+            'Purity': table.max(axis=0).sum() / table.sum()}
+
+
+def assert_scores_close(scores: dict, expected: dict):
+    assert list(scores) == list(EXTERNAL_METRICS)
+    for name in EXTERNAL_METRICS:
+        assert np.isclose(scores[name], expected[name], rtol=1e-10, atol=1e-12), \
+            f"{name}: {scores[name]} != {expected[name]}"
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_against_sklearn():
+    print("="*80)
+    print("ТЕСТ 1: Сравнение с sklearn.metrics")
+    print("="*80)
+
+    rng = np.random.default_rng(0)
+    cases = {
+        'случайные метки': (rng.integers(0, 5, 2000), rng.integers(0, 7, 2000)),
+        'совпадение с перестановкой': (np.repeat([3, 1, 2], 100), np.repeat([10, 20, 30], 100)),
+        'строковые метки': (rng.choice(['a', 'b', 'c'], 500), rng.integers(-1, 4, 500)),
+        'один кластер': (rng.integers(0, 3, 300), np.zeros(300, dtype=int)),
+        'все точки отдельно': (rng.integers(0, 3, 300), np.arange(300)),
+        'большой разброс меток': (rng.integers(0, 4, 1000), rng.integers(0, 3, 1000) * 10**9),
+    }
+    for title, (labels_true, labels_pred) in cases.items():
+        assert_scores_close(external_scores(labels_true, labels_pred), reference_scores(labels_true, labels_pred))
+        print(f"  {title}: совпадает")
+
+    # Шум в найденных метках: одним кластером, отдельными точками и без него
+    labels_true = rng.integers(0, 4, 3000)
+    labels_pred = np.where(rng.random(3000) < 0.2, -1, labels_true)
+    noise = labels_pred == -1
+    singletons = labels_pred.copy()
+    singletons[noise] = 100 + np.arange(np.count_nonzero(noise))
+    assert_scores_close(external_scores(labels_true, labels_pred, 'cluster'), reference_scores(labels_true, labels_pred))
+    assert_scores_close(external_scores(labels_true, labels_pred, 'singletons'), reference_scores(labels_true, singletons))
+    assert_scores_close(external_scores(labels_true, labels_pred, 'ignore'),
+                        reference_scores(labels_true[~noise], labels_pred[~noise]))
+    assert Contingency(labels_true, labels_pred, 'singletons').n_pred == 4 + np.count_nonzero(noise)
+
+    for args in ((labels_true, labels_pred[:-1]), (labels_true, labels_pred, 'drop')):
+        try:
+            external_scores(*args)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"ожидалась ошибка для {args[2:] or 'разной длины'}")
+    print("✅ Показатели совпадают с sklearn\n")
+
+
+def test_large_scale():
+    print("="*80)
+    print("ТЕСТ 2: Миллионы точек и тысячи кластеров")
+    print("="*80)
+
+    rng = np.random.default_rng(1)
+    n = 2_000_000
+    labels_true = rng.integers(0, 3000, n)
+    labels_pred = np.where(rng.random(n) < 0.9, labels_true // 2, -1)
+
+    for noise in ('cluster', 'singletons', 'ignore'):
+        start = time.perf_counter()
+        scores = external_scores(labels_true, labels_pred, noise)
+        elapsed = time.perf_counter() - start
+        print(f"  noise={noise}: {elapsed:.3f} с, " + ", ".join(f"{k}={v:.4f}" for k, v in scores.items()))
+        assert all(0.0 <= value <= 1.0 for value in scores.values())
+        assert elapsed < 5.0
+
+    subset = slice(0, 200_000)
+    assert_scores_close(external_scores(labels_true[subset], labels_pred[subset]),
+                        reference_scores(labels_true[subset], labels_pred[subset]))
+    print("✅ Таблица сопряжённости строится без плотной матрицы\n")
+
+
+def test_job_and_batch():
+    print("="*80)
+    print("ТЕСТ 3: Внешние показатели при запуске стратегий")
+    print("="*80)
+
+    X, y = make_blobs(n_samples=300, centers=3, cluster_std=0.5, random_state=42)
+    job = ClusteringJob("dbscan_sk", make_run_config("dbscan_sk", {"eps": 0.5}), X.T, labels_true=y)
+    result = run_clustering_job(job)
+    assert result.error is None, result.error
+    assert_scores_close({name: result.metrics[name] for name in EXTERNAL_METRICS},
+                        reference_scores(y, result.labels))
+    assert "DunnIndex" in result.metrics and "external" in [p.name for p in result.profile]
+    print(f"  dbscan_sk: ARI = {result.metrics['ARI']:.4f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        np.save(tmp / "points.npy", X)
+        # Метки в формате GUI: одна строка csv
+        with open(tmp / "dataLabels.csv", "w", newline="", encoding="utf-8") as f:
+            csv.writer(f, dialect="excel", delimiter=";", quoting=csv.QUOTE_ALL).writerow(y)
+        spec = {
+            "input": {"type": "points", "path": str(tmp / "points.npy"), "labels": str(tmp / "dataLabels.csv")},
+            "jobs": [{"strategy": "birch_sk", "metrics": False}],
+        }
+        records = run_batch(spec, tmp, max_workers=1)
+        assert records[0]["error"] is None, records[0]["error"]
+        labels = np.load(tmp / records[0]["labels"])
+        assert set(records[0]["metrics"]) == set(EXTERNAL_METRICS)
+        assert_scores_close({name: records[0]["metrics"][name] for name in EXTERNAL_METRICS},
+                            reference_scores(y, labels))
+        print(f"  birch_sk (пакетный запуск): {records[0]['metrics']}")
+    print("✅ Внешние показатели добавляются к результатам\n")
+
+
+def main():
+    test_against_sklearn()
+    test_large_scale()
+    test_job_and_batch()
+
+
+if __name__ == "__main__":
+    main()
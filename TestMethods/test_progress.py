@@ -0,0 +1,95 @@
+"""
+Тестовый скрипт для проверки хода выполнения и отмены кластеризации (Frameworks_ccore/ProgressToken.py)
+
+Описание:
+Скрипт проверяет отображение хода выполнения дочерних токенов на шкалу
+родителя, кооперативную отмену WaveClustering и показателей качества, а
+также результат отменённого задания ClusteringJob.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import make_blobs
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ClusteringMethods.WaveClusteringAlgorithm import WaveClustering
+from AnalysisMethods.AnalysisAlgorithms import DunnIndex, converter_to_c
+from Frameworks_ccore.BatchRunner import make_run_config
+from Frameworks_ccore.ClusteringJob import ClusteringJob, run_clustering_job
+from Frameworks_ccore.ProgressToken import ClusteringCancelled, ProgressToken, checkpoints
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_progress_scale():
+    print("="*80)
+    print("ТЕСТ 1: Шкала хода выполнения")
+    print("="*80)
+
+    reports = []
+    token = ProgressToken(lambda fraction, message: reports.append((fraction, message)), min_interval=0.0)
+    token.sub(0.5, 1.0).sub(0.5, 1.0).report(0.5, "этап")
+    assert reports[-1] == (0.875, "этап")
+
+    assert list(checkpoints(token.sub(0.0, 0.5), 10, "цикл", every=5)) == list(range(10))
+    assert [f for f, _ in reports[1:]] == [0.0, 0.25, 0.5]
+    print("✅ Дочерние токены отображаются на часть шкалы родителя\n")
+
+
+def test_cooperative_cancel():
+    print("="*80)
+    print("ТЕСТ 2: Кооперативная отмена")
+    print("="*80)
+
+    X, y = make_blobs(n_samples=2000, centers=3, random_state=42)
+    token = ProgressToken()
+    token.cancel()
+    assert token.cancelled
+
+    for call in (lambda: WaveClustering(n_grid=16).fit(X, token),
+                 lambda: DunnIndex(converter_to_c(X, y), token),
+                 lambda: list(checkpoints(token, 10))):
+        try:
+            call()
+        except ClusteringCancelled:
+            continue
+        raise AssertionError("cancellation was ignored")
+
+    # Без отмены токен не меняет результат
+    labels = WaveClustering(n_grid=16).fit_predict(X, ProgressToken())
+    np.testing.assert_array_equal(labels, WaveClustering(n_grid=16).fit_predict(X))
+    print("✅ Отмена прерывает вычисление на границе итерации\n")
+
+
+def test_cancelled_job():
+    print("="*80)
+    print("ТЕСТ 3: Отменённое задание")
+    print("="*80)
+
+    X, _ = make_blobs(n_samples=300, centers=3, random_state=42)
+    job = ClusteringJob("waveclustering", make_run_config("waveclustering", {}), X.T)
+
+    token = ProgressToken()
+    token.cancel()
+    result = run_clustering_job(job, progress=token)
+    assert result.cancelled and result.labels is None and result.metrics == {}
+
+    reports = []
+    result = run_clustering_job(job, progress=ProgressToken(lambda f, m: reports.append(f), min_interval=0.0))
+    assert not result.cancelled and result.error is None
+    assert reports == sorted(reports) and reports[-1] == 1.0
+    print("✅ Отменённое задание возвращает признак cancelled\n")
+
+
+def main():
+    test_progress_scale()
+    test_cooperative_cancel()
+    test_cancelled_job()
+
+
+if __name__ == "__main__":
+    main()
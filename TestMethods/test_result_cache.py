@@ -0,0 +1,112 @@
+"""
+Тестовый скрипт для проверки кэша результатов кластеризации (Frameworks_ccore/ResultCache.py)
+
+Описание:
+Скрипт проверяет ключи кэша (данные, стратегия, фактические параметры),
+вытеснение из памяти и с диска, а также повторный пакетный запуск,
+результаты которого берутся из кэша.
+"""
+
+import sys
+import tempfile
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import make_blobs
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from Frameworks_ccore.BatchRunner import make_run_config, run_batch
+from Frameworks_ccore.ClusteringJob import ClusteringJob, ClusteringResult
+from Frameworks_ccore.ResultCache import ResultCache, fingerprint_array, job_key
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_job_key():
+    print("="*80)
+    print("ТЕСТ 1: Ключи кэша")
+    print("="*80)
+
+    X, _ = make_blobs(n_samples=100, centers=3, random_state=42)
+    data = X.T
+
+    key = job_key(ClusteringJob("dbscan_sk", make_run_config("dbscan_sk", {}), data))
+    # Значение по умолчанию, заданное явно, не меняет ключ
+    assert key == job_key(ClusteringJob("dbscan_sk", make_run_config("dbscan_sk", {"eps": 0.5}), data.copy()))
+    assert key != job_key(ClusteringJob("dbscan_sk", make_run_config("dbscan_sk", {"eps": 0.6}), data))
+    assert key != job_key(ClusteringJob("optics_sk", make_run_config("optics_sk", {}), data))
+    assert key != job_key(ClusteringJob("dbscan_sk", make_run_config("dbscan_sk", {}), data, compute_metrics=False))
+
+    changed = data.copy()
+    changed[0, 0] += 1e-9
+    assert fingerprint_array(changed) != fingerprint_array(data)
+    assert fingerprint_array(data) == fingerprint_array(np.asfortranarray(data))
+    print("✅ Ключ зависит от данных, стратегии и фактических параметров\n")
+
+
+def test_cache_tiers():
+    print("="*80)
+    print("ТЕСТ 2: Память и диск")
+    print("="*80)
+
+    labels = np.arange(1000) % 7
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp, max_items=2)
+        for idx in range(3):
+            cache.put(f"key{idx}", ClusteringResult("dbscan_sk", labels=labels, elapsed=idx, metrics={"DunnIndex": 0.5}))
+        cache.put("failed", ClusteringResult("dbscan_sk", error="ValueError"))
+        assert cache.get("failed") is None
+
+        # Вытесненный из памяти результат читается с диска новым экземпляром
+        result = ResultCache(tmp).get("key0")
+        assert result.cached and result.elapsed == 0 and result.metrics == {"DunnIndex": 0.5}
+        np.testing.assert_array_equal(result.labels, labels)
+
+        memoryOnly = ResultCache(max_items=2)
+        for idx in range(3):
+            memoryOnly.put(f"key{idx}", ClusteringResult("dbscan_sk", labels=labels))
+        assert memoryOnly.get("key0") is None and memoryOnly.get("key2").cached
+
+        entrySize = (Path(tmp) / "key0.npz").stat().st_size
+        small = ResultCache(tmp, max_disk_bytes=2 * entrySize + entrySize // 2)
+        small.put("key3", ClusteringResult("dbscan_sk", labels=labels))
+        assert len(list(Path(tmp).glob("*.npz"))) == 2
+        assert (Path(tmp) / "key3.npz").exists()
+    print("✅ Кэш хранит результаты и ограничивает размер\n")
+
+
+def test_batch_cache():
+    print("="*80)
+    print("ТЕСТ 3: Повторный пакетный запуск из кэша")
+    print("="*80)
+
+    X, _ = make_blobs(n_samples=200, centers=3, cluster_std=0.5, random_state=42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        np.save(tmp / "points.npy", X)
+        spec = {
+            "input": {"type": "points", "path": str(tmp / "points.npy")},
+            "jobs": [{"strategy": "dbscan_sk", "params": {"eps": 0.5}}],
+        }
+        first = run_batch(spec, tmp / "out1", max_workers=1, cache_dir=tmp / "cache")
+        second = run_batch(spec, tmp / "out2", max_workers=1, cache_dir=tmp / "cache")
+
+        assert not first[0]["cached"] and second[0]["cached"]
+        assert first[0]["metrics"] == second[0]["metrics"]
+        assert first[0]["elapsed"] == second[0]["elapsed"]
+        np.testing.assert_array_equal(np.load(tmp / "out1" / first[0]["labels"]),
+                                      np.load(tmp / "out2" / second[0]["labels"]))
+    print("✅ Повторный запуск взят из кэша\n")
+
+
+def main():
+    test_job_key()
+    test_cache_tiers()
+    test_batch_cache()
+
+
+if __name__ == "__main__":
+    main()
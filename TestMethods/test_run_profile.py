@@ -0,0 +1,118 @@
+"""
+Тестовый скрипт для проверки профиля запуска по этапам (Frameworks_ccore/RunProfile.py)
+
+Описание:
+Скрипт проверяет измерение этапов (время, процессорное время, пик памяти),
+профиль задания ClusteringJob, его запись в results.jsonl пакетного запуска
+и выгрузку строками JSON.
+"""
+
+import sys
+import json
+import tempfile
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import make_blobs
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from Frameworks_ccore.BatchRunner import make_run_config, run_batch
+from Frameworks_ccore.ClusteringJob import ClusteringJob, run_clustering_job
+from Frameworks_ccore.ResultCache import ResultCache
+from Frameworks_ccore.RunProfile import RunProfiler, append_jsonl, profile_to_dicts
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_profiler_phases():
+    print("="*80)
+    print("ТЕСТ 1: Измерение этапов")
+    print("="*80)
+
+    profiler = RunProfiler(trace_memory=True)
+    with profiler.phase('prepare'):
+        buffer = np.ones(4 * 1024 * 1024 // 8)
+    del buffer
+    with profiler.phase('prepare'):
+        pass
+    with profiler.phase('fit'):
+        sum(range(100000))
+
+    prepare, fit = profiler.phases
+    assert (prepare.name, fit.name) == ('prepare', 'fit')
+    assert prepare.py_peak >= 4 * 1024 * 1024
+    assert fit.wall > 0 and fit.cpu >= 0 and fit.py_peak < 1024 * 1024
+
+    untraced = RunProfiler()
+    with untraced.phase('fit'):
+        pass
+    assert untraced.get('fit').py_peak is None
+    print("✅ Время и пик памяти записываются по этапам\n")
+
+
+def test_job_profile():
+    print("="*80)
+    print("ТЕСТ 2: Профиль задания")
+    print("="*80)
+
+    X, _ = make_blobs(n_samples=300, centers=3, random_state=42)
+    job = ClusteringJob("dbscan_sk", make_run_config("dbscan_sk", {}), X.T)
+    result = run_clustering_job(job)
+
+    assert [p.name for p in result.profile] == ['prepare', 'fit', 'labels', 'metrics']
+    assert result.elapsed == result.profile[1].cpu
+    # По умолчанию время обучения измеряется без tracemalloc
+    assert all(p.py_peak is None for p in result.profile)
+
+    image = ClusteringJob("dbscan_sk", make_run_config("dbscan_sk", {}), np.zeros((10, 3)), 'image')
+    assert [p.name for p in run_clustering_job(image).profile] == ['prepare', 'fit', 'labels', 'metrics']
+
+    # Из кэша результат возвращается без профиля исходного запуска
+    cache = ResultCache()
+    cache.put("key", result)
+    assert cache.get("key").profile == []
+    print("✅ Задание возвращает профиль этапов\n")
+
+
+def test_jsonl_export():
+    print("="*80)
+    print("ТЕСТ 3: Выгрузка строками JSON")
+    print("="*80)
+
+    X, _ = make_blobs(n_samples=200, centers=3, random_state=42)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        np.save(tmp / "points.npy", X)
+        spec = {
+            "input": {"type": "points", "path": str(tmp / "points.npy")},
+            "jobs": [{"strategy": "dbscan_sk", "trace_memory": True},
+                     {"strategy": "dbscan_sk", "name": "sweep",
+                      "sweep": {"eps": [0.3, 0.5], "min_samples": [5]}}],
+        }
+        records = run_batch(spec, tmp / "out", max_workers=1)
+        lines = [json.loads(line) for line in open(tmp / "out" / "results.jsonl", encoding='utf-8')]
+        assert [p['name'] for p in lines[0]['profile']] == ['prepare', 'fit', 'labels', 'metrics']
+        assert lines[1]['profile'][1]['wall'] == lines[2]['profile'][1]['wall']
+        assert lines[0]['profile'][0]['py_peak'] is not None and lines[1]['profile'][0]['py_peak'] is None
+        assert records[0]['profile'] == lines[0]['profile']
+
+        profiler = RunProfiler()
+        with profiler.phase('render'):
+            pass
+        append_jsonl(tmp / "logs" / "profile.jsonl", {'strategy': 'dbscan_sk', 'profile': profile_to_dicts(profiler.phases)})
+        append_jsonl(tmp / "logs" / "profile.jsonl", {'strategy': 'optics_sk', 'profile': []})
+        lines = (tmp / "logs" / "profile.jsonl").read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 2 and json.loads(lines[0])['profile'][0]['name'] == 'render'
+    print("✅ Профиль записывается строками JSON\n")
+
+
+def main():
+    test_profiler_phases()
+    test_job_profile()
+    test_jsonl_export()
+
+
+if __name__ == "__main__":
+    main()
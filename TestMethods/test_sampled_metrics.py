@@ -0,0 +1,125 @@
+"""
+Тестовый скрипт для проверки приближённых показателей качества (AnalysisMethods/SampledMetrics.py)
+
+Описание:
+Скрипт проверяет стратифицированные выборки по кластерам, точное вычисление
+для малых данных, доверительные интервалы и ограничение времени, а также
+показатели качества изображений в задании ClusteringJob и кэше результатов.
+"""
+
+import sys
+import tempfile
+import numpy as np
+from pathlib import Path
+from sklearn.datasets import make_blobs
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from AnalysisMethods.AnalysisAlgorithms import DaviesBouldinIndex, DunnIndex, group_by_label
+from AnalysisMethods.SampledMetrics import StratifiedSampler, estimate_metric
+from Frameworks_ccore.BatchRunner import make_run_config
+from Frameworks_ccore.ClusteringJob import ClusteringJob, run_clustering_job
+from Frameworks_ccore.ResultCache import ResultCache
+
+# ============================================================================
+# ТЕСТОВЫЕ ФУНКЦИИ
+# ============================================================================
+
+def test_stratified_sampler():
+    print("="*80)
+    print("ТЕСТ 1: Стратифицированная выборка")
+    print("="*80)
+
+    rng = np.random.default_rng(0)
+    labels = np.r_[np.zeros(100_000, int), np.ones(50_000, int), np.full(5, 7), np.full(40, -1)]
+    points = rng.normal(size=(len(labels), 2))
+    sampler = StratifiedSampler(points, labels, budget=1_000)
+
+    assert list(sampler.sizes) == [40, 100_000, 50_000, 5]
+    # Малые кластеры сохраняются целиком, остаток бюджета - пропорционально размеру
+    assert list(sampler.sample_sizes) == [20, 643, 332, 5]
+    assert sampler.sample_size == 1_000
+    assert not sampler.exhaustive
+
+    C = sampler.sample()
+    assert list(C.labels) == [-1, 0, 1, 7] and list(C.sizes) == list(sampler.sample_sizes)
+    # Точки выборки - точки своего кластера без повторов
+    for i, label in enumerate(C.labels):
+        cluster = points[labels == label]
+        assert len(np.unique(C[i], axis=0)) == len(C[i])
+        assert np.isin(C[i][:, 0], cluster[:, 0]).all()
+
+    assert StratifiedSampler(points[:500], labels[:500], budget=1_000).exhaustive
+
+    # Много кластеров: нижняя граница на кластер уменьшается, выборка не превышает бюджет
+    many = np.repeat(np.arange(2_000), 500)
+    sampler = StratifiedSampler(np.zeros((len(many), 1)), many, budget=5_000)
+    assert sampler.sample_size <= 5_000 and (sampler.sample_sizes >= 2).all()
+    sampler = StratifiedSampler(np.zeros((len(many), 1)), many, budget=1_000)
+    assert sampler.sample_size == 1_000 and len(sampler.sample().labels) == 1_000
+    print(f"✅ Размеры выборки по кластерам: {list(sampler.sample_sizes)}\n")
+
+
+def test_estimate_metric():
+    print("="*80)
+    print("ТЕСТ 2: Оценка с доверительным интервалом")
+    print("="*80)
+
+    X, y = make_blobs(n_samples=400, centers=3, random_state=0)
+    exact = estimate_metric(DunnIndex, X, y, budget=1_000)
+    assert not exact.approximate and exact.replicates == 1
+    assert exact.value == exact.low == exact.high == DunnIndex(group_by_label(X, y))
+
+    X, y = make_blobs(n_samples=200_000, centers=4, random_state=0)
+    estimate = estimate_metric(DaviesBouldinIndex, X, y, budget=2_000, replicates=40)
+    expected = DaviesBouldinIndex(group_by_label(X, y))
+    assert estimate.approximate and estimate.replicates == 40 and estimate.sample_size == 2_000
+    assert estimate.confidence == 0.95
+    assert estimate.low <= estimate.value <= estimate.high
+    assert estimate.low <= expected <= estimate.high
+    print(f"  DaviesBouldinIndex: {expected:.4f} в [{estimate.low:.4f}; {estimate.high:.4f}]")
+
+    # Вторая выборка не укладывается во время: одна выборка, вырожденный размах значений
+    fast = estimate_metric(DaviesBouldinIndex, X, y, budget=2_000, replicates=40, time_budget=0.0)
+    assert fast.replicates == 1 and fast.confidence is None and fast.low == fast.value == fast.high
+    single = estimate_metric(DaviesBouldinIndex, X, y, budget=2_000, replicates=1)
+    assert single.replicates == 1 and single.confidence is None
+    print("✅ Интервал содержит точное значение, время ограничено\n")
+
+
+def test_image_job():
+    print("="*80)
+    print("ТЕСТ 3: Показатели качества изображения")
+    print("="*80)
+
+    rng = np.random.default_rng(0)
+    image = np.zeros((120, 120, 3))
+    image[:, 40:80] = (200, 30, 30)
+    image[:, 80:] = (30, 30, 200)
+    image = np.clip(image + rng.normal(scale=5, size=image.shape), 0, 255).astype(np.uint8)
+
+    config = make_run_config("gaussian_mixture_sk", {"n_components": 3})
+    job = ClusteringJob("gaussian_mixture_sk", config, image, 'image', sample_budget=1_000)
+    result = run_clustering_job(job)
+    assert result.error is None, result.error
+    assert set(result.metric_estimates) == {'DunnIndex', 'DunnIndexMean', 'DaviesBouldinIndex', 'Silhouette'}
+    for name, estimate in result.metric_estimates.items():
+        assert estimate.approximate and estimate.sample_size == 1_000
+        assert result.metrics[name] == estimate.value
+        print(f"  {name}: {estimate.value:.4f} [{estimate.low:.4f}; {estimate.high:.4f}]")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ResultCache(tmp).put("key", result)
+        assert ResultCache(tmp).get("key").metric_estimates == result.metric_estimates
+    print("✅ Показатели изображения вычислены по выборкам пикселей\n")
+
+
+def main():
+    test_stratified_sampler()
+    test_estimate_metric()
+    test_image_job()
+
+
+if __name__ == "__main__":
+    main()
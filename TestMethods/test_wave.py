@@ -18,7 +18,8 @@ ALGORITHM_NAME = "WaveClustering"
 
 try:
     from ClusteringMethods.WaveClusteringAlgorithm import (
-        ConcreteStrategyWaveClustering
+        ConcreteStrategyWaveClustering,
+        WaveClustering
     )
     from ClusteringMethods.ClasteringAlgorithms import (
         Context,
@@ -276,6 +277,193 @@ def test_strategy_integration():
         traceback.print_exc()
     print()
 
+def test_vectorized_quantization():
+    print("="*80)
+    print("ТЕСТ 6: Векторизованное квантование и разметка точек")
+    print("="*80)
+    if not ALGORITHM_AVAILABLE:
+        print("❌ Алгоритм не доступен. Пропускаем тест.")
+        return
+    for n_features, wavelet in ((2, 'haar'), (3, 'db4')):
+        X, _ = make_blobs(n_samples=3000, n_features=n_features, centers=4, random_state=7)
+        model = WaveClustering(n_grid=20, wavelet=wavelet, n_levels=1, density_threshold=0.1)
+        grid, metadata = model._quantize_data(X)
+        # Поточечный эталон: ячейка каждой точки и её метка в сетке после преобразования
+        indices = np.clip(((X - metadata['min_vals']) / metadata['cell_sizes']).astype(int), 0, model.n_grid - 1)
+        expected = np.zeros_like(grid)
+        for index in indices:
+            expected[tuple(index)] += 1
+        assert np.array_equal(grid, expected)
+
+        labels = model.fit_predict(X)
+        transformed = model._apply_wavelet_transform(grid, level=model.n_levels)
+        labeled_grid, n_clusters = model._find_connected_components(
+            transformed, transformed.max() * model.density_threshold)
+        shape = np.array(labeled_grid.shape)
+        expected = [labeled_grid[tuple(np.clip(index // 2, 0, shape - 1))] for index in indices]
+        assert np.array_equal(labels, expected) and model.n_clusters_ == n_clusters
+        print(f"  {n_features}D, {wavelet}: {n_clusters} кластеров, совпадает с поточечным расчётом")
+    print("✅ Квантование и разметка совпадают\n")
+
+def test_sparse_grid():
+    print("="*80)
+    print("ТЕСТ 7: Разреженная сетка для многомерных данных")
+    print("="*80)
+    if not ALGORITHM_AVAILABLE:
+        print("❌ Алгоритм не доступен. Пропускаем тест.")
+        return
+    from sklearn.metrics import adjusted_rand_score
+    # Haar без дополнения границ: разреженная сетка совпадает с плотной
+    for n_features in (2, 3):
+        X, _ = make_blobs(n_samples=5000, n_features=n_features, centers=4, random_state=n_features)
+        dense = WaveClustering(n_grid=32, n_levels=2, grid_mode='dense').fit(X)
+        sparse = WaveClustering(n_grid=32, n_levels=2, grid_mode='sparse').fit(X)
+        assert np.array_equal(dense.labels_, sparse.labels_) and dense.n_clusters_ == sparse.n_clusters_
+
+    # 6 и 10 признаков: все измерения участвуют, плотный массив 16^10 не создаётся
+    for n_features, n_grid in ((6, 10), (10, 16)):
+        X, y_true = make_blobs(n_samples=5000, n_features=n_features, centers=4, cluster_std=0.5, random_state=3)
+        model = WaveClustering(n_grid=n_grid, wavelet='haar', n_levels=2, density_threshold=0.01).fit(X)
+        ari = adjusted_rand_score(y_true, model.labels_)
+        print(f"  {n_features}D, сетка {n_grid}: {model.n_clusters_} кластеров, ARI = {ari:.3f}")
+        assert model.n_clusters_ == 4 and ari > 0.9
+
+    config = StrategiesManager.getStrategyRunConfigById("waveclustering")
+    config["n_grid"] = 10
+    config["density_threshold"] = 0.01
+    y_pred = ConcreteStrategyWaveClustering().clastering_points(X, config)
+    assert y_pred.shape == (len(X),) and len(np.unique(y_pred[y_pred != 0])) == 4
+
+    # db4 в 6D: совпадает с плотным pywt (mode='zero'), память преобразования ограничена
+    import pywt
+    from scipy import ndimage
+    X, _ = make_blobs(n_samples=5000, n_features=6, centers=4, cluster_std=0.5, random_state=3)
+    model = WaveClustering(n_grid=8, wavelet='db4', n_levels=1, density_threshold=0.05).fit(X)
+    grid = np.zeros((8,) * 6)
+    indices = model._cell_indices(X, model.grid_metadata_)
+    np.add.at(grid, tuple(indices.T), 1)
+    approx = pywt.dwtn(grid, 'db4', mode='zero')['a' * 6]
+    labeled, n_clusters = ndimage.label(approx > approx.max() * 0.05)
+    expected = labeled[tuple(np.minimum(indices // 2, np.array(labeled.shape) - 1).T)]
+    assert model.n_clusters_ == n_clusters and np.array_equal(model.labels_, expected)
+    print(f"  6D, db4: {n_clusters} кластеров, совпадает с плотным преобразованием")
+
+    X, _ = make_blobs(n_samples=20000, n_features=6, centers=4, random_state=0)
+    for run in (WaveClustering(wavelet='db4', memory_budget=64 << 20).fit,
+                WaveClustering(n_grid=16, grid_mode='dense').fit,
+                lambda X: WaveClustering(n_grid=16, grid_mode='dense').sweep(X, [1], [0.1])):
+        try:
+            run(X)
+        except ValueError as e:
+            print(f"  {e}")
+        else:
+            raise AssertionError("ожидалась ошибка")
+    print("✅ Разреженная сетка работает\n")
+
+def test_predict_partial_fit():
+    print("="*80)
+    print("ТЕСТ 8: Разметка новых точек и обучение по частям")
+    print("="*80)
+    if not ALGORITHM_AVAILABLE:
+        print("❌ Алгоритм не доступен. Пропускаем тест.")
+        return
+    for n_features, grid_mode in ((2, 'dense'), (3, 'dense'), (6, 'sparse')):
+        X, _ = make_blobs(n_samples=20000, n_features=n_features, centers=4, cluster_std=0.5, random_state=5)
+        model = WaveClustering(n_grid=16, n_levels=1, density_threshold=0.05, grid_mode=grid_mode).fit(X)
+        assert np.array_equal(model.predict(X), model.labels_)
+        # Точки вне ограничивающего прямоугольника сетки - шум
+        assert (model.predict(X + 1000) == 0).all()
+
+        # Частями с тем же прямоугольником: та же сетка и те же кластеры
+        stream = WaveClustering(n_grid=16, n_levels=1, density_threshold=0.05, grid_mode=grid_mode,
+                                bounds=(X.min(axis=0), X.max(axis=0)))
+        for chunk in np.array_split(X, 8):
+            stream.partial_fit(chunk)
+            assert np.array_equal(stream.labels_, stream.predict(chunk))
+        assert stream.n_clusters_ == model.n_clusters_
+        assert np.array_equal(stream.predict(X), model.labels_)
+        print(f"  {n_features}D, {grid_mode}: {model.n_clusters_} кластеров, разметка совпадает")
+
+    try:
+        model.predict(X[:, :2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ожидалась ошибка для другого числа признаков")
+    print("✅ predict и partial_fit работают\n")
+
+def test_sweep():
+    print("="*80)
+    print("ТЕСТ 9: Перебор уровней и порогов по одной вейвлет-пирамиде")
+    print("="*80)
+    if not ALGORITHM_AVAILABLE:
+        print("❌ Алгоритм не доступен. Пропускаем тест.")
+        return
+    levels, thresholds = [1, 3, 2], [0.05, 0.2]
+    for n_features, wavelet in ((2, 'db4'), (3, 'haar'), (6, 'haar')):
+        X, _ = make_blobs(n_samples=5000, n_features=n_features, centers=4, cluster_std=0.5, random_state=2)
+        labels, n_clusters = WaveClustering(n_grid=32, wavelet=wavelet).sweep(X, levels, thresholds)
+        assert labels.shape == (3, 2, len(X)) and n_clusters.shape == (3, 2)
+        for i, n_levels in enumerate(levels):
+            for j, threshold in enumerate(thresholds):
+                model = WaveClustering(n_grid=32, wavelet=wavelet, n_levels=n_levels,
+                                       density_threshold=threshold).fit(X)
+                assert np.array_equal(labels[i, j], model.labels_) and n_clusters[i, j] == model.n_clusters_
+        print(f"  {n_features}D, {wavelet}: кластеров {n_clusters.tolist()}")
+
+    config = StrategiesManager.getStrategyRunConfigById("waveclustering")
+    table = ConcreteStrategyWaveClustering().sweep(X, levels, thresholds, config)
+    assert [(row.n_levels, row.density_threshold) for row in table] == [(1, 0.05), (1, 0.2), (3, 0.05), (3, 0.2), (2, 0.05), (2, 0.2)]
+    assert all(row.n_noise == np.count_nonzero(row.labels == 0) for row in table)
+    print("✅ Перебор совпадает с отдельными запусками\n")
+
+def test_compact_grid():
+    print("="*80)
+    print("ТЕСТ 10: Компактная сетка и выбор делений по объёму памяти")
+    print("="*80)
+    if not ALGORITHM_AVAILABLE:
+        print("❌ Алгоритм не доступен. Пропускаем тест.")
+        return
+    import pywt
+    X, _ = make_blobs(n_samples=3000, n_features=3, centers=3, cluster_std=0.4, random_state=7)
+    model = WaveClustering(n_grid=64, wavelet='db4', n_levels=2).fit(X)
+    # Счётчики - наименьший беззнаковый тип, коэффициенты - float32, метки - int32
+    assert model.grid_.dtype == np.uint8 and model.grid_.sum() == len(X)
+    assert model.labels_.dtype == np.int32 and model.predict(X).dtype == np.int32
+    approx = model._apply_wavelet_transform(model.grid_, level=2)
+    reference = pywt.dwtn(pywt.dwtn(model.grid_.astype(float), 'db4')['aaa'], 'db4')['aaa']
+    assert approx.dtype == np.float32 and np.allclose(approx, reference, rtol=1e-5, atol=1e-4)
+
+    # Тип счётчиков расширяется при обучении по частям
+    stream = WaveClustering(n_grid=8, n_levels=1, bounds=(X.min(axis=0), X.max(axis=0)))
+    for chunk in np.array_split(X, 4):
+        stream.partial_fit(chunk)
+    assert stream.grid_.max() > 255 and stream.grid_.dtype == np.uint16 and stream.grid_.sum() == len(X)
+
+    # Деления по осям пропорциональны разбросу данных и укладываются в объём памяти
+    Y = X * [4.0, 1.0, 2.0]
+    budget = 1 << 20
+    model = WaveClustering(n_grid=256, n_levels=1, memory_budget=budget).fit(Y)
+    shape = model.grid_metadata_['shape']
+    extent = Y.max(axis=0) - Y.min(axis=0)
+    assert np.prod(shape) * 8 <= budget and max(shape) < 256
+    assert np.allclose(np.array(shape) / max(shape), extent / extent.max(), atol=0.05)
+    assert np.array_equal(model.predict(Y), model.labels_)
+    print(f"  деления по осям при {budget >> 20} МБ: {shape}, кластеров {model.n_clusters_}")
+
+    # Большая сетка: разметка без таблицы меток всех ячеек
+    Z, _ = make_blobs(n_samples=20000, centers=3, cluster_std=0.4, random_state=3)
+    model = WaveClustering(n_grid=2100, n_levels=3, density_threshold=0.05)
+    grid, metadata = model._quantize_data(Z)
+    labeled_grid, _ = model._find_connected_components(model._apply_wavelet_transform(grid, level=3), 0.5)
+    table = model._cell_label_table(labeled_grid, 8, metadata['shape'])
+    assert table.size > 1 << 22
+    assert np.array_equal(model._dense_point_labels(metadata['codes'], labeled_grid, 8, metadata['shape']),
+                          table[metadata['codes']])
+    model.fit(Z)
+    assert np.array_equal(model.predict(Z), model.labels_)
+    print("✅ Компактная сетка работает\n")
+
 def main():
     print("\n" + "="*80)
     print(f"ТЕСТИРОВАНИЕ АЛГОРИТМА: {ALGORITHM_NAME}")
@@ -289,6 +477,11 @@ def main():
         test_different_datasets()
         test_3d_clustering()
         test_strategy_integration()
+        test_vectorized_quantization()
+        test_sparse_grid()
+        test_predict_partial_fit()
+        test_sweep()
+        test_compact_grid()
         print("="*80)
         print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ УСПЕШНО! ✅")
         print("="*80)
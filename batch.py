@@ -0,0 +1,11 @@
+from Frameworks_ccore.BatchRunner import main
+
+import sys
+
+'''
+    @brief  Точка входа пакетного запуска кластеризации без графического интерфейса.
+
+    Пример: python batch.py job.toml -o results -j 16
+'''
+if __name__ == "__main__":
+    sys.exit(main())
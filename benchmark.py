@@ -0,0 +1,11 @@
+from Frameworks_ccore.Benchmark import main
+
+import sys
+
+'''
+    @brief  Точка входа тестов производительности стратегий кластеризации.
+
+    Пример: python benchmark.py -s dbscan_sk birch_sk -g blobs moons -n 1000 100000
+'''
+if __name__ == "__main__":
+    sys.exit(main())